@@ -0,0 +1,21 @@
+export const runtime = "nodejs";
+
+import { NextResponse } from "next/server";
+import { readRegionDataFile } from "@/lib/server/regionData";
+
+export async function GET(req: Request, { params }: { params: { region: string } }) {
+  const url = new URL(req.url);
+  const relPath = url.searchParams.get("path") || "timeseries.json";
+  const file = await readRegionDataFile(params.region, relPath, req.headers.get("accept-encoding") || "");
+  if (!file) {
+    return NextResponse.json({ error: "not found" }, { status: 404 });
+  }
+
+  const headers: Record<string, string> = {
+    "Content-Type": "application/json; charset=utf-8",
+    Vary: "Accept-Encoding",
+    "Cache-Control": file.immutable ? "public, max-age=31536000, immutable" : "no-cache",
+  };
+  if (file.contentEncoding) headers["Content-Encoding"] = file.contentEncoding;
+  return new Response(file.body, { headers });
+}
@@ -0,0 +1,35 @@
+export const runtime = "nodejs";
+
+import { NextResponse } from "next/server";
+import { loadRegionTimeseries } from "@/lib/server/regionData";
+
+function parseTime(value: string | null): number | null {
+  if (!value) return null;
+  const numeric = Number(value);
+  if (Number.isFinite(numeric)) return numeric;
+  const ms = Date.parse(value);
+  return Number.isNaN(ms) ? null : Math.floor(ms / 1000);
+}
+
+export async function GET(req: Request, { params }: { params: { region: string } }) {
+  try {
+    const url = new URL(req.url);
+    const width = Number(url.searchParams.get("width") || "");
+    const result = await loadRegionTimeseries(params.region, {
+      start: parseTime(url.searchParams.get("start")),
+      end: parseTime(url.searchParams.get("end")),
+      width: Number.isFinite(width) && width > 0 ? width : null,
+    });
+
+    return NextResponse.json({
+      level: result.level,
+      stations: result.stationTimeseries,
+      model: result.modelTimeseries,
+    });
+  } catch (e: any) {
+    return NextResponse.json(
+      { stations: {}, model: {}, error: e?.message || "load failed" },
+      { status: 500 }
+    );
+  }
+}
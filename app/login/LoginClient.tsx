@@ -7,7 +7,7 @@ import { useCallback, useMemo, useState } from "react";
 
 type Mode = "signin" | "signup";
 
-export default function LoginClient({ callbackUrl = "/r/south_rockies" }: { callbackUrl?: string }) {
+export default function LoginClient({ callbackUrl = "/r/south-rockies" }: { callbackUrl?: string }) {
   // shared state
   const [mode, setMode] = useState<Mode>("signin");
   const [email, setEmail] = useState("");
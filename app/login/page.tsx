@@ -2,9 +2,9 @@
 import LoginClient from "./LoginClient";
 
 function sanitizeCallback(raw?: string | null) {
-  if (!raw || !raw.startsWith("/")) return "/r/south_rockies";
+  if (!raw || !raw.startsWith("/")) return "/r/south-rockies";
   if (raw.startsWith("/_next") || raw.startsWith("/api/") || raw.endsWith(".svg")) {
-    return "/r/south_rockies";
+    return "/r/south-rockies";
   }
   return raw;
 }
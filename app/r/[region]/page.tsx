@@ -153,7 +153,7 @@ export default async function RegionPage({ params }: { params: { region: string
                 key={`model-ts-${band}-${entry.variable}-${idx}`}
                 region={region}
                 data={{ x: entry.x, series: entry.series }}
-                title={`Model Timeseries · ${entry.variable} @ ${entry.level}`}
+                title={`Model Timeseries · ${entry.variable} @ ${entry.level}${entry.run_utc ? ` · run ${entry.run_utc}` : ''}`}
                 subtitle={formatBand(band)}
               />
             ));
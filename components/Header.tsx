@@ -28,7 +28,7 @@ export default function Header() {
 
           {/* Option B (one-click Google SSO). Uncomment if you imported signIn above.
           <button
-            onClick={() => signIn('google', { callbackUrl: '/r/south_rockies' })}
+            onClick={() => signIn('google', { callbackUrl: '/r/south-rockies' })}
             className="rounded-lg bg-white text-black px-3 py-1.5 hover:bg-neutral-200 transition"
           >
             Sign in
@@ -42,13 +42,13 @@ export default function Header() {
   // Full header on authenticated (protected) pages
   return (
     <header className="flex items-center justify-between pb-4 border-b">
-      <Link href="/r/south_rockies" className="text-xl font-semibold">
+      <Link href="/r/south-rockies" className="text-xl font-semibold">
         Slope Labs
       </Link>
       <nav className="flex items-center gap-4 text-sm text-gray-600">
         <Link
           className={pathname?.startsWith("/r") ? "underline" : ""}
-          href="/r/south_rockies"
+          href="/r/south-rockies"
         >
           Dashboard
         </Link>
@@ -64,7 +64,7 @@ export default function Header() {
         </button>
         */}
         <RegionSwitcher />
-        <Link className={pathname?.startsWith("/r") ? "underline" : ""} href="/r/south_rockies">Dashboard</Link>
+        <Link className={pathname?.startsWith("/r") ? "underline" : ""} href="/r/south-rockies">Dashboard</Link>
         <Link className={pathname?.startsWith("/admin") ? "underline" : ""} href="/admin">Admin</Link>
       </nav>
     </header>
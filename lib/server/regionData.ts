@@ -10,9 +10,14 @@ import type {
   Manifest,
   ModelTimeseriesEntry,
   RegionBundleJSON,
+  RegionIndex,
   RegionSummaryFile,
   RegionTimeseriesFile,
   StationTimeseriesEntry,
+  TimeAxis,
+  TimeseriesChunkIndex,
+  TimeseriesPyramidIndex,
+  TimeseriesSeries,
   WeatherStationRow,
 } from '@/types/core';
 
@@ -34,6 +39,8 @@ type RegionBundle = {
 };
 
 const bundleCache = new Map<string, RegionBundle>();
+const GENERATION_MANIFEST = 'generation.json';
+const TIMESERIES_CHUNK_INDEX = 'chunks/index.json';
 
 function normalizeRegion(value: unknown): string {
   return String(value ?? '')
@@ -53,6 +60,28 @@ async function readJsonIfPresent<T>(absPath: string | null): Promise<T | null> {
   }
 }
 
+async function loadRegionIndex(): Promise<RegionIndex | null> {
+  const index = await readJsonIfPresent<RegionIndex | string[]>(path.join(SHARED_DIR, 'regions.json'));
+  if (!index) return null;
+  return Array.isArray(index) ? { regions: index } : index;
+}
+
+// Maps any spelling of a region (south_rockies, South-Rockies) onto the slug it was built under.
+async function resolveRegion(regionParam: string): Promise<string> {
+  const region = regionParam.toLowerCase();
+  const index = await loadRegionIndex();
+  return index?.aliases?.[region] ?? region;
+}
+
+async function fileExists(absPath: string): Promise<boolean> {
+  try {
+    await fs.access(absPath);
+    return true;
+  } catch {
+    return false;
+  }
+}
+
 async function readCsvIfPresent(absPath: string | null): Promise<WeatherStationRow[] | null> {
   if (!absPath) return null;
   try {
@@ -83,7 +112,12 @@ function withArtifactDefaults(region: string, manifest: Partial<Manifest> | null
       tiles_base: artifacts.tiles_base ?? 'https://tile.openstreetmap.org/',
       station_parquet: artifacts.station_parquet,
       quicklook_png: artifacts.quicklook_png,
+      timeseries_index: artifacts.timeseries_index,
+      timeseries_json: artifacts.timeseries_json,
+      timeseries_chunk_index: artifacts.timeseries_chunk_index,
+      pyramid_index: artifacts.pyramid_index,
     },
+    generation: manifest?.generation,
   };
 }
 
@@ -107,11 +141,31 @@ function ensureBandSummary(map?: BandSummaryMap): BandSummaryMap {
   return result;
 }
 
+function epochToIso(seconds: number): string {
+  return new Date(seconds * 1000).toISOString().replace('.000Z', 'Z');
+}
+
+function expandTimeAxis(axis: TimeAxis): string[] {
+  if (Array.isArray(axis)) return axis.map(epochToIso);
+  const out: string[] = new Array(axis.count);
+  for (let i = 0; i < axis.count; i += 1) {
+    out[i] = epochToIso(axis.start + i * axis.step);
+  }
+  return out;
+}
+
+function withIsoAxis<T>(entry: T): T {
+  const raw = entry as T & { x?: string[]; t?: TimeAxis };
+  if (Array.isArray(raw.x) || !raw.t) return entry;
+  const { t, ...rest } = raw;
+  return { ...rest, x: expandTimeAxis(t) } as T;
+}
+
 function ensureBandTimeseries<T>(map?: BandTimeseriesMap<T>): BandTimeseriesMap<T> {
   const result: BandTimeseriesMap<T> = {};
   if (map) {
     for (const [key, value] of Object.entries(map)) {
-      result[key] = Array.isArray(value) ? value : [];
+      result[key] = Array.isArray(value) ? value.map(withIsoAxis) : [];
     }
   }
   for (const band of BANDS) {
@@ -120,35 +174,126 @@ function ensureBandTimeseries<T>(map?: BandTimeseriesMap<T>): BandTimeseriesMap<
   return result;
 }
 
-async function loadStructuredBundle(region: string): Promise<RegionBundle | null> {
-  const summaryPath = path.join(DATA_ROOT, region, 'summary.json');
-  const summaryData = await readJsonIfPresent<RegionSummaryFile>(summaryPath);
+type TimeseriesWindow = {
+  start?: number | null;
+  end?: number | null;
+  width?: number | null;
+};
+
+type ChunkedTimeseries = {
+  stationTimeseries: BandTimeseriesMap<StationTimeseriesEntry>;
+  modelTimeseries: BandTimeseriesMap<ModelTimeseriesEntry>;
+};
+
+function timeseriesKey(band: string, entry: Record<string, unknown>): string {
+  if ('station_id' in entry) return `${band}|station|${entry.station_id}`;
+  return `${band}|model|${entry.variable}|${entry.level}|${entry.run_utc ?? ''}`;
+}
+
+// Concatenates the per-chunk pieces of each series; chunks must be in time order.
+function mergeChunkTimeseries<T>(chunks: Array<BandTimeseriesMap<T> | undefined>): BandTimeseriesMap<T> {
+  const result: BandTimeseriesMap<T> = {};
+  const merged = new Map<string, { x: string[]; series: TimeseriesSeries[] }>();
+  for (const chunk of chunks) {
+    for (const [band, entries] of Object.entries(chunk ?? {})) {
+      if (!Array.isArray(entries)) continue;
+      const list = (result[band] ??= []);
+      for (const raw of entries) {
+        const entry = withIsoAxis(raw) as T & { x: string[]; series: TimeseriesSeries[] };
+        const key = timeseriesKey(band, entry as Record<string, unknown>);
+        const existing = merged.get(key);
+        if (!existing) {
+          merged.set(key, entry);
+          list.push(entry);
+          continue;
+        }
+        for (const value of entry.x) existing.x.push(value);
+        const traces = new Map(existing.series.map((trace) => [trace.name, trace]));
+        for (const trace of entry.series ?? []) {
+          const target = traces.get(trace.name);
+          if (target) for (const value of trace.values) target.values.push(value);
+        }
+      }
+    }
+  }
+  return ensureBandTimeseries(result);
+}
+
+// Chunks written by `generate_region_bundle.py --timeseries-chunks`; only the
+// chunks overlapping `window` are read. Null when the region is not chunked.
+async function loadTimeseriesChunks(region: string, window: TimeseriesWindow = {}): Promise<ChunkedTimeseries | null> {
+  const index = await readJsonIfPresent<TimeseriesChunkIndex>(path.join(DATA_ROOT, region, TIMESERIES_CHUNK_INDEX));
+  if (!index) return null;
+  const start = window.start ?? -Infinity;
+  const end = window.end ?? Infinity;
+  const wanted = (index.chunks ?? []).filter((chunk) => chunk.end > start && chunk.start <= end);
+  const files = await Promise.all(
+    wanted.map((chunk) => readJsonIfPresent<RegionTimeseriesFile>(path.join(DATA_ROOT, region, chunk.file)))
+  );
+  return {
+    stationTimeseries: mergeChunkTimeseries(files.map((file) => file?.stations)),
+    modelTimeseries: mergeChunkTimeseries(files.map((file) => file?.model)),
+  };
+}
+
+// Manifest written by `generate_region_bundle.py --content-addressed`, naming
+// the current hash-named artifacts; null for fixed-name outputs.
+async function loadGenerationManifest(region: string): Promise<Manifest | null> {
+  const manifest = await readJsonIfPresent<Manifest>(path.join(DATA_ROOT, region, GENERATION_MANIFEST));
+  return manifest?.generation ? manifest : null;
+}
+
+async function loadStructuredBundle(region: string, generation: Manifest | null): Promise<RegionBundle | null> {
+  const summaryUrl = generation?.artifacts.summary_json ?? `/data/${region}/summary.json`;
+  const summaryData = await readJsonIfPresent<RegionSummaryFile>(resolvePublicAsset(summaryUrl));
   if (!summaryData) return null;
 
-  const timeseriesPath = path.join(DATA_ROOT, region, 'timeseries.json');
+  const timeseriesPath = generation
+    ? resolvePublicAsset(generation.artifacts.timeseries_json)
+    : path.join(DATA_ROOT, region, 'timeseries.json');
   const timeseriesData = await readJsonIfPresent<RegionTimeseriesFile>(timeseriesPath);
+  // `--timeseries-chunks` builds write per-day/week chunks instead of timeseries.json.
+  const chunked = timeseriesData || generation ? null : await loadTimeseriesChunks(region);
+  // Parquet timeseries (generate_region_bundle.py --output-format parquet) are
+  // queried client-side with DuckDB-WASM; only their index is advertised here.
+  const timeseriesIndex = generation
+    ? generation.artifacts.timeseries_index
+    : (await fileExists(path.join(DATA_ROOT, region, 'timeseries.index.json')))
+      ? `/data/${region}/timeseries.index.json`
+      : undefined;
+
+  // Without a forecast in the summary, use the hand-written one named by <region>/manifest.json.
+  const legacyManifest = summaryData.forecast ? null : await loadManifest(region);
+  const forecast = summaryData.forecast ?? (legacyManifest ? await loadForecast(legacyManifest) : null);
 
   const manifest = withArtifactDefaults(region, {
-    run_time_utc: summaryData.run_time_utc,
-    version: summaryData.version,
+    // An unchanged summary keeps the file of an earlier content-addressed build,
+    // so the build time comes from the generation manifest.
+    run_time_utc: generation?.run_time_utc ?? summaryData.run_time_utc,
+    version: generation?.version ?? summaryData.version,
     artifacts: {
-      forecast_json: summaryData.forecast ? `/data/${region}/summary.json` : `/data/${region}/forecast.json`,
-      summary_json: `/data/${region}/summary.json`,
+      forecast_json: legacyManifest?.artifacts.forecast_json ?? summaryUrl,
+      summary_json: summaryUrl,
       tiles_base: summaryData.tiles_base ?? 'https://tile.openstreetmap.org/',
       quicklook_png: summaryData.quicklook_png,
+      timeseries_index: timeseriesIndex,
+      timeseries_json: generation?.artifacts.timeseries_json,
+      timeseries_chunk_index: chunked ? `/data/${region}/${TIMESERIES_CHUNK_INDEX}` : undefined,
+      pyramid_index: generation?.artifacts.pyramid_index,
     },
+    generation: generation?.generation,
   });
 
   return {
     region,
     manifest,
-    forecast: summaryData.forecast ?? null,
+    forecast,
     summary: summaryData.summary ?? null,
     avalanches: summaryData.avalanches ?? [],
     stationSummary: ensureBandSummary(summaryData.stations),
-    stationTimeseries: ensureBandTimeseries(timeseriesData?.stations),
+    stationTimeseries: chunked?.stationTimeseries ?? ensureBandTimeseries(timeseriesData?.stations),
     modelSummary: ensureBandSummary(summaryData.model),
-    modelTimeseries: ensureBandTimeseries(timeseriesData?.model),
+    modelTimeseries: chunked?.modelTimeseries ?? ensureBandTimeseries(timeseriesData?.model),
   };
 }
 
@@ -274,12 +419,16 @@ async function loadManifest(region: string): Promise<Manifest> {
 }
 
 export async function loadRegionBundle(regionParam: string): Promise<RegionBundle> {
-  const region = regionParam.toLowerCase();
-  if (shouldCache && bundleCache.has(region)) {
-    return bundleCache.get(region)!;
+  const region = await resolveRegion(regionParam);
+  // The generation manifest is tiny and re-read on every request, so a cached
+  // bundle is reused only while it still describes the current artifacts.
+  const generation = await loadGenerationManifest(region);
+  const cached = shouldCache ? bundleCache.get(region) : undefined;
+  if (cached && cached.manifest.generation === generation?.generation) {
+    return cached;
   }
 
-  const structured = await loadStructuredBundle(region);
+  const structured = await loadStructuredBundle(region, generation);
   if (structured) {
     if (shouldCache) bundleCache.set(region, structured);
     return structured;
@@ -324,9 +473,138 @@ export async function loadRegionBundle(regionParam: string): Promise<RegionBundl
   return bundle;
 }
 
+type RegionTimeseries = {
+  region: string;
+  level: string;
+  stationTimeseries: BandTimeseriesMap<StationTimeseriesEntry>;
+  modelTimeseries: BandTimeseriesMap<ModelTimeseriesEntry>;
+};
+
+function selectPyramidLevel(index: TimeseriesPyramidIndex, window: TimeseriesWindow) {
+  const levels = index.levels ?? [];
+  if (!levels.length) return null;
+  const [rangeStart, rangeEnd] = index.time_range ?? [0, 0];
+  const start = window.start ?? rangeStart;
+  const end = window.end ?? rangeEnd;
+  const width = window.width && window.width > 0 ? window.width : null;
+  if (!width || end <= start) return levels[levels.length - 1];
+  const wanted = (end - start) / width;
+  // Levels are ordered coarsest first; take the first one fine enough for the requested width.
+  return levels.find((level) => level.resolution_seconds <= wanted) ?? levels[levels.length - 1];
+}
+
+function clipEntry<T>(entry: T, window: TimeseriesWindow): T {
+  const raw = entry as T & { x?: string[]; series?: Array<{ values: number[] }> };
+  if (!Array.isArray(raw.x) || (window.start == null && window.end == null)) return entry;
+  const startMs = window.start != null ? window.start * 1000 : -Infinity;
+  const endMs = window.end != null ? window.end * 1000 : Infinity;
+  const keep: number[] = [];
+  raw.x.forEach((value, i) => {
+    const ms = Date.parse(value);
+    if (ms >= startMs && ms <= endMs) keep.push(i);
+  });
+  return {
+    ...raw,
+    x: keep.map((i) => raw.x![i]),
+    series: (raw.series ?? []).map((trace) => ({ ...trace, values: keep.map((i) => trace.values[i]) })),
+  } as T;
+}
+
+function clipBandTimeseries<T>(map: BandTimeseriesMap<T>, window: TimeseriesWindow): BandTimeseriesMap<T> {
+  const result: BandTimeseriesMap<T> = {};
+  for (const [band, entries] of Object.entries(map)) {
+    result[band] = entries.map((entry) => clipEntry(entry, window));
+  }
+  return result;
+}
+
+export async function loadRegionTimeseries(
+  regionParam: string,
+  window: TimeseriesWindow = {},
+): Promise<RegionTimeseries> {
+  const region = await resolveRegion(regionParam);
+  const generation = await loadGenerationManifest(region);
+  const indexPath = generation
+    ? resolvePublicAsset(generation.artifacts.pyramid_index)
+    : path.join(DATA_ROOT, region, 'pyramid', 'index.json');
+  const index = await readJsonIfPresent<TimeseriesPyramidIndex>(indexPath);
+  const level = index ? selectPyramidLevel(index, window) : null;
+  // A chunked full level is read below, one overlapping chunk at a time.
+  const levelData = level && level.file !== TIMESERIES_CHUNK_INDEX
+    ? await readJsonIfPresent<RegionTimeseriesFile>(path.join(DATA_ROOT, region, level.file))
+    : null;
+
+  if (level && levelData) {
+    return {
+      region,
+      level: level.name,
+      stationTimeseries: clipBandTimeseries(ensureBandTimeseries(levelData.stations), window),
+      modelTimeseries: clipBandTimeseries(ensureBandTimeseries(levelData.model), window),
+    };
+  }
+
+  const chunked = generation ? null : await loadTimeseriesChunks(region, window);
+  if (chunked) {
+    return {
+      region,
+      level: 'full',
+      stationTimeseries: clipBandTimeseries(chunked.stationTimeseries, window),
+      modelTimeseries: clipBandTimeseries(chunked.modelTimeseries, window),
+    };
+  }
+
+  const bundle = await loadRegionBundle(region);
+  return {
+    region,
+    level: 'full',
+    stationTimeseries: clipBandTimeseries(bundle.stationTimeseries, window),
+    modelTimeseries: clipBandTimeseries(bundle.modelTimeseries, window),
+  };
+}
+
+const PRECOMPRESSED = [
+  { encoding: 'br', suffix: '.br' },
+  { encoding: 'gzip', suffix: '.gz' },
+];
+
+type RegionDataFile = {
+  body: Buffer;
+  contentEncoding: string | null;
+  immutable: boolean;
+};
+
+// `<name>.<sha>.<ext>` artifacts from `--content-addressed` builds never change.
+const CONTENT_ADDRESSED = /\.[0-9a-f]{16}\.[a-z]+$/;
+
+// Reads a JSON artifact of a region, preferring a `--precompress` sidecar the client accepts.
+export async function readRegionDataFile(
+  regionParam: string,
+  relPath: string,
+  acceptEncoding = '',
+): Promise<RegionDataFile | null> {
+  const region = await resolveRegion(regionParam);
+  if (!/^[\w-]+$/.test(region) || !/^[\w-]+(\.[\w-]+)*(\/[\w-]+(\.[\w-]+)*)*\.json$/.test(relPath)) return null;
+  const absPath = path.join(DATA_ROOT, region, relPath);
+  const accepted = acceptEncoding.toLowerCase();
+  const immutable = CONTENT_ADDRESSED.test(relPath);
+  for (const { encoding, suffix } of PRECOMPRESSED) {
+    if (!accepted.includes(encoding)) continue;
+    try {
+      return { body: await fs.readFile(absPath + suffix), contentEncoding: encoding, immutable };
+    } catch {
+      // no sidecar for this encoding
+    }
+  }
+  try {
+    return { body: await fs.readFile(absPath), contentEncoding: null, immutable };
+  } catch {
+    return null;
+  }
+}
+
 export async function listRegions(): Promise<string[]> {
-  const sharedList = await readJsonIfPresent<string[]>(path.join(SHARED_DIR, 'regions.json'));
-  if (sharedList?.length) return sharedList;
+  const index = await loadRegionIndex();
+  if (index?.regions?.length) return index.regions;
 
   try {
     const entries = await fs.readdir(DATA_ROOT, { withFileTypes: true });
@@ -336,4 +614,4 @@ export async function listRegions(): Promise<string[]> {
   }
 }
 
-export type { RegionBundle };
+export type { RegionBundle, RegionTimeseries };
@@ -1,5 +1,16 @@
+const IMMUTABLE = 'public, max-age=31536000, immutable';
+// Hash-named artifacts from `generate_region_bundle.py --content-addressed`.
+const HASHED = ':file([\\w-]+(?:\\.[\\w-]+)*\\.[0-9a-f]{16}\\.(?:json|parquet)(?:\\.gz|\\.br)?)';
+
 /** @type {import('next').NextConfig} */
 const nextConfig = {
-  images: { remotePatterns: [{ protocol: 'https', hostname: '**' }] }
+  images: { remotePatterns: [{ protocol: 'https', hostname: '**' }] },
+  async headers() {
+    return [
+      { source: `/data/:region/${HASHED}`, headers: [{ key: 'Cache-Control', value: IMMUTABLE }] },
+      { source: `/data/:region/pyramid/${HASHED}`, headers: [{ key: 'Cache-Control', value: IMMUTABLE }] },
+      { source: '/data/:region/generation.json', headers: [{ key: 'Cache-Control', value: 'no-cache' }] },
+    ];
+  },
 };
 export default nextConfig;
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""Benchmark generate_region_bundle.py on synthetic inputs in the real schema.
+
+Example usage:
+  python scripts/benchmark_region_bundle.py --regions 8 --hours 240 --runs 4
+  python scripts/benchmark_region_bundle.py --baseline .benchmarks/baseline.json
+  python scripts/benchmark_region_bundle.py --save-baseline .benchmarks/baseline.json
+
+The generator writes a model parquet file (region x band x variable x level x
+run x hour rows with the weather_model.parquet columns) and one station CSV per
+region (region x band x station x hour rows) under --data-dir, reusing them
+while the dataset parameters are unchanged.
+
+The benchmark then runs a real multi-region build in process (the generator's
+main() with --profile) and reads the stages its StageProfiler recorded:
+discovery, input hashes and model load for the run, then station load, model
+specs and payloads and each write per region, summed over the regions. Each
+stage reports wall and CPU seconds, rows processed and rows/s. Peak RSS is a
+process-wide high-water mark, so it is reported once for the whole run. The
+best of --repeat runs is written as JSON to --results and, with --baseline,
+compared stage by stage against a stored results file; the exit code is 1
+when any stage is more than --tolerance (and --min-delta seconds) slower than
+the baseline.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import List, Sequence
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import generate_region_bundle as bundle
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_DATA_DIR = SCRIPT_DIR.parent / ".benchmarks" / "region_bundle"
+
+# (variable, level) pairs seen in the production model parquet.
+MODEL_VARIABLES = ["APCP", "TMP", "GUST", "RH", "DSWRF", "DLWRF", "CWAT", "FPRATE", "HGT", "UGRD", "VGRD", "PRMSL"]
+MODEL_LEVELS = ["Sfc", "AGL-2m", "AGL-10m", "ISBL_500hPa", "ISBL_700hPa", "EATM"]
+MODEL_BANDS = ["Alpine", "treeline", "below_treeline"]
+STATION_BANDS = ["Alpine", "treeline", "below"]
+STATION_METRICS = "temp_c,wind_mps,hs_cm"
+START_TIME = "2025-02-06 00:00:00+00"
+RUN_INTERVAL_HOURS = 6
+
+
+@dataclass
+class DatasetSpec:
+    regions: int = 4
+    variables: int = 6
+    levels: int = 2
+    hours: int = 120
+    runs: int = 2
+    stations: int = 3
+
+    def region_names(self) -> List[str]:
+        return [f"Synthetic Region {index:02d}" for index in range(self.regions)]
+
+    def model_rows(self) -> int:
+        return self.regions * len(MODEL_BANDS) * self.variables * self.levels * self.runs * self.hours
+
+    def station_rows(self) -> int:
+        return self.regions * len(STATION_BANDS) * self.stations * self.hours
+
+
+@dataclass
+class StageResult:
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rows: int = 0
+    rows_per_s: float = 0.0
+
+
+def sql_list(values: Sequence[str]) -> str:
+    return "[" + ", ".join("'" + value.replace("'", "''") + "'" for value in values) + "]"
+
+
+def generate_dataset(spec: DatasetSpec, data_dir: Path, *, force: bool = False) -> tuple[Path, Path]:
+    """Write (or reuse) the synthetic model parquet and station CSV directory for `spec`."""
+    model_path = data_dir / "weather_model.parquet"
+    station_dir = data_dir / "stations"
+    spec_path = data_dir / "dataset.json"
+    if (
+        not force
+        and spec_path.exists()
+        and model_path.exists()
+        and station_dir.exists()
+        and json.loads(spec_path.read_text(encoding="utf-8")) == asdict(spec)
+    ):
+        return model_path, station_dir
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    station_dir.mkdir(exist_ok=True)
+    for stale in station_dir.glob("*.csv"):
+        stale.unlink()
+
+    variables = [
+        MODEL_VARIABLES[index % len(MODEL_VARIABLES)] + (str(index // len(MODEL_VARIABLES)) if index >= len(MODEL_VARIABLES) else "")
+        for index in range(spec.variables)
+    ]
+    levels = [MODEL_LEVELS[index % len(MODEL_LEVELS)] + (str(index // len(MODEL_LEVELS)) if index >= len(MODEL_LEVELS) else "") for index in range(spec.levels)]
+
+    con = duckdb.connect(database=":memory:")
+    try:
+        con.execute("SET TimeZone = 'UTC'")
+        # Values are pure functions of the row coordinates so every run produces the same files.
+        con.execute(
+            f"""
+            COPY (
+                SELECT region,
+                       band AS elevation_band,
+                       TIMESTAMPTZ '{START_TIME}' + to_hours(run * {RUN_INTERVAL_HOURS} + hour) AS valid_date,
+                       CAST(hour AS BIGINT) AS forecast_hour,
+                       variable,
+                       level,
+                       round(10 * sin((run * {RUN_INTERVAL_HOURS} + hour) / 12.0 + v) + b + 0.1 * run, 4) AS mean_value,
+                       round(1 + 0.5 * cos(hour / 6.0 + l), 4) AS stddev,
+                       round(10 * sin((run * {RUN_INTERVAL_HOURS} + hour) / 12.0 + v) + b - 2, 4) AS p05,
+                       round(10 * sin((run * {RUN_INTERVAL_HOURS} + hour) / 12.0 + v) + b + 2, 4) AS p95,
+                       CAST(20 + (hour + v) % 7 AS BIGINT) AS count
+                FROM unnest({sql_list(spec.region_names())}) AS r(region),
+                     (SELECT unnest({sql_list(MODEL_BANDS)}) AS band, generate_subscripts({sql_list(MODEL_BANDS)}, 1) AS b),
+                     (SELECT unnest({sql_list(variables)}) AS variable, generate_subscripts({sql_list(variables)}, 1) AS v),
+                     (SELECT unnest({sql_list(levels)}) AS level, generate_subscripts({sql_list(levels)}, 1) AS l),
+                     range({spec.runs}) AS runs(run),
+                     range({spec.hours}) AS hours(hour)
+                ORDER BY region, run, hour, band, variable, level
+            ) TO '{model_path}' (FORMAT parquet)
+            """
+        )
+        for region in spec.region_names():
+            slug = bundle.slugify_region(region)
+            con.execute(
+                f"""
+                COPY (
+                    SELECT band[1:3] || s || '_' || '{slug}' AS station_id,
+                           'Stn ' || band || ' ' || s AS station_name,
+                           strftime(TIMESTAMP '{START_TIME[:19]}' + to_hours(hour), '%Y-%m-%d %H:%M:%S') AS obs_time,
+                           round(-5 + 8 * sin(hour / 12.0 + s) - 2 * b, 2) AS temp,
+                           round(abs(6 * cos(hour / 9.0 + s)) + b, 2) AS wind_speed,
+                           round(80 + 20 * b + hour / 24.0, 1) AS hs,
+                           '{region}' AS region,
+                           band AS elevation_band
+                    FROM (SELECT unnest({sql_list(STATION_BANDS)}) AS band, generate_subscripts({sql_list(STATION_BANDS)}, 1) AS b),
+                         range({spec.stations}) AS stations(s),
+                         range({spec.hours}) AS hours(hour)
+                    ORDER BY station_id, hour
+                ) TO '{station_dir / (slug + ".csv")}' (HEADER, DELIMITER ',')
+                """
+            )
+    finally:
+        con.close()
+    spec_path.write_text(json.dumps(asdict(spec), indent=2), encoding="utf-8")
+    return model_path, station_dir
+
+
+def build_argv(model_path: Path, station_dir: Path, output_dir: Path) -> List[str]:
+    """Generator arguments for a profiled multi-region build of the synthetic inputs."""
+    return [
+        "--model-parquet",
+        str(model_path),
+        "--station-csv",
+        str(station_dir),
+        "--station-metrics",
+        STATION_METRICS,
+        "--output",
+        str(output_dir),
+        "--profile",
+    ]
+
+
+def run_stages(model_path: Path, station_dir: Path, output_dir: Path) -> dict[str, StageResult]:
+    """Run one build through the generator's main() and sum its profiled stages by name.
+
+    Stages are returned in the order they first ran, followed by "total" for the
+    whole build; a stage's rows are its input rows, else its output rows.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        exit_code = bundle.main(build_argv(model_path, station_dir, output_dir))
+    if exit_code:
+        raise SystemExit(f"Benchmark build failed with exit code {exit_code}")
+    profile = json.loads((output_dir / "shared" / bundle.PROFILE_REPORT_NAME).read_text(encoding="utf-8"))
+
+    results: dict[str, StageResult] = {}
+    records = [*profile["stages"], *(record for region in profile["regions"].values() for record in region["stages"])]
+    for record in records:
+        result = results.setdefault(record["stage"], StageResult())
+        result.wall_s += record["wall_s"]
+        result.cpu_s += record["cpu_s"]
+        result.rows += record["rows_in"] or record["rows_out"] or 0
+    results["total"] = StageResult(wall_s=profile["wall_s"], cpu_s=profile["cpu_s"])
+    for result in results.values():
+        result.rows_per_s = result.rows / result.wall_s if result.wall_s > 0 else 0.0
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=SCRIPT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def print_results(report: dict) -> None:
+    print(f"{'stage':<16} {'wall_s':>9} {'cpu_s':>9} {'rows/s':>12}")
+    for stage, result in report["stages"].items():
+        print(f"{stage:<16} {result['wall_s']:>9.3f} {result['cpu_s']:>9.3f} {result['rows_per_s']:>12,.0f}")
+    print(f"Peak RSS: {bundle.format_bytes(report['peak_rss_bytes'])}")
+
+
+def compare_results(current: dict, baseline: dict, *, tolerance: float, min_delta: float) -> List[str]:
+    """Print a stage-by-stage comparison; return the stages that regressed.
+
+    A stage regresses when it is more than `tolerance` (relative) and more
+    than `min_delta` seconds slower than the baseline, so that timer noise on
+    very short stages is not reported.
+    """
+    if current["dataset"] != baseline.get("dataset"):
+        print("[warn] Baseline was recorded for a different dataset; ratios are not comparable")
+    regressions: List[str] = []
+    print(f"{'stage':<16} {'wall_s':>9} {'baseline':>9} {'ratio':>7} {'rows/s':>12}")
+    for stage, now in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if before is None:
+            print(f"{stage:<16} {now['wall_s']:>9.3f} {'-':>9} {'-':>7}")
+            continue
+        ratio = now["wall_s"] / before["wall_s"] if before["wall_s"] > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance and now["wall_s"] - before["wall_s"] > min_delta:
+            regressions.append(stage)
+            flag = "  REGRESSION"
+        print(
+            f"{stage:<16} {now['wall_s']:>9.3f} {before['wall_s']:>9.3f} {ratio:>7.2f} "
+            f"{now['rows_per_s']:>12,.0f}{flag}"
+        )
+    if "peak_rss_bytes" in baseline:
+        print(
+            f"Peak RSS: {bundle.format_bytes(current['peak_rss_bytes'])} "
+            f"(baseline {bundle.format_bytes(baseline['peak_rss_bytes'])})"
+        )
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = DatasetSpec()
+    parser.add_argument("--regions", type=int, default=defaults.regions, help="Synthetic regions (default: %(default)s)")
+    parser.add_argument("--variables", type=int, default=defaults.variables, help="Model variables (default: %(default)s)")
+    parser.add_argument("--levels", type=int, default=defaults.levels, help="Levels per variable (default: %(default)s)")
+    parser.add_argument("--hours", type=int, default=defaults.hours, help="Hourly steps per run (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=defaults.runs, help="Overlapping model runs, 6h apart (default: %(default)s)")
+    parser.add_argument("--stations", type=int, default=defaults.stations, help="Stations per band (default: %(default)s)")
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=DEFAULT_DATA_DIR,
+        help="Where the synthetic inputs are generated and reused (default: .benchmarks/region_bundle)",
+    )
+    parser.add_argument("--regenerate", action="store_true", help="Regenerate the synthetic inputs even if they match")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the fastest is reported (default: 3)")
+    parser.add_argument(
+        "--results",
+        type=Path,
+        default=None,
+        help="Results JSON path (default: <data-dir>/results.json)",
+    )
+    parser.add_argument("--baseline", type=Path, default=None, help="Results JSON to compare against")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="Also write the results to this baseline path")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed slowdown per stage relative to --baseline before failing (default: 0.10)",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.05,
+        help="Ignore slowdowns smaller than this many seconds (default: 0.05)",
+    )
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    spec = DatasetSpec(
+        regions=args.regions,
+        variables=args.variables,
+        levels=args.levels,
+        hours=args.hours,
+        runs=args.runs,
+        stations=args.stations,
+    )
+    if min(asdict(spec).values()) < 1:
+        parser.error("Dataset dimensions must be at least 1")
+
+    started = time.perf_counter()
+    model_path, station_dir = generate_dataset(spec, args.data_dir, force=args.regenerate)
+    print(
+        f"Dataset: {spec.model_rows():,} model rows, {spec.station_rows():,} station rows "
+        f"(ready in {time.perf_counter() - started:.1f}s)"
+    )
+
+    best: dict[str, StageResult] | None = None
+    for attempt in range(args.repeat):
+        with tempfile.TemporaryDirectory(prefix="region-bundle-bench-") as tmp:
+            results = run_stages(model_path, station_dir, Path(tmp))
+        print(f"Run {attempt + 1}/{args.repeat}: {results['total'].wall_s:.3f}s")
+        if best is None:
+            best = results
+        else:
+            for stage, result in results.items():
+                if stage not in best or result.wall_s < best[stage].wall_s:
+                    best[stage] = result
+
+    total = best["total"]
+    total.rows = spec.model_rows() + spec.station_rows()
+    total.rows_per_s = total.rows / total.wall_s if total.wall_s > 0 else 0.0
+    stages = {stage: asdict(result) for stage, result in best.items()}
+    report = {
+        "generated_at": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "revision": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "duckdb": duckdb.__version__,
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        },
+        "dataset": {**asdict(spec), "model_rows": spec.model_rows(), "station_rows": spec.station_rows()},
+        "repeat": args.repeat,
+        "peak_rss_bytes": bundle.peak_rss_bytes(),
+        "stages": stages,
+    }
+
+    results_path = args.results or args.data_dir / "results.json"
+    for path in filter(None, [results_path, args.save_baseline]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote benchmark results -> {path}")
+
+    if args.baseline is None:
+        print_results(report)
+        return 0
+    regressions = compare_results(
+        report,
+        json.loads(args.baseline.read_text(encoding="utf-8")),
+        tolerance=args.tolerance,
+        min_delta=args.min_delta,
+    )
+    if regressions:
+        print(f"Stages slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
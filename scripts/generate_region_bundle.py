@@ -1,41 +1,61 @@
 #!/usr/bin/env python3
-"""Generate a preprocessed region bundle JSON from model parquet + station CSV.
+"""Generate preprocessed region JSON (summary + timeseries) from model parquet + station CSV.
 
 Example usage (single region):
   python scripts/generate_region_bundle.py \
     --region south_rockies \
     --model-parquet public/data/shared/weather_model.parquet \
     --station-csv public/data/shared/weather_station.csv \
-    --output public/data/south_rockies/bundle.json \
+    --output public/data \
     --model-spec TMP@ISBL_500hPa:mean_value,p05,p95 \
     --model-spec PRATE@Sfc:mean_value \
     --station-metrics temp_c,wind_mps,hs_cm \
     --model-time-column valid_date \
     --station-time-column obs_time
 
-If --region is omitted the script discovers all regions present in both
-datasets and writes <output>/<region>/bundle.json for each.
+This writes public/data/south-rockies/summary.json and timeseries.json. If
+--region is omitted the script discovers all regions present in both datasets
+and writes <output>/<region>/summary.json and timeseries.json for each.
 
 The script expects both datasets to contain a column identifying the target
 region (defaults: `region`), an elevation band column (`elevation_band`), and a
-timestamp (`valid_date` / `obs_time`). Adjust column names via CLI flags.
+timestamp (`valid_date` / `obs_time`). Adjust column names via CLI flags; see
+--help (and README.md) for the caching, streaming and publishing options.
 """
 from __future__ import annotations
 
 import argparse
+import cProfile
+import csv
+import gzip
+import hashlib
 import json
 import logging
+import multiprocessing
 import re
 import sys
-from dataclasses import dataclass
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Sequence, Set, Tuple
+from typing import Iterable, Iterator, List, Sequence, Set, Tuple
 
 import duckdb
 import numpy as np
 import pandas as pd
 
+try:  # optional: only needed for --precompress brotli
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+try:  # POSIX only: peak RSS in --profile reports
+    import resource
+except ImportError:  # pragma: no cover - depends on the platform
+    resource = None
+
 BANDS = ["above_treeline", "treeline", "below_treeline"]
 BAND_ALIASES = {
     "above_treeline": "above_treeline",
@@ -58,6 +78,9 @@ BAND_TOKENS = sorted(BAND_ALIASES.keys(), key=len, reverse=True)
 
 logger = logging.getLogger(__name__)
 
+# Long-lived DuckDB database shared by `connect_duckdb` callers under --watch.
+_SHARED_DUCKDB: duckdb.DuckDBPyConnection | None = None
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 DEFAULT_OUTPUT_ROOT = SCRIPT_DIR.parent / "public" / "data"
 
@@ -70,6 +93,57 @@ STATION_METRIC_ALIASES: dict[str, List[str]] = {
 }
 
 AGGREGATION_HOURS = 24
+SUMMARY_WINDOW_STATS = ("avg", "sum")
+
+BUILD_LEDGER_NAME = "build_ledger.json"
+PROFILE_REPORT_NAME = "profile.json"
+REGION_INDEX_NAME = "regions.json"
+
+TIME_ENCODINGS = ("iso", "compact")
+
+MODEL_REDUCTIONS = ("none", "latest", "runs", "envelope")
+MODEL_RUN_COLUMNS = ["run_time", "init_time", "reference_time", "issue_time"]
+
+OUTPUT_FORMATS = ("json", "parquet", "both")
+MODEL_TIMESERIES_PARQUET = "model_timeseries.parquet"
+STATION_TIMESERIES_PARQUET = "station_timeseries.parquet"
+TIMESERIES_INDEX_NAME = "timeseries.index.json"
+
+PRECOMPRESS_FORMATS = {"gzip": ".gz", "brotli": ".br"}
+
+# Rough per-point JSON sizes used by --plan to estimate timeseries output.
+PLAN_BYTES_PER_TIMESTAMP = {"iso": 23, "compact": 1}
+PLAN_BYTES_PER_VALUE = 8
+DUCKDB_NUMERIC_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT",
+                        "UINTEGER", "UBIGINT", "FLOAT", "DOUBLE", "DECIMAL")
+
+GENERATION_MANIFEST_NAME = "generation.json"
+CONTENT_HASH_LENGTH = 16
+# Manifest artifact keys for the files the server looks up by role.
+MANIFEST_ARTIFACTS = {
+    "summary.json": "summary_json",
+    "timeseries.json": "timeseries_json",
+    "timeseries.index.json": "timeseries_index",
+    "pyramid/index.json": "pyramid_index",
+}
+
+STREAM_VIEW = "model_stream"
+DUCKDB_VECTOR_ROWS = 2048
+
+PYRAMID_DIR = "pyramid"
+PYRAMID_RESOLUTIONS = {"hourly": 3600, "6h": 6 * 3600}
+
+TIMESERIES_CHUNK_DIR = "chunks"
+TIMESERIES_CHUNK_INDEX = f"{TIMESERIES_CHUNK_DIR}/index.json"
+# Chunk length and alignment in epoch seconds; weekly chunks start on Mondays (1970-01-05).
+TIMESERIES_CHUNKS = {"day": (86400, 0), "week": (7 * 86400, 4 * 86400)}
+
+STATION_STORE_MANIFEST = "manifest.json"
+
+WAREHOUSE_ALIAS = "wh"
+WAREHOUSE_MODEL_TABLE = "model_rows"
+WAREHOUSE_STATION_TABLE = "station_rows"
+WAREHOUSE_SOURCES_TABLE = "ingested_files"
 
 
 @dataclass
@@ -102,16 +176,96 @@ class ModelSpec:
         return cls(variable=variable.strip(), level=level.strip(), metrics=metric_list)
 
 
+@dataclass
+class SummaryWindow:
+    label: str
+    hours: int
+    stats: List[str]
+
+    @classmethod
+    def parse(cls, raw: str) -> "SummaryWindow":
+        """Parse window in the form 24h, 7d or 72h:avg,sum (hours when no unit is given)"""
+        raw = raw.strip()
+        span, _, stats = raw.partition(":")
+        span = span.strip().lower()
+        unit = span[-1:] if span[-1:] in ("h", "d") else "h"
+        number = span[:-1] if span[-1:] in ("h", "d") else span
+        if not number.isdigit() or int(number) < 1:
+            raise argparse.ArgumentTypeError(
+                f"Summary window '{raw}' must look like 24h, 7d or 72h:avg,sum"
+            )
+        stat_list = [stat.strip().lower() for stat in stats.split(",") if stat.strip()] or ["avg"]
+        unknown = [stat for stat in stat_list if stat not in SUMMARY_WINDOW_STATS]
+        if unknown:
+            raise argparse.ArgumentTypeError(
+                f"Summary window '{raw}' has unknown statistic(s) {', '.join(unknown)}; "
+                f"choose from {', '.join(SUMMARY_WINDOW_STATS)}"
+            )
+        hours = int(number) * (24 if unit == "d" else 1)
+        return cls(label=f"{int(number)}{unit}", hours=hours, stats=list(dict.fromkeys(stat_list)))
+
+
+DEFAULT_SUMMARY_WINDOWS = (SummaryWindow(label=f"{AGGREGATION_HOURS}h", hours=AGGREGATION_HOURS, stats=["avg"]),)
+
+
+def summary_window_columns(window: SummaryWindow, metrics: Iterable[str]) -> List[str]:
+    """Summary table columns of one window: its sample count, then one per metric and statistic."""
+    return [f"samples_{window.label}"] + [
+        f"{metric}_{stat}_{window.label}" for metric in metrics for stat in window.stats
+    ]
+
+
+def summary_window_metadata(windows: Sequence[SummaryWindow]) -> dict[str, object]:
+    """Window metadata of a summary table; `window_start_utc` opens the longest window."""
+    metadata: dict[str, object] = {"aggregation_hours": max(window.hours for window in windows)}
+    if len(windows) > 1:
+        metadata["windows"] = {window.label: window.hours for window in windows}
+    return metadata
+
+
+def to_utc_seconds(series: Iterable[pd.Timestamp]) -> np.ndarray:
+    """Convert timestamps to a naive UTC ``datetime64[s]`` array (NaT for missing)."""
+    if isinstance(series, np.ndarray) and np.issubdtype(series.dtype, np.datetime64):
+        return series.astype("datetime64[s]")
+    if not isinstance(series, (pd.Series, pd.Index)):
+        series = pd.Index(list(series))
+    stamps = pd.DatetimeIndex(pd.to_datetime(series, utc=True, errors="coerce"))
+    return stamps.tz_convert(None).to_numpy().astype("datetime64[s]")
+
+
+def iso_strings(series: Iterable[pd.Timestamp]) -> np.ndarray:
+    """Format timestamps as a numpy array of ``YYYY-MM-DDTHH:MM:SSZ`` strings ("" for missing)."""
+    values = to_utc_seconds(series)
+    if not len(values):
+        return np.array([], dtype="<U20")
+    text = np.char.add(np.datetime_as_string(values, unit="s"), "Z")
+    text[np.isnat(values)] = ""
+    return text
+
+
 def to_iso(series: Iterable[pd.Timestamp]) -> List[str]:
-    out: List[str] = []
-    for ts in series:
-        if pd.isna(ts):
-            out.append("")
-        elif isinstance(ts, datetime):
-            out.append(ts.strftime("%Y-%m-%dT%H:%M:%SZ"))
-        else:
-            out.append(pd.to_datetime(ts, utc=True).strftime("%Y-%m-%dT%H:%M:%SZ"))
-    return out
+    """Format timestamps as ``YYYY-MM-DDTHH:MM:SSZ`` strings ("" for missing) in one pass."""
+    return iso_strings(series).tolist()
+
+
+def encode_time_axis(series: Iterable[pd.Timestamp], encoding: str = "iso") -> dict[str, object]:
+    """Return the time axis of a trace as ``{"x": [...]}`` or a compact ``{"t": ...}``.
+
+    The compact form is ``{"start", "step", "count"}`` in epoch seconds for
+    evenly spaced series and a plain epoch-seconds list otherwise.
+    """
+    if encoding == "iso":
+        return {"x": iso_strings(series)}
+    values = to_utc_seconds(series)
+    if np.isnat(values).any():
+        return {"x": iso_strings(values)}
+    seconds = values.astype("int64")
+    if len(seconds) == 1:
+        return {"t": {"start": int(seconds[0]), "step": 0, "count": 1}}
+    steps = np.diff(seconds)
+    if len(steps) and steps[0] > 0 and (steps == steps[0]).all():
+        return {"t": {"start": int(seconds[0]), "step": int(steps[0]), "count": int(len(seconds))}}
+    return {"t": seconds}
 
 
 def to_jsonable(value):
@@ -189,21 +343,49 @@ def canonicalize_band(value) -> str | None:
     return BAND_ALIASES.get(key)
 
 
+def categorical_map(values: pd.Series, func) -> pd.Series:
+    """Apply `func` once per distinct value of `values`; return a categorical Series.
+
+    Values mapped to None/NaN become missing, so `.notna()` filters them.
+    """
+    source = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+    mapped = [func(value) for value in source.cat.categories]
+    categories = pd.unique(pd.Series([value for value in mapped if value is not None and not pd.isna(value)], dtype=object))
+    lookup = {value: code for code, value in enumerate(categories)}
+    remap = np.array(
+        [lookup[value] if value is not None and not pd.isna(value) else -1 for value in mapped] + [-1],
+        dtype="int64",
+    )
+    # Missing inputs have code -1, which indexes the trailing -1 of `remap`.
+    codes = remap[source.cat.codes.to_numpy()]
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=values.index,
+        name=values.name,
+    )
+
+
+def concat_categorical(frames: Sequence[pd.DataFrame], columns: Iterable[str]) -> pd.DataFrame:
+    """`pd.concat` that keeps categorical columns categorical across differing categories."""
+    frames = list(frames)
+    for col in columns:
+        if len(frames) < 2 or not all(
+            col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames
+        ):
+            continue
+        categories = pd.api.types.union_categoricals([frame[col] for frame in frames], ignore_order=True).categories
+        frames = [frame.assign(**{col: frame[col].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
 def normalize_key(text: str) -> str:
     return re.sub(r"[^a-z0-9]+", "", str(text or "").lower())
 
 
-def resolve_station_metrics(
-    df: pd.DataFrame,
-    requested_metrics: Sequence[str],
-    *,
-    time_col: str,
-    band_col: str,
-    id_col: str,
-    name_col: str,
-) -> List[str]:
+def match_station_metrics(columns: Iterable[str], requested_metrics: Sequence[str]) -> List[str]:
+    """Map requested metrics to station columns by normalized name or alias, in request order."""
     available_map: dict[str, str] = {}
-    for col in df.columns:
+    for col in columns:
         available_map.setdefault(normalize_key(col), col)
 
     resolved: List[str] = []
@@ -225,7 +407,19 @@ def resolve_station_metrics(
         if col not in seen:
             seen.add(col)
             deduped.append(col)
+    return deduped
 
+
+def resolve_station_metrics(
+    df: pd.DataFrame,
+    requested_metrics: Sequence[str],
+    *,
+    time_col: str,
+    band_col: str,
+    id_col: str,
+    name_col: str,
+) -> List[str]:
+    deduped = match_station_metrics(df.columns, requested_metrics)
     if deduped:
         return deduped
 
@@ -249,12 +443,46 @@ def resolve_station_metrics(
     return candidates[:5]
 
 
+def model_regions_from_metadata(
+    con: duckdb.DuckDBPyConnection,
+    paths: Sequence[Path],
+    region_col: str,
+) -> Set[str] | None:
+    """Region values read from parquet row-group statistics, without scanning any data.
+
+    Returns None unless every row group holds a single region (min == max),
+    in which case the caller has to fall back to a scan.
+    """
+    try:
+        rows = con.execute(
+            """
+            SELECT stats_min_value, stats_max_value, stats_null_count, num_values
+            FROM parquet_metadata(?)
+            WHERE path_in_schema = ?
+            """,
+            [[str(p) for p in paths], region_col],
+        ).fetchall()
+    except duckdb.Error:
+        return None
+    if not rows:
+        return None
+    regions: Set[str] = set()
+    for min_value, max_value, null_count, num_values in rows:
+        if null_count is not None and num_values is not None and null_count == num_values:
+            continue
+        if min_value is None or min_value != max_value:
+            return None
+        regions.add(min_value)
+    return regions
+
+
 def discover_regions(
     model_parquet: Sequence[Path],
     station_csv: Path,
     *,
     model_region_col: str,
     station_region_col: str,
+    station_store: Path | None = None,
 ) -> tuple[List[str], List[str]]:
     model_paths = [Path(p) for p in model_parquet]
     for path in model_paths:
@@ -263,19 +491,20 @@ def discover_regions(
     if not station_csv.exists():
         raise FileNotFoundError(station_csv)
 
-    con = duckdb.connect(database=":memory:")
+    con = connect_duckdb()
     try:
-        query = f"SELECT DISTINCT {model_region_col} FROM read_parquet(?) WHERE {model_region_col} IS NOT NULL"
-        model_regions = {
-            slugify_region(row[0])
-            for row in con.execute(query, [[str(p) for p in model_paths]]).fetchall()
-            if row[0]
-        }
+        raw_regions = model_regions_from_metadata(con, model_paths, model_region_col)
+        if raw_regions is None:
+            query = f"SELECT DISTINCT {model_region_col} FROM read_parquet(?) WHERE {model_region_col} IS NOT NULL"
+            raw_regions = {row[0] for row in con.execute(query, [[str(p) for p in model_paths]]).fetchall()}
+        model_regions = {slugify_region(value) for value in raw_regions if value}
     finally:
         con.close()
 
-    station_paths = resolve_station_csv_paths(station_csv)
+    station_paths = [] if station_store is not None else resolve_station_csv_paths(station_csv)
     station_regions: Set[str] = set()
+    if station_store is not None:
+        station_regions = station_store_regions(station_store)
     for path in station_paths:
         try:
             station_df = pd.read_csv(
@@ -308,103 +537,249 @@ def discover_regions(
     return sorted(model_regions), sorted(station_regions)
 
 
-def load_model_dataframe(
-    parquet_paths: Sequence[Path],
-    region: str,
+def resolve_model_columns(
+    available_cols: Sequence[str],
     *,
     region_col: str,
     band_col: str,
     time_col: str,
     variable_col: str,
     level_col: str,
+) -> Tuple[str, str, str, str]:
+    """Return the (band, time, variable, level) columns present in the model files."""
+    if region_col not in available_cols:
+        raise KeyError(
+            f"Model region column '{region_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
+        )
+    band_candidates = [band_col, "elevation_band", "elevation", "band"]
+    band_col_resolved = None
+    for candidate in band_candidates:
+        if candidate in available_cols:
+            band_col_resolved = candidate
+            break
+    if band_col_resolved is None:
+        raise KeyError(
+            f"Model band column '{band_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
+        )
+    time_candidates = [time_col, "valid_date", "timestamp", "time"]
+    time_col_resolved = None
+    for candidate in time_candidates:
+        if candidate in available_cols:
+            time_col_resolved = candidate
+            break
+    if time_col_resolved is None:
+        raise KeyError(
+            f"Model time column '{time_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
+        )
+    variable_candidates = [variable_col, "variable"]
+    for candidate in variable_candidates:
+        if candidate in available_cols:
+            variable_col_resolved = candidate
+            break
+    else:
+        raise KeyError(
+            f"Model variable column '{variable_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
+        )
+    level_candidates = [level_col, "level"]
+    for candidate in level_candidates:
+        if candidate in available_cols:
+            level_col_resolved = candidate
+            break
+    else:
+        raise KeyError(
+            f"Model level column '{level_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
+        )
+    return band_col_resolved, time_col_resolved, variable_col_resolved, level_col_resolved
+
+
+def model_projection(
+    available_cols: Sequence[str],
+    resolved: Tuple[str, str, str, str],
+    *,
+    region_col: str,
+    specs: Sequence[ModelSpec] | None,
+    extra_columns: Sequence[str] = (),
+) -> List[str]:
+    """Columns to read from the model files; every column when no specs are given."""
+    if not specs:
+        return list(available_cols)
+    wanted = [region_col, *resolved, *extra_columns]
+    for spec in specs:
+        wanted.extend(spec.metrics)
+    wanted_set = set(wanted)
+    return [col for col in available_cols if col in wanted_set]
+
+
+def model_row_filters(
+    column_types: dict[str, str],
+    resolved: Tuple[str, str, str, str],
+    *,
+    specs: Sequence[ModelSpec] | None = None,
     start_ts: pd.Timestamp | None = None,
     end_ts: pd.Timestamp | None = None,
-) -> pd.DataFrame:
-    paths = [Path(p) for p in parquet_paths]
-    for parquet_path in paths:
-        if not parquet_path.exists():
-            raise FileNotFoundError(parquet_path)
+) -> List[Tuple[str, List[object]]]:
+    """SQL conditions (with their parameters) for the date range and spec pairs.
+
+    The date range is only pushed down for parquet timestamp columns; other
+    time columns are filtered after parsing.
+    """
+    _, time_col_resolved, variable_col_resolved, level_col_resolved = resolved
+    filters: List[Tuple[str, List[object]]] = []
+    time_type = column_types.get(time_col_resolved, "")
+    if time_type.startswith("TIMESTAMP"):
+        # Naive parquet timestamps are UTC, so compare them with naive UTC bounds.
+        naive = "TIME ZONE" not in time_type
+        for bound, op in ((start_ts, ">="), (end_ts, "<=")):
+            if bound is None:
+                continue
+            value = bound.tz_convert("UTC").to_pydatetime()
+            filters.append((f"{quote_ident(time_col_resolved)} {op} ?", [value.replace(tzinfo=None) if naive else value]))
+
+    if specs:
+        pairs = sorted({(spec.variable, spec.level) for spec in specs})
+        condition = " OR ".join(
+            f"({quote_ident(variable_col_resolved)} = ? AND {quote_ident(level_col_resolved)} = ?)"
+            for _ in pairs
+        )
+        filters.append((f"({condition})", [value for pair in pairs for value in pair]))
+    return filters
 
-    aliases = region_aliases(region)
-    placeholders = ",".join(["?"] * len(aliases))
 
-    con = duckdb.connect(database=":memory:")
+def model_column_types(con: duckdb.DuckDBPyConnection, paths: Sequence[Path]) -> dict[str, str]:
+    """Column name -> upper-case DuckDB type of the model parquet files (schema only)."""
+    return {
+        name: str(col_type).upper()
+        for name, col_type in con.execute(
+            "SELECT column_name, column_type FROM (DESCRIBE SELECT * FROM read_parquet(?))",
+            [[str(p) for p in paths]],
+        ).fetchall()
+    }
+
+
+def query_model_rows(
+    paths: Sequence[Path],
+    aliases: Sequence[str],
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    variable_col: str,
+    level_col: str,
+    specs: Sequence[ModelSpec] | None = None,
+    extra_columns: Sequence[str] = (),
+    start_ts: pd.Timestamp | None = None,
+    end_ts: pd.Timestamp | None = None,
+    warehouse: Path | None = None,
+) -> Tuple[pd.DataFrame, Tuple[str, str, str, str]]:
+    """Scan the model parquet files once for rows whose region matches any alias.
+
+    Filters are written against the raw columns so DuckDB can prune row groups
+    from parquet statistics: the region aliases are first resolved to the raw
+    region values present in the files, the date range is applied to timestamp
+    columns, and with `specs` only their variable/level pairs and metric
+    columns (plus `extra_columns`) are read. With a `warehouse` the clustered
+    `model_rows` table is read instead, filtered on its canonical region slug.
+    """
+    path_list = [str(p) for p in paths]
+    con = connect_duckdb()
     try:
-        con.execute("SELECT * FROM read_parquet(?) LIMIT 0", [[str(p) for p in paths]])
-        available_cols = [desc[0] for desc in con.description]
-        if region_col not in available_cols:
-            raise KeyError(
-                f"Model region column '{region_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
-            )
-        band_candidates = [band_col, "elevation_band", "elevation", "band"]
-        band_col_resolved = None
-        for candidate in band_candidates:
-            if candidate in available_cols:
-                band_col_resolved = candidate
-                break
-        if band_col_resolved is None:
-            raise KeyError(
-                f"Model band column '{band_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
-            )
-        time_candidates = [time_col, "valid_date", "timestamp", "time"]
-        time_col_resolved = None
-        for candidate in time_candidates:
-            if candidate in available_cols:
-                time_col_resolved = candidate
-                break
-        if time_col_resolved is None:
-            raise KeyError(
-                f"Model time column '{time_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
-            )
-        variable_candidates = [variable_col, "variable"]
-        for candidate in variable_candidates:
-            if candidate in available_cols:
-                variable_col_resolved = candidate
-                break
+        con.execute("SET TimeZone = 'UTC'")
+        if warehouse is not None:
+            attach_warehouse(con, warehouse)
+            source = f"{WAREHOUSE_ALIAS}.{WAREHOUSE_MODEL_TABLE}"
+            source_params: List[object] = []
+            column_types = {
+                name: str(col_type).upper()
+                for name, col_type in con.execute(
+                    f"SELECT column_name, column_type FROM (DESCRIBE SELECT * FROM {source})"
+                ).fetchall()
+                if not name.startswith("__")
+            }
         else:
-            raise KeyError(
-                f"Model variable column '{variable_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
-            )
-        level_candidates = [level_col, "level"]
-        for candidate in level_candidates:
-            if candidate in available_cols:
-                level_col_resolved = candidate
-                break
+            source = "read_parquet(?)"
+            source_params = [path_list]
+            column_types = model_column_types(con, paths)
+        available_cols = list(column_types)
+        resolved = resolve_model_columns(
+            available_cols,
+            region_col=region_col,
+            band_col=band_col,
+            time_col=time_col,
+            variable_col=variable_col,
+            level_col=level_col,
+        )
+        band_col_resolved = resolved[0]
+
+        alias_set = set(aliases)
+        if warehouse is not None:
+            # Slugs are among their own aliases, so the canonical column is matched directly.
+            region_filter_col, raw_regions = "__region", sorted(alias_set)
         else:
-            raise KeyError(
-                f"Model level column '{level_col}' not found in model parquet files; available columns: {sorted(available_cols)}"
+            region_values = model_regions_from_metadata(con, paths, region_col)
+            if region_values is None:
+                region_values = {
+                    value
+                    for (value,) in con.execute(
+                        f"SELECT DISTINCT {quote_ident(region_col)} FROM read_parquet(?)", [path_list]
+                    ).fetchall()
+                }
+            region_filter_col = quote_ident(region_col)
+            raw_regions = sorted(
+                value for value in region_values if value is not None and str(value).lower() in alias_set
             )
-        con.execute(
-            """
-            SELECT *,
+        conditions = [
+            f"{region_filter_col} IN ({', '.join(['?'] * len(raw_regions))})" if raw_regions else "false"
+        ]
+        params: List[object] = list(raw_regions)
+
+        for condition, values in model_row_filters(
+            column_types, resolved, specs=specs, start_ts=start_ts, end_ts=end_ts
+        ):
+            conditions.append(condition)
+            params.extend(values)
+
+        columns = model_projection(
+            available_cols,
+            resolved,
+            region_col=region_col,
+            specs=specs,
+            extra_columns=[col for col in extra_columns if col in column_types],
+        )
+        query = """
+            SELECT {columns},
                    lower({band_col}) AS __band_lower,
                    lower({region_col}) AS __region_lower
-            FROM read_parquet(?)
-            WHERE lower({region_col}) IN ({aliases})
-            """.format(
-                region_col=region_col,
-                band_col=band_col_resolved,
-                aliases=placeholders,
-            ),
-            [[str(p) for p in paths], *aliases],
+            FROM {source}
+            WHERE {conditions}{order}
+        """.format(
+            columns=", ".join(quote_ident(col) for col in columns),
+            band_col=quote_ident(band_col_resolved),
+            region_col="__region" if warehouse is not None else quote_ident(region_col),
+            source=source,
+            conditions="\n              AND ".join(conditions),
+            # Return warehouse rows in source-file order, as a parquet scan would.
+            order="\n            ORDER BY __source, __seq" if warehouse is not None else "",
         )
-        df = con.df()
+        key_columns = [region_col, *resolved[:1], *resolved[2:]]
+        categorical = [col for col in key_columns if column_types.get(col) == "VARCHAR"]
+        df = fetch_categorical(con, query, [*source_params, *params], [*categorical, "__band_lower", "__region_lower"])
     finally:
         con.close()
+    return df, resolved
 
-    if df.empty:
-        raise ValueError(
-            f"No records matching region='{region}' in provided model parquet files"
-        )
-
-    logger.debug(
-        "Model load for region '%s': %d rows before filtering (band column '%s', time column '%s')",
-        region,
-        len(df),
-        band_col_resolved,
-        time_col_resolved,
-    )
 
+def prepare_model_frame(
+    df: pd.DataFrame,
+    resolved: Tuple[str, str, str, str],
+    region: str,
+    *,
+    region_col: str,
+    time_col: str,
+    start_ts: pd.Timestamp | None = None,
+    end_ts: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Apply date filters, column renames and band canonicalization to raw model rows."""
+    band_col_resolved, time_col_resolved, variable_col_resolved, level_col_resolved = resolved
     required = {
         time_col_resolved,
         band_col_resolved,
@@ -427,7 +802,7 @@ def load_model_dataframe(
     if df.empty:
         raise ValueError(
             "No model rows remaining after applying date filters for "
-            f"region='{region}' in {parquet_path}"
+            f"region='{region}'"
         )
     df = df.rename(
         columns={
@@ -437,7 +812,7 @@ def load_model_dataframe(
             time_col_resolved: time_col,
         }
     )
-    df["__band_canonical"] = df["__band_original"].apply(canonicalize_band)
+    df["__band_canonical"] = categorical_map(df["__band_original"], canonicalize_band)
     df = df[df["__band_canonical"].notna()]
     if df.empty:
         raise ValueError(
@@ -445,6 +820,74 @@ def load_model_dataframe(
         )
     df["__band_original"] = df["__band_canonical"]
     df["__band_lower"] = df["__band_canonical"]
+    return df
+
+
+def model_extra_columns(args: argparse.Namespace) -> List[str]:
+    """Non-metric model columns to keep when loading only the requested specs."""
+    columns = ([args.model_run_column] if args.model_run_column else []) + MODEL_RUN_COLUMNS
+    if args.model_lead_column:
+        columns.append(args.model_lead_column)
+    return columns
+
+
+def load_model_dataframe(
+    parquet_paths: Sequence[Path],
+    region: str,
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    variable_col: str,
+    level_col: str,
+    start_ts: pd.Timestamp | None = None,
+    end_ts: pd.Timestamp | None = None,
+    specs: Sequence[ModelSpec] | None = None,
+    extra_columns: Sequence[str] = (),
+    warehouse: Path | None = None,
+) -> pd.DataFrame:
+    paths = [Path(p) for p in parquet_paths or []]
+    for parquet_path in paths if warehouse is None else []:
+        if not parquet_path.exists():
+            raise FileNotFoundError(parquet_path)
+
+    df, resolved = query_model_rows(
+        paths,
+        region_aliases(region),
+        region_col=region_col,
+        band_col=band_col,
+        time_col=time_col,
+        variable_col=variable_col,
+        level_col=level_col,
+        specs=specs,
+        extra_columns=extra_columns,
+        start_ts=start_ts,
+        end_ts=end_ts,
+        warehouse=warehouse,
+    )
+
+    if df.empty:
+        raise ValueError(
+            f"No records matching region='{region}' in provided model parquet files"
+        )
+
+    logger.debug(
+        "Model load for region '%s': %d rows before filtering (band column '%s', time column '%s')",
+        region,
+        len(df),
+        resolved[0],
+        resolved[1],
+    )
+
+    df = prepare_model_frame(
+        df,
+        resolved,
+        region,
+        region_col=region_col,
+        time_col=time_col,
+        start_ts=start_ts,
+        end_ts=end_ts,
+    )
     logger.debug(
         "Model load for region '%s': %d rows after filters",
         region,
@@ -453,7 +896,87 @@ def load_model_dataframe(
     return df
 
 
+def load_model_dataframes(
+    parquet_paths: Sequence[Path],
+    regions: Sequence[str],
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    variable_col: str,
+    level_col: str,
+    start_ts: pd.Timestamp | None = None,
+    end_ts: pd.Timestamp | None = None,
+    specs: Sequence[ModelSpec] | None = None,
+    extra_columns: Sequence[str] = (),
+    warehouse: Path | None = None,
+) -> dict[str, pd.DataFrame]:
+    """Load model rows for many regions with a single pass over the parquet files.
+
+    Rows are split by canonical region slug; regions without any surviving
+    rows are absent from the returned mapping.
+    """
+    paths = [Path(p) for p in parquet_paths or []]
+    for parquet_path in paths if warehouse is None else []:
+        if not parquet_path.exists():
+            raise FileNotFoundError(parquet_path)
+
+    alias_to_slug: dict[str, str] = {}
+    for region in regions:
+        for alias in region_aliases(region):
+            alias_to_slug.setdefault(alias, region)
+
+    df, resolved = query_model_rows(
+        paths,
+        sorted(alias_to_slug),
+        region_col=region_col,
+        band_col=band_col,
+        time_col=time_col,
+        variable_col=variable_col,
+        level_col=level_col,
+        specs=specs,
+        extra_columns=extra_columns,
+        start_ts=start_ts,
+        end_ts=end_ts,
+        warehouse=warehouse,
+    )
+    logger.debug(
+        "Model load for %d regions: %d rows before filtering (band column '%s', time column '%s')",
+        len(regions),
+        len(df),
+        resolved[0],
+        resolved[1],
+    )
+    if df.empty:
+        return {}
+
+    df = prepare_model_frame(
+        df,
+        resolved,
+        ", ".join(regions),
+        region_col=region_col,
+        time_col=time_col,
+        start_ts=start_ts,
+        end_ts=end_ts,
+    )
+    df["__region_slug"] = categorical_map(df["__region_lower"], alias_to_slug.get)
+
+    frames: dict[str, pd.DataFrame] = {}
+    for region_slug, region_df in df.groupby("__region_slug", sort=False, observed=True):
+        frames[str(region_slug)] = region_df.drop(columns="__region_slug")
+        logger.debug(
+            "Model load for region '%s': %d rows after filters",
+            region_slug,
+            len(region_df),
+        )
+    return frames
+
+
 def discover_model_specs(df: pd.DataFrame, time_col: str) -> List[ModelSpec]:
+    """One spec per (variable, level) with the numeric columns that have any value.
+
+    Uses a single grouped count; groups keep their order of first appearance.
+    """
     exclude_cols = {
         time_col,
         "variable",
@@ -468,75 +991,753 @@ def discover_model_specs(df: pd.DataFrame, time_col: str) -> List[ModelSpec]:
         for col in df.columns
         if col not in exclude_cols and pd.api.types.is_numeric_dtype(df[col])
     ]
+    if df.empty:
+        return []
+    counts = df.groupby(["variable", "level"], sort=False, observed=True)[numeric_cols].count()
     specs: List[ModelSpec] = []
     seen: Set[Tuple[str, str]] = set()
-    unique_pairs = df[["variable", "level"]].drop_duplicates()
-    for _, row in unique_pairs.iterrows():
-        variable = str(row["variable"])
-        level = str(row["level"])
-        subset = df[(df["variable"] == variable) & (df["level"] == level)]
-        metrics = [col for col in numeric_cols if subset[col].notna().any()]
-        if not metrics:
-            continue
-        key = (variable, level)
-        if key in seen:
+    for (variable, level), row in zip(counts.index, counts.to_numpy()):
+        metrics = [col for col, count in zip(numeric_cols, row) if count > 0]
+        key = (str(variable), str(level))
+        if not metrics or key in seen:
             continue
         seen.add(key)
-        specs.append(ModelSpec(variable=variable, level=level, metrics=metrics))
+        specs.append(ModelSpec(variable=key[0], level=key[1], metrics=metrics))
     return specs
 
 
-def load_station_dataframe(
-    csv_path: Path,
-    region: str,
+def station_time_candidates(time_col: str) -> List[str]:
+    return [time_col, "obs_time", "timestamp", "UTC_DATE", "utc_date"]
+
+
+def read_station_csv(
+    path: Path,
     *,
     region_col: str,
     band_col: str,
-    time_col: str,
-    start_ts: pd.Timestamp | None = None,
-    end_ts: pd.Timestamp | None = None,
 ) -> pd.DataFrame:
-    if not csv_path.exists():
-        raise FileNotFoundError(csv_path)
-
-    station_paths = resolve_station_csv_paths(csv_path)
-    target_slug = slugify_region(region)
-    time_candidates = [time_col, "obs_time", "timestamp", "UTC_DATE", "utc_date"]
-    logger.debug(
-        "Loading %d station CSV files for region '%s'",
-        len(station_paths),
-        region,
+    """Read one station CSV, filling region/band from the file name when absent."""
+    df = pd.read_csv(path, dtype=str, low_memory=False)
+    if region_col not in df.columns:
+        region_hint, band_hint = infer_region_band_from_filename(path)
+        if not region_hint:
+            raise KeyError(
+                f"Station region column '{region_col}' not found in {path}"
+            )
+        df[region_col] = region_hint
+        if band_col not in df.columns and band_hint:
+            df[band_col] = band_hint
+    elif band_col not in df.columns:
+        _, band_hint = infer_region_band_from_filename(path)
+        if band_hint:
+            df[band_col] = band_hint
+    slugs = {value: slugify_region(value) for value in df[region_col].unique()}
+    df["__region_slug"] = df[region_col].map(slugs)
+    return df
+
+
+def read_csv_header(path: Path) -> List[str]:
+    with path.open("r", encoding="utf-8-sig", newline="") as fh:
+        return next(csv.reader(fh), [])
+
+
+def varchar_csv_scan(header: Sequence[str]) -> str:
+    """`read_csv(?)` reading a comma-separated file with `header` as all-VARCHAR columns.
+
+    Naming the columns skips DuckDB's dialect sniffer, which dominates the read
+    time of small files; headers it cannot express (blank or repeated names)
+    are still sniffed.
+    """
+    if not header or not all(header) or len(set(header)) != len(header):
+        return "read_csv(?, header = true, all_varchar = true, null_padding = true)"
+    columns = ", ".join(f"{sql_literal(name)}: 'VARCHAR'" for name in header)
+    return (
+        "read_csv(?, header = true, auto_detect = false, delim = ',', quote = '\"', escape = '\"', "
+        f"null_padding = true, columns = {{{columns}}})"
     )
-    frames: List[pd.DataFrame] = []
-    for path in station_paths:
-        df = pd.read_csv(path, dtype=str, low_memory=False)
-        region_source_col = region_col
-        if region_col not in df.columns:
-            region_hint, band_hint = infer_region_band_from_filename(path)
-            if not region_hint:
-                raise KeyError(
-                    f"Station region column '{region_col}' not found in {path}"
+
+
+def read_station_csv_typed(
+    con: duckdb.DuckDBPyConnection,
+    path: Path,
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    id_col: str,
+    name_col: str,
+    metrics: Sequence[str],
+    time_format: str | None = None,
+    trailing_hours: int | None = None,
+) -> pd.DataFrame:
+    """Read the columns a build needs from one station CSV with DuckDB's parallel reader.
+
+    The time and metric columns are resolved once from the header. Only the key,
+    time and metric columns are read. Metrics are parsed as DOUBLE. Times are
+    parsed as ISO 8601 or with `time_format`, and only values that fail that
+    parse go through pandas' format inference. Region/band come from the file
+    name when the columns are absent, as in `read_station_csv`. With
+    `trailing_hours` only rows within that many hours of their (band, station)
+    latest time in this file are fetched, plus rows whose time is left to pandas.
+    """
+    header = read_csv_header(path)
+    columns = set(header)
+    time_col_resolved = next((c for c in station_time_candidates(time_col) if c in columns), None)
+    keys = [col for col in (region_col, band_col, id_col, name_col) if col in columns]
+    metric_cols = match_station_metrics(header, metrics)
+    if not metric_cols:
+        # Same fallback pool as resolve_station_metrics; non-numeric columns come back all-null.
+        skipped = {*keys, time_col_resolved, "region"}
+        metric_cols = [col for col in header if col not in skipped and not col.startswith("__")]
+
+    select = [quote_ident(col) for col in keys]
+    if time_col_resolved is not None:
+        raw = quote_ident(time_col_resolved)
+        parsed = (
+            f"TRY_CAST(TRY_STRPTIME({raw}, ?) AS TIMESTAMPTZ)" if time_format else f"TRY_CAST({raw} AS TIMESTAMPTZ)"
+        )
+        select.append(f"{parsed} AS {raw}")
+        select.append(f"CASE WHEN {parsed} IS NULL THEN {raw} END AS __time_raw")
+    select.extend(f"TRY_CAST({quote_ident(col)} AS DOUBLE) AS {quote_ident(col)}" for col in metric_cols)
+    params: List[object] = [time_format, time_format] if time_format and time_col_resolved else []
+    params.append(str(path))
+    query = f"SELECT {', '.join(select)} FROM {varchar_csv_scan(header)}"
+    if trailing_hours is not None and time_col_resolved is not None:
+        partition = ", ".join(quote_ident(col) for col in (band_col, id_col) if col in columns)
+        window = f"max({parsed}) OVER ({f'PARTITION BY {partition}' if partition else ''})"
+        query += f" QUALIFY {parsed} IS NULL OR {parsed} >= {window} - INTERVAL {int(trailing_hours)} HOUR"
+        if time_format:
+            params.extend([time_format] * 3)
+    con.execute("SET TimeZone = 'UTC'")
+    df = fetch_categorical(con, query, params, keys)
+
+    if time_col_resolved is not None:
+        leftover = df["__time_raw"].notna()
+        if leftover.any():
+            df.loc[leftover, time_col_resolved] = pd.to_datetime(
+                df.loc[leftover, "__time_raw"], utc=True, errors="coerce"
+            )
+        df = df.drop(columns="__time_raw")
+
+    if region_col not in df.columns:
+        region_hint, band_hint = infer_region_band_from_filename(path)
+        if not region_hint:
+            raise KeyError(
+                f"Station region column '{region_col}' not found in {path}"
+            )
+        df[region_col] = pd.Categorical([region_hint] * len(df))
+        if band_col not in df.columns and band_hint:
+            df[band_col] = pd.Categorical([band_hint] * len(df))
+    elif band_col not in df.columns:
+        _, band_hint = infer_region_band_from_filename(path)
+        if band_hint:
+            df[band_col] = pd.Categorical([band_hint] * len(df))
+    df["__region_slug"] = categorical_map(df[region_col], slugify_region)
+    return df
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def convert_station_csv(
+    path: Path,
+    store_dir: Path,
+    digest: str,
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    id_col: str,
+    name_col: str,
+) -> List[str]:
+    """Write one station CSV into region/band partitions; return the files written."""
+    df = typed_station_frame(
+        path,
+        region_col=region_col,
+        band_col=band_col,
+        time_col=time_col,
+        id_col=id_col,
+        name_col=name_col,
+    )
+    if df is None:
+        return []
+
+    written: List[str] = []
+    con = connect_duckdb()
+    try:
+        for (region_slug, band), part in df.groupby(["__region_slug", band_col], sort=True):
+            rel_path = Path(f"region={region_slug}") / f"band={band}" / f"{path.name}.{digest[:16]}.parquet"
+            out_path = store_dir / rel_path
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            con.register("station_part", part.drop(columns=["__region_slug"]).reset_index(drop=True))
+            con.execute(
+                "COPY station_part TO '{}' (FORMAT parquet, COMPRESSION zstd)".format(
+                    str(out_path).replace("'", "''")
                 )
-            df[region_col] = region_hint
-            region_source_col = region_col
-            if band_col not in df.columns and band_hint:
-                df[band_col] = band_hint
-        elif band_col not in df.columns:
-            _, band_hint = infer_region_band_from_filename(path)
-            if band_hint:
-                df[band_col] = band_hint
-        df["__region_slug"] = df[region_source_col].apply(slugify_region)
-        df = df.loc[df["__region_slug"] == target_slug].copy()
-        if df.empty:
+            )
+            con.unregister("station_part")
+            written.append(rel_path.as_posix())
+    finally:
+        con.close()
+    return written
+
+
+def typed_station_frame(
+    path: Path,
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    id_col: str,
+    name_col: str,
+) -> pd.DataFrame | None:
+    """Read one station CSV with canonical bands and typed time/numeric columns.
+
+    Returns None when the file has no band column. Shared by the station store
+    and the warehouse ingest.
+    """
+    df = read_station_csv(path, region_col=region_col, band_col=band_col)
+    if band_col not in df.columns:
+        logger.warning("Station CSV %s has no '%s' column; skipping", path, band_col)
+        return None
+    bands = {value: canonicalize_band(value) for value in df[band_col].unique()}
+    df[band_col] = df[band_col].map(bands)
+    df = df[df[band_col].notna() & df["__region_slug"].notna()]
+
+    time_candidates = set(station_time_candidates(time_col))
+    keep_text = {region_col, band_col, id_col, name_col}
+    for col in df.columns:
+        if col.startswith("__") or col in keep_text:
+            continue
+        if col in time_candidates:
+            df[col] = pd.to_datetime(df[col], utc=True, errors="coerce")
+            continue
+        converted = pd.to_numeric(df[col], errors="coerce")
+        if converted.notna().sum() == df[col].notna().sum():
+            df[col] = converted
+    return df
+
+
+def sync_station_store(
+    csv_path: Path,
+    store_dir: Path,
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    id_col: str,
+    name_col: str,
+) -> Path:
+    """Bring the partitioned Parquet station store in line with the station CSVs.
+
+    Only CSVs whose size/mtime changed (and whose content hash then differs)
+    are re-converted; partitions of removed CSVs are deleted.
+    """
+    if not csv_path.exists():
+        raise FileNotFoundError(csv_path)
+    station_paths = resolve_station_csv_paths(csv_path)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = store_dir / STATION_STORE_MANIFEST
+    options = {
+        "region_col": region_col,
+        "band_col": band_col,
+        "time_col": time_col,
+        "id_col": id_col,
+        "name_col": name_col,
+    }
+    manifest: dict = {"version": 1, "options": options, "sources": {}}
+    if manifest_path.exists():
+        try:
+            previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            previous = {}
+        if previous.get("version") == 1 and previous.get("options") == options:
+            manifest["sources"] = previous.get("sources", {})
+        elif previous:
+            logger.info("Station store options changed; rebuilding %s", store_dir)
+
+    sources: dict[str, dict] = manifest["sources"]
+    wanted = {path.name: path for path in station_paths}
+
+    def remove_files(entry: dict) -> None:
+        for rel in entry.get("files", []):
+            file_path = store_dir / rel
+            file_path.unlink(missing_ok=True)
+            for parent in (file_path.parent, file_path.parent.parent):
+                if parent != store_dir and parent.is_dir() and not any(parent.iterdir()):
+                    parent.rmdir()
+
+    for name in sorted(set(sources) - set(wanted)):
+        logger.info("Station store: removing partitions of deleted CSV %s", name)
+        remove_files(sources.pop(name))
+
+    converted = 0
+    for name, path in wanted.items():
+        stat = path.stat()
+        entry = sources.get(name)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
             continue
-        frames.append(df)
+        digest = file_sha256(path)
+        if entry and entry.get("sha256") == digest:
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            continue
+        if entry:
+            remove_files(entry)
+        files = convert_station_csv(
+            path,
+            store_dir,
+            digest,
+            region_col=region_col,
+            band_col=band_col,
+            time_col=time_col,
+            id_col=id_col,
+            name_col=name_col,
+        )
+        sources[name] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "files": files,
+        }
+        converted += 1
+
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp_path.replace(manifest_path)
+    logger.info(
+        "Station store %s: %d CSV file(s) converted, %d up to date",
+        store_dir,
+        converted,
+        len(wanted) - converted,
+    )
+    return store_dir
+
+
+def station_store_regions(store_dir: Path) -> Set[str]:
+    prefix = "region="
+    return {
+        entry.name[len(prefix):]
+        for entry in store_dir.iterdir()
+        if entry.is_dir() and entry.name.startswith(prefix)
+    }
+
+
+def read_station_store(store_dir: Path, region_slug: str) -> List[pd.DataFrame]:
+    """Read every partition file stored for one region."""
+    region_dir = store_dir / f"region={region_slug}"
+    if not region_dir.is_dir():
+        return []
+    paths = sorted(region_dir.glob("band=*/*.parquet"), key=lambda p: (p.name, p.parent.name))
+    frames: List[pd.DataFrame] = []
+    con = connect_duckdb()
+    try:
+        con.execute("SET TimeZone = 'UTC'")
+        for path in paths:
+            frames.append(con.execute("SELECT * FROM read_parquet(?)", [str(path)]).df())
+    finally:
+        con.close()
+    return frames
+
+
+def ensure_table_columns(con: duckdb.DuckDBPyConnection, table: str, relation: str) -> None:
+    """Create `table` shaped like `relation`, or widen it so `relation` can be inserted BY NAME.
+
+    Missing columns are added; a column whose type differs becomes DOUBLE when
+    both types are numeric and VARCHAR otherwise.
+    """
+    new_types = {
+        name: str(col_type).upper()
+        for name, col_type in con.execute(f"SELECT column_name, column_type FROM (DESCRIBE {relation})").fetchall()
+    }
+    existing = {
+        name: str(col_type).upper()
+        for name, col_type in con.execute(
+            "SELECT column_name, data_type FROM duckdb_columns() WHERE table_name = ? AND database_name = current_database()",
+            [table],
+        ).fetchall()
+    }
+    if not existing:
+        con.execute(f"CREATE TABLE {table} AS SELECT * FROM ({relation}) LIMIT 0")
+        return
+    for name, col_type in new_types.items():
+        ident = quote_ident(name)
+        current = existing.get(name)
+        if current is None:
+            con.execute(f"ALTER TABLE {table} ADD COLUMN {ident} {col_type}")
+        elif current != col_type and current != "VARCHAR":
+            numeric = all(t.split("(")[0] in DUCKDB_NUMERIC_TYPES for t in (current, col_type))
+            widened = "DOUBLE" if numeric else "VARCHAR"
+            if current != widened:
+                con.execute(f"ALTER TABLE {table} ALTER {ident} TYPE {widened}")
+
+
+def ingest_model_file(
+    con: duckdb.DuckDBPyConnection,
+    path: Path,
+    source: str,
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    variable_col: str,
+    level_col: str,
+) -> int:
+    """Append one model parquet file to the warehouse, sorted by (region, band, time).
+
+    Rows get the canonical region slug (`__region`), band (`__band`) and their
+    position in the file (`__seq`); rows whose band is not recognized or whose
+    time does not parse are dropped, as the bundle builder would drop them.
+    """
+    parquet = f"read_parquet({sql_literal(str(path))}, file_row_number = true)"
+    column_types = {
+        name: str(col_type).upper()
+        for name, col_type in con.execute(f"SELECT column_name, column_type FROM (DESCRIBE SELECT * FROM {parquet})").fetchall()
+        if name != "file_row_number"
+    }
+    band_col_resolved, time_col_resolved, _, _ = resolve_model_columns(
+        list(column_types),
+        region_col=region_col,
+        band_col=band_col,
+        time_col=time_col,
+        variable_col=variable_col,
+        level_col=level_col,
+    )
+    raw_regions = [
+        value
+        for (value,) in con.execute(f"SELECT DISTINCT CAST({quote_ident(region_col)} AS VARCHAR) FROM {parquet}").fetchall()
+        if value
+    ]
+    region_cases = " ".join(f"WHEN {sql_literal(raw)} THEN {sql_literal(slugify_region(raw))}" for raw in raw_regions)
+    band_cases = " ".join(f"WHEN {sql_literal(alias)} THEN {sql_literal(band)}" for alias, band in BAND_ALIASES.items())
+    time_ident = quote_ident(time_col_resolved)
+    replace = ""
+    if column_types[time_col_resolved] != "TIMESTAMP WITH TIME ZONE":
+        replace = f" REPLACE (TRY_CAST({time_ident} AS TIMESTAMPTZ) AS {time_ident})"
+    relation = f"""
+        SELECT *
+        FROM (
+            SELECT * EXCLUDE (file_row_number){replace},
+                   file_row_number AS __seq,
+                   CASE CAST({quote_ident(region_col)} AS VARCHAR) {region_cases or "WHEN NULL THEN NULL"} END AS __region,
+                   CASE lower(trim(CAST({quote_ident(band_col_resolved)} AS VARCHAR))) {band_cases} END AS __band,
+                   {sql_literal(source)} AS __source
+            FROM {parquet}
+        )
+        WHERE __region IS NOT NULL AND __band IS NOT NULL AND {time_ident} IS NOT NULL
+    """
+    ensure_table_columns(con, WAREHOUSE_MODEL_TABLE, relation)
+    con.execute(f"INSERT INTO {WAREHOUSE_MODEL_TABLE} BY NAME SELECT * FROM ({relation}) ORDER BY __region, __band, {time_ident}")
+    (rows,) = con.execute(f"SELECT count(*) FROM {WAREHOUSE_MODEL_TABLE} WHERE __source = ?", [source]).fetchone()
+    return int(rows)
+
+
+def ingest_station_file(
+    con: duckdb.DuckDBPyConnection,
+    path: Path,
+    source: str,
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    id_col: str,
+    name_col: str,
+) -> int:
+    """Append one station CSV to the warehouse, typed as in the station store."""
+    df = typed_station_frame(
+        path,
+        region_col=region_col,
+        band_col=band_col,
+        time_col=time_col,
+        id_col=id_col,
+        name_col=name_col,
+    )
+    if df is None or df.empty:
+        return 0
+    df = df.assign(__source=source).reset_index(drop=True)
+    order = ["__region_slug", band_col] + [col for col in station_time_candidates(time_col) if col in df.columns][:1]
+    con.register("station_part", df)
+    try:
+        ensure_table_columns(con, WAREHOUSE_STATION_TABLE, "SELECT * FROM station_part")
+        con.execute(
+            f"INSERT INTO {WAREHOUSE_STATION_TABLE} BY NAME SELECT * FROM station_part ORDER BY "
+            + ", ".join(quote_ident(col) for col in order)
+        )
+    finally:
+        con.unregister("station_part")
+    return len(df)
+
+
+def ingest_warehouse(
+    warehouse: Path,
+    model_parquet: Sequence[Path],
+    station_csv: Path | None,
+    *,
+    model_region_col: str,
+    model_band_col: str,
+    model_time_col: str,
+    model_variable_col: str,
+    model_level_col: str,
+    station_region_col: str,
+    station_band_col: str,
+    station_time_col: str,
+    station_id_col: str,
+    station_name_col: str,
+    recluster: bool = False,
+) -> dict[str, int]:
+    """Bring the warehouse in line with the input files; return counts of what changed.
+
+    Like the station store, only files whose size/mtime and then content hash
+    changed are (re-)ingested, replacing their previous rows; rows of removed
+    files are deleted. New files therefore cost only their own rows.
+    """
+    sources = {
+        "model": [Path(p) for p in model_parquet],
+        "station": resolve_station_csv_paths(station_csv) if station_csv is not None else [],
+    }
+    tables = {"model": WAREHOUSE_MODEL_TABLE, "station": WAREHOUSE_STATION_TABLE}
+    counts = {"ingested": 0, "unchanged": 0, "removed": 0, "rows": 0}
+    warehouse.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(warehouse))
+    try:
+        con.execute("SET TimeZone = 'UTC'")
+        con.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {WAREHOUSE_SOURCES_TABLE} (
+                kind VARCHAR, name VARCHAR, size BIGINT, mtime_ns BIGINT, sha256 VARCHAR,
+                rows BIGINT, ingested_at TIMESTAMPTZ, PRIMARY KEY (kind, name)
+            )
+            """
+        )
+        known = {
+            (kind, name): (size, mtime_ns, sha256)
+            for kind, name, size, mtime_ns, sha256 in con.execute(
+                f"SELECT kind, name, size, mtime_ns, sha256 FROM {WAREHOUSE_SOURCES_TABLE}"
+            ).fetchall()
+        }
+        existing_tables = {name for (name,) in con.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+
+        def delete_rows(kind: str, name: str) -> None:
+            if tables[kind] in existing_tables:
+                con.execute(f"DELETE FROM {tables[kind]} WHERE __source = ?", [name])
+            con.execute(f"DELETE FROM {WAREHOUSE_SOURCES_TABLE} WHERE kind = ? AND name = ?", [kind, name])
+
+        for kind, paths in sources.items():
+            wanted = {str(path.resolve()): path for path in paths}
+            for _, name in sorted(key for key in known if key[0] == kind and key[1] not in wanted):
+                logger.info("Warehouse: removing rows of deleted %s file %s", kind, name)
+                con.execute("BEGIN TRANSACTION")
+                delete_rows(kind, name)
+                con.execute("COMMIT")
+                counts["removed"] += 1
+            for name, path in wanted.items():
+                stat = path.stat()
+                entry = known.get((kind, name))
+                if entry and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+                    counts["unchanged"] += 1
+                    continue
+                digest = file_sha256(path)
+                if entry and entry[2] == digest:
+                    con.execute(
+                        f"UPDATE {WAREHOUSE_SOURCES_TABLE} SET size = ?, mtime_ns = ? WHERE kind = ? AND name = ?",
+                        [stat.st_size, stat.st_mtime_ns, kind, name],
+                    )
+                    counts["unchanged"] += 1
+                    continue
+                con.execute("BEGIN TRANSACTION")
+                try:
+                    delete_rows(kind, name)
+                    if kind == "model":
+                        rows = ingest_model_file(
+                            con,
+                            path,
+                            name,
+                            region_col=model_region_col,
+                            band_col=model_band_col,
+                            time_col=model_time_col,
+                            variable_col=model_variable_col,
+                            level_col=model_level_col,
+                        )
+                    else:
+                        rows = ingest_station_file(
+                            con,
+                            path,
+                            name,
+                            region_col=station_region_col,
+                            band_col=station_band_col,
+                            time_col=station_time_col,
+                            id_col=station_id_col,
+                            name_col=station_name_col,
+                        )
+                    con.execute(
+                        f"INSERT INTO {WAREHOUSE_SOURCES_TABLE} VALUES (?, ?, ?, ?, ?, ?, now())",
+                        [kind, name, stat.st_size, stat.st_mtime_ns, digest, rows],
+                    )
+                    con.execute("COMMIT")
+                except Exception:
+                    con.execute("ROLLBACK")
+                    raise
+                existing_tables.add(tables[kind])
+                logger.info("Warehouse: ingested %d row(s) from %s", rows, path)
+                counts["ingested"] += 1
+                counts["rows"] += rows
+
+        if recluster:
+            model_time = quote_ident(model_time_col)
+            for table, keys in (
+                (WAREHOUSE_MODEL_TABLE, f"__region, __band, {model_time}"),
+                (WAREHOUSE_STATION_TABLE, f"__region_slug, {quote_ident(station_band_col)}"),
+            ):
+                if table in existing_tables:
+                    con.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM {table} ORDER BY {keys}")
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    return counts
+
+
+def attach_warehouse(con: duckdb.DuckDBPyConnection, warehouse: Path) -> None:
+    """Attach the warehouse read-only as `wh` (temp tables and types stay in memory)."""
+    if not warehouse.exists():
+        raise FileNotFoundError(warehouse)
+    con.execute(f"ATTACH {sql_literal(str(warehouse))} AS {WAREHOUSE_ALIAS} (READ_ONLY)")
+
+
+def warehouse_regions(warehouse: Path) -> Tuple[List[str], List[str]]:
+    """(model region slugs, station region slugs) present in the warehouse."""
+    con = connect_duckdb()
+    try:
+        attach_warehouse(con, warehouse)
+        tables = {
+            name
+            for (name,) in con.execute(
+                "SELECT table_name FROM duckdb_tables() WHERE database_name = ?", [WAREHOUSE_ALIAS]
+            ).fetchall()
+        }
+        found: List[List[str]] = []
+        for table, col in ((WAREHOUSE_MODEL_TABLE, "__region"), (WAREHOUSE_STATION_TABLE, "__region_slug")):
+            if table not in tables:
+                found.append([])
+                continue
+            rows = con.execute(f"SELECT DISTINCT {col} FROM {WAREHOUSE_ALIAS}.{table} WHERE {col} IS NOT NULL").fetchall()
+            found.append(sorted(value for (value,) in rows))
+    finally:
+        con.close()
+    return found[0], found[1]
+
+
+def warehouse_sources(warehouse: Path, kind: str) -> dict[str, str]:
+    """Ingested file name -> sha256 for one kind (`model` or `station`)."""
+    con = connect_duckdb()
+    try:
+        attach_warehouse(con, warehouse)
+        rows = con.execute(
+            f"SELECT name, sha256 FROM {WAREHOUSE_ALIAS}.{WAREHOUSE_SOURCES_TABLE} WHERE kind = ? ORDER BY name",
+            [kind],
+        ).fetchall()
+    finally:
+        con.close()
+    return dict(rows)
+
+
+def read_warehouse_stations(
+    warehouse: Path,
+    region_slug: str,
+    *,
+    categorical: Sequence[str] = (),
+) -> pd.DataFrame:
+    """One region's station rows from the warehouse, without columns it never fills."""
+    con = connect_duckdb()
+    try:
+        con.execute("SET TimeZone = 'UTC'")
+        attach_warehouse(con, warehouse)
+        table = f"{WAREHOUSE_ALIAS}.{WAREHOUSE_STATION_TABLE}"
+        columns = [desc[0] for desc in con.execute(f"SELECT * FROM {table} LIMIT 0").description]
+        df = fetch_categorical(
+            con,
+            f"SELECT * EXCLUDE (__source) FROM {table} WHERE __region_slug = ?",
+            [region_slug],
+            [col for col in categorical if col in columns],
+        )
+    except duckdb.CatalogException:
+        return pd.DataFrame()
+    finally:
+        con.close()
+    return df.dropna(axis=1, how="all")
+
+
+def load_station_dataframe(
+    csv_path: Path,
+    region: str,
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    start_ts: pd.Timestamp | None = None,
+    end_ts: pd.Timestamp | None = None,
+    store_dir: Path | None = None,
+    id_col: str = "station_id",
+    name_col: str = "station_name",
+    metrics: Sequence[str] = (),
+    time_format: str | None = None,
+    warehouse: Path | None = None,
+    trailing_hours: int | None = None,
+) -> pd.DataFrame:
+    target_slug = slugify_region(region)
+    time_candidates = station_time_candidates(time_col)
+    frames: List[pd.DataFrame] = []
+    if warehouse is not None:
+        df = read_warehouse_stations(warehouse, target_slug, categorical=[region_col, band_col, id_col, name_col])
+        frames = [df] if not df.empty else []
+    elif store_dir is not None:
+        frames = [df for df in read_station_store(store_dir, target_slug) if not df.empty]
+        logger.debug(
+            "Loaded %d station store partition(s) for region '%s'",
+            len(frames),
+            region,
+        )
+    else:
+        if not csv_path.exists():
+            raise FileNotFoundError(csv_path)
+
+        station_paths = resolve_station_csv_paths(csv_path)
+        logger.debug(
+            "Loading %d station CSV files for region '%s'",
+            len(station_paths),
+            region,
+        )
+        con = connect_duckdb()
+        try:
+            for path in station_paths:
+                df = read_station_csv_typed(
+                    con,
+                    path,
+                    region_col=region_col,
+                    band_col=band_col,
+                    time_col=time_col,
+                    id_col=id_col,
+                    name_col=name_col,
+                    metrics=metrics,
+                    time_format=time_format,
+                    trailing_hours=trailing_hours,
+                )
+                df = df.loc[df["__region_slug"] == target_slug].copy()
+                if df.empty:
+                    continue
+                frames.append(df)
+        finally:
+            con.close()
 
     if not frames:
         raise ValueError(
             f"No station rows matching region='{region}' in provided station CSV files"
         )
 
-    df = pd.concat(frames, ignore_index=True)
+    df = concat_categorical(frames, frames[0].columns)
     logger.debug(
         "Station load for region '%s': %d rows before filtering",
         region,
@@ -564,7 +1765,7 @@ def load_station_dataframe(
             time_col_resolved,
         )
 
-    df[band_col] = df[band_col].apply(canonicalize_band)
+    df[band_col] = categorical_map(df[band_col], canonicalize_band)
     df = df[df[band_col].notna()]
 
     df[time_col_resolved] = pd.to_datetime(df[time_col_resolved], utc=True, errors="coerce")
@@ -578,8 +1779,14 @@ def load_station_dataframe(
             "No station rows remaining after applying date filters for "
             f"region='{region}'"
         )
+    if trailing_hours is not None:
+        # Keep each station's trailing window, the only rows summary tables read.
+        keys = [band_col] + ([id_col] if id_col in df.columns else [])
+        latest = df.groupby(keys, sort=False, observed=True)[time_col_resolved].transform("max")
+        df = df[df[time_col_resolved] >= latest - pd.Timedelta(hours=trailing_hours)]
     df = df.rename(columns={time_col_resolved: time_col})
-    df["__band_lower"] = df[band_col].astype(str).str.lower()
+    # Canonical band names are already lower case.
+    df["__band_lower"] = df[band_col]
     logger.debug(
         "Station load for region '%s': %d rows after filters",
         region,
@@ -588,50 +1795,162 @@ def load_station_dataframe(
     return df
 
 
-def build_model_payload(
-    df: pd.DataFrame,
-    specs: Sequence[ModelSpec],
+def connect_duckdb() -> duckdb.DuckDBPyConnection:
+    """Connection for one unit of work; close it when done.
+
+    Under --watch this is a cursor on the long-lived database opened by
+    `open_shared_duckdb`, so parquet metadata stays cached between rebuilds.
+    """
+    if _SHARED_DUCKDB is not None:
+        return _SHARED_DUCKDB.cursor()
+    return duckdb.connect(database=":memory:")
+
+
+def open_shared_duckdb() -> duckdb.DuckDBPyConnection:
+    global _SHARED_DUCKDB
+    if _SHARED_DUCKDB is None:
+        _SHARED_DUCKDB = duckdb.connect(database=":memory:")
+        _SHARED_DUCKDB.execute("SET parquet_metadata_cache = true")
+        _SHARED_DUCKDB.execute("SET enable_object_cache = true")
+    return _SHARED_DUCKDB
+
+
+def quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def fetch_categorical(
+    con: duckdb.DuckDBPyConnection,
+    query: str,
+    params: Sequence[object],
+    categorical: Iterable[str],
+) -> pd.DataFrame:
+    """Run `query` and fetch it with the `categorical` columns dictionary-encoded.
+
+    Rows are staged in a temp table and each categorical column is cast to an
+    ENUM of its sorted distinct values, which DuckDB hands to pandas as a
+    Categorical without creating a Python string per row.
+    """
+    con.execute(f"CREATE OR REPLACE TEMP TABLE __fetch AS {query}", list(params))
+    wanted = set(categorical)
+    select: List[str] = []
+    enum_types: List[str] = []
+    try:
+        for position, col in enumerate(desc[0] for desc in con.execute("SELECT * FROM __fetch LIMIT 0").description):
+            ident = quote_ident(col)
+            if col in wanted:
+                type_name = f"__fetch_enum_{position}"
+                con.execute(
+                    f"CREATE TYPE {type_name} AS ENUM "
+                    f"(SELECT DISTINCT CAST({ident} AS VARCHAR) FROM __fetch WHERE {ident} IS NOT NULL ORDER BY 1)"
+                )
+                enum_types.append(type_name)
+                select.append(f"CAST(CAST({ident} AS VARCHAR) AS {type_name}) AS {ident}")
+            else:
+                select.append(ident)
+        return con.execute(f"SELECT {', '.join(select)} FROM __fetch").df()
+    finally:
+        con.execute("DROP TABLE IF EXISTS __fetch")
+        for type_name in enum_types:
+            con.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+
+def summarize_model_windows(
+    con: duckdb.DuckDBPyConnection,
+    source: str,
+    metrics: Sequence[str],
+    *,
     time_col: str,
-) -> dict:
-    summary = {band: [] for band in BANDS}
-    timeseries = {band: [] for band in BANDS}
+    group_cols: Sequence[str] = ("__band_lower", "variable", "level"),
+    windows: Sequence[SummaryWindow] = DEFAULT_SUMMARY_WINDOWS,
+    params: Sequence[object] | None = None,
+) -> pd.DataFrame:
+    """Summarize the trailing windows of every group in one grouped query.
+
+    `source` is any DuckDB relation (a registered frame, a view or a
+    `read_parquet(...)` call). The result has one row per group with
+    `window_start` (of the longest window), `window_end` and the
+    `summary_window_columns` of every window, where the windows end at the
+    group's latest timestamp. Shorter windows are filtered aggregates over the
+    rows of the longest one, so extra windows do not add scans.
+    """
+    keys = ", ".join(quote_ident(col) for col in group_cols)
+    time_ident = quote_ident(time_col)
+    longest = max(window.hours for window in windows)
+    aggregates: List[str] = []
+    for window in windows:
+        condition = f"{time_ident} >= __window_end - INTERVAL {int(window.hours)} HOUR"
+        aggregates.append(f"count(*) FILTER (WHERE {condition}) AS {quote_ident(f'samples_{window.label}')}")
+        for metric in metrics:
+            for stat in window.stats:
+                aggregates.append(
+                    "{stat}(TRY_CAST({col} AS DOUBLE)) FILTER (WHERE {condition}) AS {alias}".format(
+                        stat=stat,
+                        col=quote_ident(metric),
+                        condition=condition,
+                        alias=quote_ident(f"{metric}_{stat}_{window.label}"),
+                    )
+                )
+    query = """
+        WITH ranked AS (
+            SELECT *,
+                   max({time}) OVER (PARTITION BY {keys}) AS __window_end
+            FROM {source}
+            WHERE {time} IS NOT NULL
+        )
+        SELECT {keys},
+               min({time}) AS window_start,
+               max(__window_end) AS window_end,
+               {aggregates}
+        FROM ranked
+        WHERE {time} >= __window_end - INTERVAL {hours} HOUR
+        GROUP BY {keys}
+    """.format(
+        keys=keys,
+        time=time_ident,
+        source=source,
+        aggregates=",\n               ".join(aggregates),
+        hours=int(longest),
+    )
+    con.execute("SET TimeZone = 'UTC'")
+    return con.execute(query, list(params or [])).df()
 
-    for spec in specs:
-        subset = df[(df["variable"] == spec.variable) & (df["level"] == spec.level)].copy()
-        if subset.empty:
-            continue
 
-        subset = subset.sort_values(time_col)
-        window = pd.Timedelta(hours=AGGREGATION_HOURS)
+def model_summary_tables(
+    summary_df: pd.DataFrame,
+    specs: Sequence[ModelSpec],
+    available_columns: Iterable[str],
+    *,
+    band_col: str = "__band_lower",
+    windows: Sequence[SummaryWindow] = DEFAULT_SUMMARY_WINDOWS,
+) -> dict[str, List[dict]]:
+    """Shape grouped window summaries into the per-band `summary` tables."""
+    summary = {band: [] for band in BANDS}
+    available = set(available_columns)
+    rows_by_key: dict[Tuple[str, str, str], dict] = {}
+    for record in summary_df.to_dict("records"):
+        key = (str(record[band_col]), str(record["variable"]), str(record["level"]))
+        rows_by_key[key] = record
 
+    for spec in specs:
         for band in BANDS:
-            band_df = subset[subset["__band_lower"] == band]
-            if band_df.empty:
+            record = rows_by_key.get((band, spec.variable, spec.level))
+            if record is None:
                 continue
-
-            window_end = band_df[time_col].max()
-            window_start = window_end - window
-            windowed = band_df[band_df[time_col] >= window_start]
-            if windowed.empty:
-                windowed = band_df.tail(1)
-
             summary_row: dict[str, object] = {
                 "variable": spec.variable,
                 "level": spec.level,
-                "window_start_utc": to_iso([windowed[time_col].min()])[0] if not windowed.empty else "",
-                "window_end_utc": to_iso([window_end])[0],
-                "samples_24h": int(len(windowed)),
+                "window_start_utc": to_iso([record["window_start"]])[0],
+                "window_end_utc": to_iso([record["window_end"]])[0],
             }
-            metric_columns: List[str] = []
-            for metric in spec.metrics:
-                if metric not in windowed.columns:
-                    continue
-                values = pd.to_numeric(windowed[metric], errors="coerce").dropna()
-                out_key = f"{metric}_avg_24h"
-                summary_row[out_key] = to_jsonable(values.mean()) if not values.empty else None
-                metric_columns.append(out_key)
-
-            columns = ["variable", "level", "window_start_utc", "window_end_utc", "samples_24h"] + metric_columns
+            metrics = [metric for metric in spec.metrics if metric in available]
+            columns = ["variable", "level", "window_start_utc", "window_end_utc"]
+            for window in windows:
+                window_columns = summary_window_columns(window, metrics)
+                summary_row[window_columns[0]] = int(record[window_columns[0]])
+                for out_key in window_columns[1:]:
+                    summary_row[out_key] = to_jsonable(record[out_key])
+                columns.extend(window_columns)
 
             summary[band].append(
                 {
@@ -641,135 +1960,2239 @@ def build_model_payload(
                         "variable": spec.variable,
                         "level": spec.level,
                         "metrics": spec.metrics,
-                        "aggregation_hours": AGGREGATION_HOURS,
+                        **summary_window_metadata(windows),
                     },
                 }
             )
-
-        for band in BANDS:
-            band_df = subset[subset["__band_lower"] == band]
-            if band_df.empty:
-                continue
-            times = to_iso(band_df[time_col])
-            series = []
-            for idx, metric in enumerate(spec.metrics):
-                if metric not in band_df.columns:
-                    continue
-                series.append(
-                    {
-                        "name": f"{spec.variable} {metric}",
-                        "values": band_df[metric].astype(float).round(4).tolist(),
-                        "yAxis": "y" if idx == 0 else "y2",
-                    }
-                )
-            if series:
-                timeseries[band].append(
-                    {
-                        "variable": spec.variable,
-                        "level": spec.level,
-                        "x": times,
-                        "series": series,
-                        "metadata": {"metrics": spec.metrics},
-                    }
-                )
-
-    return {"summary": summary, "timeseries": timeseries}
+    return summary
 
 
-def build_station_payload(
+def build_model_payload(
     df: pd.DataFrame,
-    metrics: Sequence[str],
-    *,
+    specs: Sequence[ModelSpec],
     time_col: str,
-    id_col: str,
-    name_col: str,
+    *,
+    time_encoding: str = "iso",
+    reduction: str = "none",
+    run_col: str | None = None,
+    lead_col: str | None = "forecast_hour",
+    windows: Sequence[SummaryWindow] = DEFAULT_SUMMARY_WINDOWS,
 ) -> dict:
-    summary = {band: [] for band in BANDS}
     timeseries = {band: [] for band in BANDS}
 
-    for band in BANDS:
-        band_df = df[df["__band_lower"] == band].copy()
-        if band_df.empty:
-            continue
+    metrics: List[str] = []
+    for spec in specs:
+        for metric in spec.metrics:
+            if metric in df.columns and metric not in metrics:
+                metrics.append(metric)
+    con = connect_duckdb()
+    try:
+        con.register("model_rows", df)
+        summary_df = summarize_model_windows(con, "model_rows", metrics, time_col=time_col, windows=windows)
+    finally:
+        con.close()
+    summary = model_summary_tables(summary_df, specs, df.columns, windows=windows)
 
-        if id_col not in band_df.columns:
-            band_df.loc[:, id_col] = "station"
-        if name_col not in band_df.columns:
-            band_df.loc[:, name_col] = band_df[id_col]
+    if reduction != "none":
+        run_times = model_run_times(df, time_col, run_col=run_col, lead_col=lead_col)
+        if run_times is None and reduction in ("latest", "runs"):
+            logger.warning(
+                "No model run column or lead column '%s' found; ignoring --model-reduce %s",
+                lead_col,
+                reduction,
+            )
+            reduction = "none"
+        elif run_times is not None:
+            df = df.assign(__run_time=run_times)
 
-        metric_columns = [metric for metric in metrics if metric in band_df.columns]
+    # Group row positions once; with categorical keys this compares integer codes.
+    spec_rows = df.groupby(["variable", "level"], sort=False, observed=True).indices
+    for spec in specs:
+        positions = spec_rows.get((spec.variable, spec.level))
+        if positions is None:
+            continue
 
-        window = pd.Timedelta(hours=AGGREGATION_HOURS)
-        table_rows: List[dict[str, object]] = []
-        for station_id, station_slice in band_df.groupby(id_col):
-            station_slice = station_slice.sort_values(time_col)
-            if station_slice.empty:
+        # Stable, so rows sharing a valid time keep their file order (as under --stream).
+        subset = df.iloc[positions].sort_values(time_col, kind="mergesort")
+        band_rows = subset.groupby("__band_lower", sort=False, observed=True).indices
+
+        for band in BANDS:
+            if band not in band_rows:
                 continue
-            window_end = station_slice[time_col].max()
-            window_start = window_end - window
-            windowed = station_slice[station_slice[time_col] >= window_start]
-            if windowed.empty:
-                windowed = station_slice.tail(1)
-
-            row_entry: dict[str, object] = {
-                id_col: station_id,
-                name_col: station_slice[name_col].iloc[0] if name_col in station_slice.columns else station_id,
-                "window_start_utc": to_iso([windowed[time_col].min()])[0] if not windowed.empty else "",
-                "window_end_utc": to_iso([window_end])[0],
-                "samples_24h": int(len(windowed)),
+            band_df = subset.iloc[band_rows[band]]
+            timeseries[band].extend(
+                model_entries(band_df, spec, time_col, time_encoding=time_encoding, reduction=reduction)
+            )
+
+    return {"summary": summary, "timeseries": timeseries}
+
+
+def model_entries(
+    band_df: pd.DataFrame,
+    spec: ModelSpec,
+    time_col: str,
+    *,
+    time_encoding: str = "iso",
+    reduction: str = "none",
+) -> Iterator[dict]:
+    """Yield the timeseries entries of one spec/band; ``band_df`` must be sorted by time."""
+    for extra, times, series in model_band_traces(band_df, spec, time_col, reduction):
+        if not series:
+            continue
+        metadata: dict[str, object] = {"metrics": spec.metrics}
+        if reduction != "none":
+            metadata["reduction"] = reduction
+            metadata.update(extra)
+        yield {
+            "variable": spec.variable,
+            "level": spec.level,
+            **extra,
+            **encode_time_axis(times, time_encoding),
+            "series": series,
+            "metadata": metadata,
+        }
+
+
+def model_run_times(
+    df: pd.DataFrame,
+    time_col: str,
+    *,
+    run_col: str | None = None,
+    lead_col: str | None = "forecast_hour",
+) -> pd.Series | None:
+    """Return each row's forecast run (initialisation) time, or None when unknown.
+
+    An explicit run column wins; otherwise the run is derived as the valid
+    time minus the lead time in hours.
+    """
+    candidates = ([run_col] if run_col else []) + MODEL_RUN_COLUMNS
+    for candidate in candidates:
+        if candidate in df.columns:
+            return pd.to_datetime(df[candidate], utc=True, errors="coerce")
+    if lead_col and lead_col in df.columns:
+        hours = pd.to_numeric(df[lead_col], errors="coerce")
+        return df[time_col] - pd.to_timedelta(hours, unit="h")
+    return None
+
+
+def model_band_traces(
+    band_df: pd.DataFrame,
+    spec: ModelSpec,
+    time_col: str,
+    reduction: str,
+) -> Iterable[Tuple[dict[str, object], pd.Series | pd.Index, List[dict]]]:
+    """Yield (entry fields, time axis, traces) for one spec/band after run reduction.
+
+    ``band_df`` must be sorted by time. ``none`` keeps every row, ``latest``
+    keeps the most recent run per valid time, ``runs`` yields one entry per
+    run and ``envelope`` yields the mean with min/max traces per valid time.
+    """
+    metrics = [(idx, metric) for idx, metric in enumerate(spec.metrics) if metric in band_df.columns]
+
+    def trace(idx: int, metric: str, values: pd.Series, suffix: str = "") -> dict:
+        return {
+            "name": f"{spec.variable} {metric}{suffix}",
+            "values": values.astype(float).round(4).to_numpy(),
+            "yAxis": "y" if idx == 0 else "y2",
+        }
+
+    if reduction == "latest":
+        ordered = band_df.sort_values([time_col, "__run_time"], kind="mergesort", na_position="first")
+        reduced = ordered.drop_duplicates(subset=[time_col], keep="last")
+        yield {}, reduced[time_col], [trace(idx, metric, reduced[metric]) for idx, metric in metrics]
+    elif reduction == "runs":
+        for run_time, run_df in band_df.groupby("__run_time", sort=True):
+            yield (
+                {"run_utc": to_iso([run_time])[0]},
+                run_df[time_col],
+                [trace(idx, metric, run_df[metric]) for idx, metric in metrics],
+            )
+    elif reduction == "envelope":
+        numeric = pd.DataFrame(
+            {metric: pd.to_numeric(band_df[metric], errors="coerce").to_numpy() for _, metric in metrics},
+            index=band_df[time_col],
+        )
+        stats = numeric.groupby(level=0, sort=True).agg(["mean", "min", "max"])
+        series: List[dict] = []
+        for idx, metric in metrics:
+            series.append(trace(idx, metric, stats[(metric, "mean")]))
+            series.append(trace(idx, metric, stats[(metric, "min")], " min"))
+            series.append(trace(idx, metric, stats[(metric, "max")], " max"))
+        yield {}, stats.index, series
+    else:
+        yield {}, band_df[time_col], [trace(idx, metric, band_df[metric]) for idx, metric in metrics]
+
+
+def numeric_column(series: pd.Series) -> pd.Series:
+    """Coerce to a plain numpy numeric dtype (nullable ints become float64 with NaN)."""
+    values = pd.to_numeric(series, errors="coerce")
+    if pd.api.types.is_extension_array_dtype(values.dtype):
+        values = values.astype("float64") if values.hasnans else values.astype(values.dtype.numpy_dtype)
+    return values
+
+
+def build_station_payload(
+    df: pd.DataFrame,
+    metrics: Sequence[str],
+    *,
+    time_col: str,
+    id_col: str,
+    name_col: str,
+    time_encoding: str = "iso",
+    windows: Sequence[SummaryWindow] = DEFAULT_SUMMARY_WINDOWS,
+) -> dict:
+    """Build per-band station summary tables and traces.
+
+    Rows are sorted once by (band, station, time); every station then occupies
+    a contiguous slice, so each window is the tail of that slice, window
+    statistics are one `reduceat` per window and metric, and traces are plain
+    slices of the sorted columns.
+    """
+    summary = {band: [] for band in BANDS}
+    timeseries = {band: [] for band in BANDS}
+
+    band_rank = {band: rank for rank, band in enumerate(BANDS)}
+    df = df[df["__band_lower"].isin(band_rank)]
+    if df.empty:
+        return {"summary": summary, "timeseries": timeseries}
+
+    df = df.copy()
+    if id_col not in df.columns:
+        df[id_col] = "station"
+    if name_col not in df.columns:
+        df[name_col] = df[id_col]
+    df = df[df[id_col].notna()]
+    if df.empty:
+        return {"summary": summary, "timeseries": timeseries}
+    df["__band_rank"] = df["__band_lower"].map(band_rank).astype("int64")
+    df = df.sort_values(["__band_rank", id_col, time_col], kind="mergesort")
+
+    metric_columns = [metric for metric in metrics if metric in df.columns]
+    ranks = df["__band_rank"].to_numpy()
+    ids = df[id_col].to_numpy()
+    # Station boundaries compare integer codes when the id column is categorical.
+    id_keys = df[id_col].cat.codes.to_numpy() if isinstance(df[id_col].dtype, pd.CategoricalDtype) else ids
+    names = df[name_col].to_numpy()
+    times = df[time_col].dt.tz_convert("UTC").dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    values = {metric: numeric_column(df[metric]) for metric in metric_columns}
+    rounded = {metric: series.round(4).to_numpy() for metric, series in values.items()}
+
+    count = len(df)
+    changes = np.flatnonzero((ranks[1:] != ranks[:-1]) | (id_keys[1:] != id_keys[:-1])) + 1
+    starts = np.concatenate(([0], changes))
+    ends = np.concatenate((changes, [count]))
+    groups = len(starts)
+    group_of_row = np.repeat(np.arange(groups), ends - starts)
+
+    window_end = times[ends - 1]
+    metric_arrays = {metric: series.to_numpy(dtype="float64") for metric, series in values.items()}
+    # NaN-free values and valid flags, padded so `reduceat` can address the end of the last slice.
+    padded = {
+        metric: (np.append(np.nan_to_num(array, nan=0.0), 0.0), np.append(~np.isnan(array), False).astype("int64"))
+        for metric, array in metric_arrays.items()
+    }
+
+    window_samples: List[np.ndarray] = []
+    window_values: dict[str, List[object]] = {}
+    for window in windows:
+        in_window = times >= (window_end - np.timedelta64(window.hours, "h"))[group_of_row]
+        samples = np.bincount(group_of_row, weights=in_window, minlength=groups).astype(int)
+        window_samples.append(samples)
+        # Reduce over [first, end) pairs and keep the even slots (the window tails).
+        bounds = np.column_stack((ends - samples, ends)).ravel()
+        for metric, (filled, valid) in padded.items():
+            totals = np.add.reduceat(filled, bounds)[::2]
+            counts = np.add.reduceat(valid, bounds)[::2]
+            for stat in window.stats:
+                result = totals / np.maximum(counts, 1) if stat == "avg" else totals
+                window_values[f"{metric}_{stat}_{window.label}"] = [
+                    float(value) if count else None for value, count in zip(result, counts)
+                ]
+    longest = max(range(len(windows)), key=lambda position: windows[position].hours)
+    window_start = times[ends - window_samples[longest]]
+
+    start_iso = to_iso(pd.to_datetime(window_start, utc=True))
+    end_iso = to_iso(pd.to_datetime(window_end, utc=True))
+
+    table_rows: dict[str, List[dict[str, object]]] = {band: [] for band in BANDS}
+    for group, (begin, stop) in enumerate(zip(starts, ends)):
+        band = BANDS[ranks[begin]]
+        station_id = ids[begin]
+        station_name = names[begin]
+        row_entry: dict[str, object] = {
+            id_col: station_id,
+            name_col: station_name,
+            "window_start_utc": start_iso[group],
+            "window_end_utc": end_iso[group],
+        }
+        for window, samples in zip(windows, window_samples):
+            window_columns = summary_window_columns(window, metric_columns)
+            row_entry[window_columns[0]] = int(samples[group])
+            for out_key in window_columns[1:]:
+                row_entry[out_key] = window_values[out_key][group]
+        table_rows[band].append(row_entry)
+
+        traces = [
+            {
+                "name": metric,
+                "values": rounded[metric][begin:stop],
+                "yAxis": "y",
+            }
+            for metric in metric_columns
+        ]
+        if not traces:
+            continue
+        timeseries[band].append(
+            {
+                "station_id": station_id,
+                "station_name": station_name,
+                **encode_time_axis(times[begin:stop], time_encoding),
+                "series": traces,
             }
+        )
+
+    for band in BANDS:
+        rows = table_rows[band]
+        if not rows:
+            continue
+        summary_columns = [id_col, name_col, "window_start_utc", "window_end_utc"]
+        for window in windows:
+            summary_columns.extend(summary_window_columns(window, metric_columns))
+        summary[band].append(
+            {
+                "columns": summary_columns,
+                "rows": rows,
+                "metadata": {"count": len(rows), **summary_window_metadata(windows)},
+            }
+        )
+
+    return {"summary": summary, "timeseries": timeseries}
+
+
+def decode_time_axis(entry: dict) -> np.ndarray:
+    """Return the epoch-second time axis of a timeseries entry as int64."""
+    axis = entry.get("t")
+    if axis is None:
+        stamps = pd.to_datetime(pd.Index(entry.get("x", [])), format="%Y-%m-%dT%H:%M:%SZ", utc=True)
+        return to_utc_seconds(stamps).astype("int64")
+    if isinstance(axis, dict):
+        return axis["start"] + axis["step"] * np.arange(axis["count"], dtype="int64")
+    return np.asarray(axis, dtype="int64")
+
+
+def timeseries_long_frame(band_entries: dict[str, List[dict]], key_fields: Sequence[str]) -> pd.DataFrame:
+    """Flatten per-band timeseries entries into a long (one value per row) frame."""
+    columns: dict[str, List[np.ndarray]] = {field_name: [] for field_name in ("band", *key_fields, "metric", "t", "value")}
+    for band, entries in band_entries.items():
+        for entry in entries:
+            times = decode_time_axis(entry)
+            for trace in entry.get("series", []):
+                size = len(times)
+                columns["band"].append(np.full(size, band, dtype=object))
+                for field_name in key_fields:
+                    columns[field_name].append(np.full(size, entry.get(field_name), dtype=object))
+                columns["metric"].append(np.full(size, trace["name"], dtype=object))
+                columns["t"].append(times)
+                columns["value"].append(np.asarray(trace["values"], dtype="float64").astype("float32"))
+    if not columns["t"]:
+        frame = pd.DataFrame({name: pd.Series(dtype=object) for name in columns})
+        return frame.astype({"t": "int64", "value": "float32"})
+    return pd.DataFrame({name: np.concatenate(parts) for name, parts in columns.items()})
+
+
+def json_default(value):
+    """`json` fallback for the numpy arrays and scalars kept in payloads."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _CompressedSink:
+    """Text sink writing UTF-8 to a file and, in the same pass, to precompressed sidecars."""
+
+    def __init__(self, path: Path, formats: Sequence[str]):
+        self.paths = [path]
+        self.raw = path.open("wb")
+        self.gzip = None
+        self.gzip_fh = None
+        self.brotli = None
+        self.brotli_fh = None
+        if "gzip" in formats:
+            gz_path = path.with_name(path.name + PRECOMPRESS_FORMATS["gzip"])
+            # mtime=0 keeps the sidecar byte-identical across rebuilds of the same content.
+            self.gzip_fh = gz_path.open("wb")
+            self.gzip = gzip.GzipFile(filename=path.name, fileobj=self.gzip_fh, mode="wb", mtime=0)
+            self.paths.append(gz_path)
+        if "brotli" in formats:
+            br_path = path.with_name(path.name + PRECOMPRESS_FORMATS["brotli"])
+            self.brotli = brotli.Compressor(mode=brotli.MODE_TEXT)
+            self.brotli_fh = br_path.open("wb")
+            self.paths.append(br_path)
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self.raw.write(data)
+        if self.gzip is not None:
+            self.gzip.write(data)
+        if self.brotli is not None:
+            self.brotli_fh.write(self.brotli.process(data))
+
+    def close(self) -> None:
+        self.raw.close()
+        if self.gzip is not None:
+            self.gzip.close()
+            self.gzip_fh.close()
+        if self.brotli is not None:
+            self.brotli_fh.write(self.brotli.finish())
+            self.brotli_fh.close()
+
+
+def _write_json_value(sink: _CompressedSink, value, depth: int) -> None:
+    if depth > 0 and isinstance(value, dict):
+        sink.write("{")
+        for position, (key, item) in enumerate(value.items()):
+            sink.write(("," if position else "") + json.dumps(str(key)) + ":")
+            _write_json_value(sink, item, depth - 1)
+        sink.write("}")
+    elif depth > 0 and isinstance(value, (list, Iterator)):
+        sink.write("[")
+        for position, item in enumerate(value):
+            if position:
+                sink.write(",")
+            _write_json_value(sink, item, depth - 1)
+        sink.write("]")
+    else:
+        sink.write(json.dumps(value, separators=(",", ":"), default=json_default))
+
+
+def write_json(path: Path, payload, *, stream_depth: int = 0, precompress: Sequence[str] = ()) -> List[Path]:
+    """Write compact JSON to `path` plus any precompressed sidecars; return every path written.
+
+    Containers down to `stream_depth` levels are written piecewise, so only one
+    nested value (e.g. a single timeseries entry) is encoded in memory at a time.
+    Iterators at those levels are written as lists as they are consumed.
+    """
+    sink = _CompressedSink(path, precompress)
+    try:
+        _write_json_value(sink, payload, stream_depth)
+        sink.write("\n")
+    except BaseException:
+        # Iterators may fail mid-document; do not leave truncated JSON behind.
+        sink.close()
+        for written in sink.paths:
+            written.unlink(missing_ok=True)
+        raise
+    sink.close()
+    return sink.paths
+
+
+def remove_output(path: Path) -> None:
+    """Delete an output file and any precompressed sidecars of it."""
+    path.unlink(missing_ok=True)
+    for suffix in PRECOMPRESS_FORMATS.values():
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def write_parquet_frame(frame: pd.DataFrame, path: Path) -> None:
+    con = connect_duckdb()
+    try:
+        con.register("timeseries_rows", frame)
+        con.execute(
+            "COPY timeseries_rows TO '{path}' (FORMAT parquet, COMPRESSION zstd)".format(
+                path=str(path).replace("'", "''"),
+            )
+        )
+    finally:
+        con.close()
+
+
+def write_timeseries_parquet(
+    base_path: Path,
+    region_slug: str,
+    station_timeseries: dict[str, List[dict]],
+    model_timeseries: dict[str, List[dict]],
+    generated_at: str,
+) -> List[Path]:
+    """Write long-format Parquet timeseries plus an index JSON describing them."""
+    index: dict[str, object] = {
+        "region": region_slug,
+        "generated_at": generated_at,
+        "format": "parquet",
+        "layout": "long",
+        "time_column": "t",
+        "time_unit": "s",
+        "files": {},
+    }
+    written: List[Path] = []
+    model_keys = ["variable", "level"]
+    if any("run_utc" in entry for entries in model_timeseries.values() for entry in entries):
+        # --model-reduce runs keeps one entry per run; without run_utc their rows are indistinguishable.
+        model_keys.append("run_utc")
+    datasets = (
+        ("model", model_timeseries, model_keys, MODEL_TIMESERIES_PARQUET),
+        ("stations", station_timeseries, ["station_id", "station_name"], STATION_TIMESERIES_PARQUET),
+    )
+    for kind, band_entries, key_fields, file_name in datasets:
+        frame = timeseries_long_frame(band_entries, key_fields)
+        out_path = base_path / file_name
+        write_parquet_frame(frame, out_path)
+        written.append(out_path)
+        index["files"][kind] = {
+            "path": file_name,
+            "rows": int(len(frame)),
+            "columns": {
+                "band": "VARCHAR",
+                **{field_name: "VARCHAR" for field_name in key_fields},
+                "metric": "VARCHAR",
+                "t": "BIGINT",
+                "value": "FLOAT",
+            },
+            "time_range": [int(frame["t"].min()), int(frame["t"].max())] if len(frame) else None,
+            "series": [
+                {
+                    "band": band,
+                    **{field_name: entry.get(field_name) for field_name in key_fields},
+                    "metrics": [trace["name"] for trace in entry.get("series", [])],
+                }
+                for band, entries in band_entries.items()
+                for entry in entries
+            ],
+        }
+
+    written.extend(write_json(base_path / TIMESERIES_INDEX_NAME, index))
+    return written
+
+
+def with_time_axis(entry: dict, seconds: np.ndarray, series: List[dict], time_encoding: str) -> dict:
+    """Copy a timeseries entry with a new time axis and traces, keeping key order."""
+    out: dict = {}
+    for key, value in entry.items():
+        if key in ("x", "t"):
+            out.update(encode_time_axis(seconds.astype("datetime64[s]"), time_encoding))
+        elif key == "series":
+            out["series"] = series
+        else:
+            out[key] = value
+    return out
+
+
+def resample_entry(entry: dict, bucket_seconds: int, time_encoding: str) -> dict:
+    """Average an entry's traces into fixed buckets starting at bucket boundaries."""
+    seconds = decode_time_axis(entry)
+    if not len(seconds):
+        return entry
+    buckets, inverse = np.unique(seconds // bucket_seconds * bucket_seconds, return_inverse=True)
+    series: List[dict] = []
+    for trace in entry.get("series", []):
+        values = np.asarray(trace["values"], dtype="float64")
+        valid = ~np.isnan(values)
+        sums = np.bincount(inverse[valid], weights=values[valid], minlength=len(buckets))
+        counts = np.bincount(inverse[valid], minlength=len(buckets))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        series.append({**trace, "values": np.round(means, 4)})
+    return with_time_axis(entry, buckets, series, time_encoding)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points preserving the shape of y(x)."""
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+    y = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0.0, y)
+    edges = np.linspace(1, count - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_start, next_stop = edges[bucket + 1], edges[bucket + 2] if bucket + 2 < len(edges) else count
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample_entry(entry: dict, target_points: int, time_encoding: str) -> dict:
+    """Reduce an entry to at most `target_points` points chosen by LTTB on its first trace."""
+    seconds = decode_time_axis(entry)
+    traces = entry.get("series", [])
+    if len(seconds) <= target_points or not traces:
+        return with_time_axis(entry, seconds, traces, time_encoding)
+    primary = np.asarray(traces[0]["values"], dtype="float64")
+    keep = lttb_indices(seconds.astype("float64"), primary, target_points)
+    series = [
+        {**trace, "values": np.asarray(trace["values"], dtype="float64")[keep]}
+        for trace in traces
+    ]
+    return with_time_axis(entry, seconds[keep], series, time_encoding)
+
+
+def write_timeseries_pyramid(
+    base_path: Path,
+    region_slug: str,
+    timeseries: dict[str, dict[str, List[dict]]],
+    *,
+    target_points: int,
+    time_encoding: str,
+    generated_at: str,
+    full_file: str | None,
+    precompress: Sequence[str] = (),
+) -> List[Path]:
+    """Write hourly, 6-hourly and LTTB levels of `timeseries` plus an index of all levels.
+
+    `timeseries` maps "stations"/"model" to the per-band entries of the full
+    resolution output, which the index lists as level "full" when written.
+    A level holding no fewer points than the next finer one is not written;
+    the index lists it under "skipped" with the level that serves it instead.
+    """
+    pyramid_dir = base_path / PYRAMID_DIR
+    pyramid_dir.mkdir(parents=True, exist_ok=True)
+
+    all_seconds = [
+        decode_time_axis(entry)
+        for band_entries in timeseries.values()
+        for entries in band_entries.values()
+        for entry in entries
+    ]
+    all_seconds = [values for values in all_seconds if len(values)]
+    time_range = (
+        [int(min(values.min() for values in all_seconds)), int(max(values.max() for values in all_seconds))]
+        if all_seconds
+        else None
+    )
+    span = (time_range[1] - time_range[0]) if time_range else 0
+
+    def count_points(payload: dict[str, dict[str, List[dict]]]) -> Tuple[int, int]:
+        lengths = [
+            len(decode_time_axis(entry))
+            for band_entries in payload.values()
+            for entries in band_entries.values()
+            for entry in entries
+        ]
+        return sum(lengths), max(lengths, default=0)
+
+    levels: List[dict[str, object]] = []
+    skipped: List[dict[str, object]] = []
+    finer: dict[str, object] | None = None
+    if full_file:
+        total, longest = count_points(timeseries)
+        finer = {"name": "full", "file": full_file, "resolution_seconds": 0, "points": total, "max_series_points": longest}
+        levels.append(finer)
+
+    transforms = [
+        (name, seconds, lambda entry, step=seconds: resample_entry(entry, step, time_encoding))
+        for name, seconds in PYRAMID_RESOLUTIONS.items()
+    ]
+    transforms.append(
+        (
+            f"lttb{target_points}",
+            max(1, span // target_points) if span else 0,
+            lambda entry: downsample_entry(entry, target_points, time_encoding),
+        )
+    )
+
+    written: List[Path] = []
+    # Finest first, so each level is compared with the one beneath it.
+    for name, resolution, transform in sorted(transforms, key=lambda item: item[1]):
+        payload = {
+            kind: {band: [transform(entry) for entry in entries] for band, entries in band_entries.items()}
+            for kind, band_entries in timeseries.items()
+        }
+        rel_path = f"{PYRAMID_DIR}/{name}.json"
+        total, longest = count_points(payload)
+        if finer is not None and total >= finer["points"]:
+            remove_output(base_path / rel_path)
+            skipped.append(
+                {"name": name, "resolution_seconds": int(resolution), "points": total, "served_by": finer["name"]}
+            )
+            continue
+        written.extend(
+            write_json(
+                base_path / rel_path,
+                {"region": region_slug, "generated_at": generated_at, "level": name, **payload},
+                stream_depth=3,
+                precompress=precompress,
+            )
+        )
+        finer = {
+            "name": name,
+            "file": rel_path,
+            "resolution_seconds": int(resolution),
+            "points": total,
+            "max_series_points": longest,
+        }
+        levels.append(finer)
+
+    levels.sort(key=lambda level: level["resolution_seconds"], reverse=True)
+    written.extend(
+        write_json(
+            pyramid_dir / "index.json",
+            {
+                "region": region_slug,
+                "generated_at": generated_at,
+                "time_range": time_range,
+                "target_points": target_points,
+                "levels": levels,
+                "skipped": skipped,
+            },
+        )
+    )
+    return written
+
+
+def update_digest(digest, value) -> None:
+    """Feed a JSON-like value (numpy arrays included) into a hashlib digest without encoding it."""
+    if isinstance(value, np.ndarray):
+        digest.update(value.dtype.str.encode("ascii"))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key, item in value.items():
+            digest.update(repr(key).encode("utf-8"))
+            update_digest(digest, item)
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            update_digest(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(repr(value).encode("utf-8") + b",")
+
+
+def write_timeseries_chunks(
+    base_path: Path,
+    region_slug: str,
+    timeseries: dict[str, dict[str, List[dict]]],
+    *,
+    chunk: str,
+    time_encoding: str,
+    generated_at: str,
+    precompress: Sequence[str] = (),
+) -> Tuple[List[Path], int]:
+    """Write `timeseries` as fixed time chunks plus an index; return the paths and the chunks rewritten.
+
+    Chunks cover UTC days or Monday-based weeks, so a new model cycle only
+    changes the chunks its valid times fall in. The index records a digest of
+    each chunk's content; a chunk whose digest matches the previous index keeps
+    its file, and chunk files no longer produced are removed.
+    """
+    size, origin = TIMESERIES_CHUNKS[chunk]
+    index_path = base_path / TIMESERIES_CHUNK_INDEX
+    file_format = {"chunk": chunk, "time_encoding": time_encoding, "precompress": sorted(precompress)}
+    previous: dict = {}
+    if index_path.exists():
+        try:
+            previous = json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable chunk index %s", index_path)
+    previous_files = {item["file"]: item.get("digest") for item in previous.get("chunks", [])}
+    reusable = previous_files if previous.get("format") == file_format else {}
+
+    chunks: dict[int, dict[str, dict[str, List[dict]]]] = {}
+    digests: dict[int, object] = {}
+    points: dict[int, int] = {}
+    for kind, band_entries in timeseries.items():
+        for band, entries in band_entries.items():
+            for entry in entries:
+                seconds = decode_time_axis(entry)
+                if not len(seconds):
+                    continue
+                keys = (seconds - origin) // size
+                order = np.argsort(keys, kind="stable")
+                bounds = np.flatnonzero(np.diff(keys[order])) + 1
+                fields = {key: value for key, value in entry.items() if key not in ("x", "t", "series")}
+                for positions in np.split(order, bounds):
+                    key = int(keys[positions[0]])
+                    series = [
+                        {**trace, "values": np.asarray(trace["values"])[positions]} for trace in entry.get("series", [])
+                    ]
+                    if key not in chunks:
+                        chunks[key] = {name: {b: [] for b in band_map} for name, band_map in timeseries.items()}
+                        digests[key] = hashlib.sha256()
+                        points[key] = 0
+                    chunks[key][kind][band].append(with_time_axis(entry, seconds[positions], series, time_encoding))
+                    update_digest(digests[key], [kind, band, fields, seconds[positions], series])
+                    points[key] += len(positions)
+
+    written: List[Path] = []
+    listed: List[dict[str, object]] = []
+    rewritten = 0
+    for key in sorted(chunks):
+        start = origin + key * size
+        name = np.datetime_as_string(np.datetime64(start, "s"), unit="D")
+        rel_path = f"{TIMESERIES_CHUNK_DIR}/{name}.json"
+        digest = digests[key].hexdigest()[:CONTENT_HASH_LENGTH]
+        path = base_path / rel_path
+        if reusable.get(rel_path) == digest and path.exists():
+            written.append(path)
+            written.extend(path.with_name(path.name + PRECOMPRESS_FORMATS[fmt]) for fmt in precompress)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {"region": region_slug, "generated_at": generated_at, "chunk": name, **chunks[key]}
+            written.extend(write_json(path, payload, stream_depth=3, precompress=precompress))
+            rewritten += 1
+        listed.append(
+            {"name": name, "file": rel_path, "start": int(start), "end": int(start + size), "points": points[key], "digest": digest}
+        )
+    for rel_path in sorted(set(previous_files) - {item["file"] for item in listed}):
+        remove_output(base_path / rel_path)
+
+    all_seconds = [decode_time_axis(entry) for band_entries in timeseries.values() for entries in band_entries.values() for entry in entries]
+    all_seconds = [values for values in all_seconds if len(values)]
+    written.extend(
+        write_json(
+            index_path,
+            {
+                "region": region_slug,
+                "generated_at": generated_at,
+                "format": file_format,
+                "chunk_seconds": size,
+                "time_range": (
+                    [int(min(values.min() for values in all_seconds)), int(max(values.max() for values in all_seconds))]
+                    if all_seconds
+                    else None
+                ),
+                "chunks": listed,
+            },
+        )
+    )
+    return written, rewritten
+
+
+def drop_timeseries_chunks(base_path: Path) -> None:
+    """Remove the chunks of an earlier --timeseries-chunks build so timeseries.json is used again."""
+    index_path = base_path / TIMESERIES_CHUNK_INDEX
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    for item in index.get("chunks", []) if isinstance(index, dict) else []:
+        remove_output(base_path / item["file"])
+    remove_output(index_path)
+    if not any(index_path.parent.iterdir()):
+        index_path.parent.rmdir()
+
+
+def replace_references(value, renamed: dict[str, str]):
+    """Return `value` with every string equal to a key of `renamed` replaced by its value."""
+    if isinstance(value, dict):
+        return {key: replace_references(item, renamed) for key, item in value.items()}
+    if isinstance(value, list):
+        return [replace_references(item, renamed) for item in value]
+    if isinstance(value, str):
+        return renamed.get(value, value)
+    return value
+
+
+def content_digest(path: Path, fields: dict[str, object]) -> str:
+    """sha256 of `path` with the given top-level JSON fields left out.
+
+    Outputs are written compactly with these fields among their first keys, so
+    their exact `"key":value` text is dropped from the head of the file and the
+    rest is hashed as it streams past.
+    """
+    rendered = [f"{json.dumps(key)}:{json.dumps(value)}".encode("utf-8") for key, value in fields.items()]
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        head = fh.read(1 << 16)
+        if path.suffix == ".json":
+            for field in rendered:
+                head = head.replace(field, b"", 1)
+        digest.update(head)
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def publish_content_addressed(
+    base_path: Path,
+    region_slug: str,
+    written: Sequence[Path],
+    bundle: dict,
+    *,
+    generated_at: str,
+) -> List[Path]:
+    """Rename outputs to `<stem>.<sha><suffix>` and atomically swap in a generation manifest.
+
+    Index files are rewritten to reference the hashed names before they are
+    hashed themselves. Hashes skip the build-time fields, so an unchanged output
+    maps to a file an earlier build already published; that file is kept as is
+    and the build time is recorded in the manifest only. Files of the generation
+    before the previous one are removed once the new manifest is in place; the
+    previous generation is kept for clients still holding the old manifest.
+    """
+    sidecar_suffixes = tuple(PRECOMPRESS_FORMATS.values())
+    written_set = set(written)
+    primaries = [path for path in written if not path.name.endswith(sidecar_suffixes)]
+    index_names = {TIMESERIES_INDEX_NAME, f"{PYRAMID_DIR}/index.json"}
+
+    def rel(path: Path) -> str:
+        return path.relative_to(base_path).as_posix()
+
+    renamed: dict[str, str] = {}
+    published: List[Path] = []
+    build_time = {
+        "generated_at": generated_at,
+        "run_time_utc": bundle.get("run_time_utc"),
+        "version": bundle.get("version"),
+    }
+
+    def move(source: Path, target: Path) -> None:
+        if target.exists():
+            source.unlink()
+        else:
+            source.replace(target)
+        published.append(target)
+
+    def publish(path: Path) -> None:
+        digest = content_digest(path, build_time)[:CONTENT_HASH_LENGTH]
+        target = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+        for suffix in sidecar_suffixes:
+            sidecar = path.with_name(path.name + suffix)
+            if sidecar in written_set:
+                move(sidecar, target.with_name(target.name + suffix))
+        move(path, target)
+        renamed[rel(path)] = rel(target)
+
+    for path in primaries:
+        if rel(path) not in index_names:
+            publish(path)
+    for path in primaries:
+        if rel(path) in index_names:
+            write_json(path, replace_references(json.loads(path.read_text(encoding="utf-8")), renamed))
+            publish(path)
+
+    manifest_path = base_path / GENERATION_MANIFEST_NAME
+    previous: dict = {}
+    if manifest_path.exists():
+        try:
+            previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable generation manifest %s", manifest_path)
+
+    files = sorted(rel(path) for path in published)
+    artifacts: dict[str, object] = {"tiles_base": bundle.get("tiles_base")}
+    if bundle.get("quicklook_png"):
+        artifacts["quicklook_png"] = bundle["quicklook_png"]
+    for name, key in MANIFEST_ARTIFACTS.items():
+        if name in renamed:
+            artifacts[key] = f"/data/{region_slug}/{renamed[name]}"
+    kept = sorted(set(previous.get("files", [])) - set(files))
+    manifest = {
+        "region": region_slug,
+        **build_time,
+        "generation": hashlib.sha256("\n".join(files).encode("utf-8")).hexdigest()[:CONTENT_HASH_LENGTH],
+        "artifacts": artifacts,
+        "files": files,
+        "previous_files": kept,
+    }
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(manifest_path)
+
+    stale = set(previous.get("previous_files", [])) - set(files) - set(kept)
+    for name in sorted(stale):
+        (base_path / name).unlink(missing_ok=True)
+    return published + [manifest_path]
+
+
+def drop_region_manifest(base_path: Path) -> None:
+    """Remove a manifest left by a content-addressed build so fixed-name outputs are used again."""
+    manifest_path = base_path / GENERATION_MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if isinstance(manifest, dict) and "generation" in manifest:
+        manifest_path.unlink()
+
+
+def plan_model_counts(
+    paths: Sequence[Path],
+    *,
+    region_col: str,
+    band_col: str,
+    time_col: str,
+    variable_col: str,
+    level_col: str,
+    specs: Sequence[ModelSpec] | None = None,
+    start_ts: pd.Timestamp | None = None,
+    end_ts: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Row and non-null counts per (region, variable, level) from one grouped aggregate.
+
+    The result has `__region_lower`, `variable`, `level`, `rows` and one count
+    column per numeric model column; date and spec filters are pushed into the
+    scan like `query_model_rows` does.
+    """
+    con = connect_duckdb()
+    try:
+        con.execute("SET TimeZone = 'UTC'")
+        column_types = model_column_types(con, paths)
+        resolved = resolve_model_columns(
+            list(column_types),
+            region_col=region_col,
+            band_col=band_col,
+            time_col=time_col,
+            variable_col=variable_col,
+            level_col=level_col,
+        )
+        keys = {region_col, *resolved}
+        numeric_cols = [
+            name
+            for name, col_type in column_types.items()
+            if name not in keys and col_type.split("(")[0] in DUCKDB_NUMERIC_TYPES
+        ]
+        filters = model_row_filters(column_types, resolved, specs=specs, start_ts=start_ts, end_ts=end_ts)
+        where = " AND ".join(condition for condition, _ in filters) or "true"
+        counts = "".join(f",\n                   count({quote_ident(col)}) AS {quote_ident(col)}" for col in numeric_cols)
+        query = """
+            SELECT lower({region}) AS __region_lower,
+                   {variable} AS variable,
+                   {level} AS level,
+                   count(*) AS rows{counts}
+            FROM read_parquet(?)
+            WHERE {where}
+            GROUP BY ALL
+            ORDER BY ALL
+        """.format(
+            region=quote_ident(region_col),
+            variable=quote_ident(resolved[2]),
+            level=quote_ident(resolved[3]),
+            counts=counts,
+            where=where,
+        )
+        params = [[str(p) for p in paths]] + [value for _, values in filters for value in values]
+        return con.execute(query, params).df()
+    finally:
+        con.close()
+
+
+def station_row_counts(
+    station_csv: Path,
+    station_store: Path | None,
+    *,
+    region_col: str,
+) -> dict[str, int]:
+    """Station rows per region slug; store partitions are counted from parquet footers only."""
+    counts: dict[str, int] = {}
+    con = connect_duckdb()
+    try:
+        if station_store is not None:
+            for region_slug in sorted(station_store_regions(station_store)):
+                files = sorted(str(path) for path in (station_store / f"region={region_slug}").glob("band=*/*.parquet"))
+                if files:
+                    (rows,) = con.execute("SELECT sum(num_rows) FROM parquet_file_metadata(?)", [files]).fetchone()
+                    counts[region_slug] = int(rows or 0)
+            return counts
+        for path in resolve_station_csv_paths(station_csv):
+            try:
+                grouped = con.execute(
+                    f"SELECT {quote_ident(region_col)}, count(*) FROM read_csv(?, all_varchar = true, header = true, null_padding = true) GROUP BY 1",
+                    [str(path)],
+                ).fetchall()
+            except duckdb.Error:
+                region_hint, _ = infer_region_band_from_filename(path)
+                if not region_hint:
+                    continue
+                (rows,) = con.execute(
+                    "SELECT count(*) FROM read_csv(?, all_varchar = true, header = true, null_padding = true)", [str(path)]
+                ).fetchone()
+                grouped = [(region_hint, rows)]
+            for value, rows in grouped:
+                if value:
+                    slug = slugify_region(value)
+                    counts[slug] = counts.get(slug, 0) + int(rows)
+    finally:
+        con.close()
+    return counts
+
+
+def format_bytes(size: float) -> str:
+    """Human-readable size, e.g. ``1.5 MB``."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def print_plan(
+    regions: Sequence[str],
+    pending: Sequence[str],
+    context: BuildContext,
+    model_counts: pd.DataFrame,
+    station_counts: dict[str, int],
+) -> None:
+    """Print what a build would do per region, with an estimated timeseries size."""
+    args = context.args
+    alias_to_slug: dict[str, str] = {}
+    for region in regions:
+        for alias in region_aliases(region):
+            alias_to_slug.setdefault(alias, region)
+    model_counts = model_counts.assign(__region_slug=model_counts["__region_lower"].map(alias_to_slug))
+    metric_cols = [col for col in model_counts.columns if col not in ("__region_lower", "__region_slug", "variable", "level", "rows")]
+    requested = {(spec.variable, spec.level): spec.metrics for spec in args.model_spec or []}
+    per_timestamp = PLAN_BYTES_PER_TIMESTAMP[args.time_axis]
+    station_metric_count = len(context.station_metrics)
+
+    print(f"Plan: {len(regions)} region(s), {len(pending)} to build")
+    header = f"{'region':<24} {'status':<7} {'model_rows':>10} {'specs':>5} {'station_rows':>12} {'est_size':>10}"
+    print(header)
+    print("-" * len(header))
+    total_bytes = 0
+    for region_slug in regions:
+        region_counts = model_counts[model_counts["__region_slug"] == region_slug]
+        specs: List[str] = []
+        model_bytes = 0
+        for record in region_counts.to_dict("records"):
+            key = (str(record["variable"]), str(record["level"]))
+            metrics = requested.get(key) if requested else [col for col in metric_cols if record[col] > 0]
+            if not metrics:
+                continue
+            specs.append(f"{key[0]}@{key[1]}:{','.join(metrics)}")
+            model_bytes += int(record["rows"]) * (per_timestamp + PLAN_BYTES_PER_VALUE * len(metrics))
+        station_rows = station_counts.get(region_slug, 0)
+        size = model_bytes + station_rows * (per_timestamp + PLAN_BYTES_PER_VALUE * station_metric_count)
+        total_bytes += size
+        status = "build" if region_slug in pending else "skip"
+        print(
+            f"{region_slug:<24} {status:<7} {int(region_counts['rows'].sum()):>10} {len(specs):>5} "
+            f"{station_rows:>12} {format_bytes(size):>10}"
+        )
+        for spec in specs:
+            print(f"    {spec}")
+    print(f"Estimated timeseries output: {format_bytes(total_bytes)}")
+
+
+def sql_literal(value) -> str:
+    """Render a filter value as a SQL literal (views cannot take prepared parameters)."""
+    if isinstance(value, datetime):
+        kind = "TIMESTAMP" if value.tzinfo is None else "TIMESTAMPTZ"
+        return f"{kind} '{value.isoformat()}'"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def inline_params(condition: str, values: Sequence[object]) -> str:
+    parts = condition.split("?")
+    if len(parts) != len(values) + 1:
+        raise ValueError(f"Cannot inline {len(values)} parameter(s) into {condition!r}")
+    out = parts[0]
+    for value, part in zip(values, parts[1:]):
+        out += sql_literal(value) + part
+    return out
+
+
+class ModelStream:
+    """Region model rows exposed as a DuckDB view and consumed in bounded batches.
+
+    Nothing is materialized in pandas beyond one (spec, band) series at a time:
+    spec discovery and window summaries run as DuckDB aggregates over the view,
+    and timeseries entries are assembled from `fetch_df_chunk` batches of a
+    query ordered by spec and time. DuckDB itself is held to `memory_limit`
+    and spills to `temp_directory`.
+
+    With `trailing_hours` (--summary-only) the view is narrowed to the rows
+    any trailing summary window can reach: the start of the earliest group
+    window becomes a scan filter, so older parquet row groups are skipped.
+    """
+
+    def __init__(
+        self,
+        parquet_paths: Sequence[Path],
+        region: str,
+        *,
+        region_col: str,
+        band_col: str,
+        time_col: str,
+        variable_col: str,
+        level_col: str,
+        start_ts: pd.Timestamp | None = None,
+        end_ts: pd.Timestamp | None = None,
+        specs: Sequence[ModelSpec] | None = None,
+        extra_columns: Sequence[str] = (),
+        run_col: str | None = None,
+        lead_col: str | None = "forecast_hour",
+        memory_limit: str | None = None,
+        temp_directory: Path | None = None,
+        batch_rows: int = 100_000,
+        trailing_hours: int | None = None,
+    ):
+        paths = [Path(p) for p in parquet_paths]
+        for parquet_path in paths:
+            if not parquet_path.exists():
+                raise FileNotFoundError(parquet_path)
+        self.time_col = time_col
+        self.vectors_per_chunk = max(1, batch_rows // DUCKDB_VECTOR_ROWS)
+        # (variable, level) -> first file position over the unbounded rows, under `trailing_hours`.
+        self.spec_order: dict[Tuple[str, str], List[int]] | None = None
+        self.con = connect_duckdb()
+        try:
+            self._open(
+                paths,
+                region,
+                region_col=region_col,
+                band_col=band_col,
+                variable_col=variable_col,
+                level_col=level_col,
+                start_ts=start_ts,
+                end_ts=end_ts,
+                specs=specs,
+                extra_columns=extra_columns,
+                run_col=run_col,
+                lead_col=lead_col,
+                memory_limit=memory_limit,
+                temp_directory=temp_directory,
+                trailing_hours=trailing_hours,
+            )
+        except Exception:
+            self.con.close()
+            raise
+
+    def _open(
+        self,
+        paths: List[Path],
+        region: str,
+        *,
+        region_col: str,
+        band_col: str,
+        variable_col: str,
+        level_col: str,
+        start_ts: pd.Timestamp | None,
+        end_ts: pd.Timestamp | None,
+        specs: Sequence[ModelSpec] | None,
+        extra_columns: Sequence[str],
+        run_col: str | None,
+        lead_col: str | None,
+        memory_limit: str | None,
+        temp_directory: Path | None,
+        trailing_hours: int | None,
+    ) -> None:
+        con = self.con
+        con.execute("SET TimeZone = 'UTC'")
+        con.execute("SET preserve_insertion_order = false")
+        if memory_limit:
+            con.execute(f"SET memory_limit = {sql_literal(memory_limit)}")
+        if temp_directory:
+            temp_directory.mkdir(parents=True, exist_ok=True)
+            con.execute(f"SET temp_directory = {sql_literal(str(temp_directory))}")
+
+        column_types = model_column_types(con, paths)
+        resolved = resolve_model_columns(
+            list(column_types),
+            region_col=region_col,
+            band_col=band_col,
+            time_col=self.time_col,
+            variable_col=variable_col,
+            level_col=level_col,
+        )
+        band_col_resolved, time_col_resolved, variable_col_resolved, level_col_resolved = resolved
+
+        aliases = set(region_aliases(region))
+        region_values = model_regions_from_metadata(con, paths, region_col)
+        if region_values is None:
+            region_values = {
+                value
+                for (value,) in con.execute(
+                    f"SELECT DISTINCT {quote_ident(region_col)} FROM read_parquet(?)", [[str(p) for p in paths]]
+                ).fetchall()
+            }
+        raw_regions = sorted(value for value in region_values if value is not None and str(value).lower() in aliases)
+        region_condition = (
+            f"{quote_ident(region_col)} IN ({', '.join(sql_literal(value) for value in raw_regions)})"
+            if raw_regions
+            else "false"
+        )
+
+        keys = {region_col, *resolved}
+        columns = [
+            col
+            for col in model_projection(
+                list(column_types),
+                resolved,
+                region_col=region_col,
+                specs=specs,
+                extra_columns=[col for col in extra_columns if col in column_types],
+            )
+            if col not in keys
+        ]
+        band_cases = " ".join(
+            f"WHEN {sql_literal(alias)} THEN {sql_literal(band)}" for alias, band in BAND_ALIASES.items()
+        )
+        time_ident = quote_ident(time_col_resolved)
+        parsed_time = f"TRY_CAST({time_ident} AS TIMESTAMPTZ)"
+
+        run_expr = "NULL::TIMESTAMPTZ"
+        self.has_run_times = False
+        for candidate in ([run_col] if run_col else []) + MODEL_RUN_COLUMNS:
+            if candidate in column_types:
+                run_expr = f"TRY_CAST({quote_ident(candidate)} AS TIMESTAMPTZ)"
+                self.has_run_times = True
+                break
+        else:
+            if lead_col and lead_col in column_types:
+                run_expr = (
+                    f"{parsed_time} - to_microseconds(CAST(TRY_CAST({quote_ident(lead_col)} AS DOUBLE) * 3600000000 AS BIGINT))"
+                )
+                self.has_run_times = True
+
+        def create_view(start: pd.Timestamp | None) -> None:
+            conditions = [region_condition]
+            for condition, values in model_row_filters(
+                column_types, resolved, specs=specs, start_ts=start, end_ts=end_ts
+            ):
+                conditions.append(inline_params(condition, values))
+            parsed_filters = ["__band_lower IS NOT NULL", f"{quote_ident(self.time_col)} IS NOT NULL"]
+            for bound, op in ((start, ">="), (end_ts, "<=")):
+                if bound is not None:
+                    parsed_filters.append(f"{quote_ident(self.time_col)} {op} {sql_literal(bound.to_pydatetime())}")
+            con.execute(
+                """
+                CREATE OR REPLACE VIEW {view} AS
+                SELECT *
+                FROM (
+                    SELECT CAST({variable} AS VARCHAR) AS variable,
+                           CAST({level} AS VARCHAR) AS level,
+                           CASE lower(trim(CAST({band} AS VARCHAR))) {band_cases} END AS __band_lower,
+                           {parsed_time} AS {time_alias},
+                           {run_expr} AS __run_time{columns},
+                           list_position({paths}, filename) AS __file_index,
+                           file_row_number AS __file_row
+                    FROM read_parquet({paths}, filename = true, file_row_number = true)
+                    WHERE {conditions}
+                )
+                WHERE {parsed_filters}
+                """.format(
+                    view=STREAM_VIEW,
+                    variable=quote_ident(variable_col_resolved),
+                    level=quote_ident(level_col_resolved),
+                    band=quote_ident(band_col_resolved),
+                    band_cases=band_cases,
+                    parsed_time=parsed_time,
+                    time_alias=quote_ident(self.time_col),
+                    run_expr=run_expr,
+                    columns="".join(f",\n                           {quote_ident(col)}" for col in columns),
+                    paths="[" + ", ".join(sql_literal(str(p)) for p in paths) + "]",
+                    conditions="\n                      AND ".join(conditions),
+                    parsed_filters=" AND ".join(parsed_filters),
+                )
+            )
+
+        create_view(start_ts)
+        if trailing_hours is not None:
+            window_start = self._trailing_start(trailing_hours)
+            if window_start is not None and (start_ts is None or window_start > start_ts):
+                create_view(window_start)
+        self.columns = [desc[0] for desc in con.execute(f"SELECT * FROM {STREAM_VIEW} LIMIT 0").description]
+        self.column_types = {
+            name: str(col_type).upper()
+            for name, col_type in con.execute(
+                f"SELECT column_name, column_type FROM (DESCRIBE SELECT * FROM {STREAM_VIEW})"
+            ).fetchall()
+        }
+        (self.row_count,) = con.execute(f"SELECT count(*) FROM {STREAM_VIEW}").fetchone()
+        if not self.row_count:
+            raise ValueError(
+                f"No model rows matching region='{region}' with recognized elevation bands and date filters"
+            )
+
+    def _trailing_start(self, hours: int) -> pd.Timestamp | None:
+        """Start of the earliest trailing window over the (band, variable, level) groups.
+
+        Each group's window ends at its own latest row, so no window reaches
+        before the earliest group end minus `hours`. Reads only the key and
+        time columns, and records the spec order of the unbounded rows.
+        """
+        time_ident = quote_ident(self.time_col)
+        rows = self.con.execute(
+            f"""
+            SELECT variable, level, min(__latest), min(__first)
+            FROM (
+                SELECT variable, level, max({time_ident}) AS __latest, min([__file_index, __file_row]) AS __first
+                FROM {STREAM_VIEW}
+                GROUP BY __band_lower, variable, level
+            )
+            GROUP BY variable, level
+            """
+        ).fetchall()
+        self.spec_order = {(variable, level): first for variable, level, _, first in rows}
+        ends = [latest for _, _, latest, _ in rows if latest is not None]
+        if not ends:
+            return None
+        return pd.Timestamp(min(ends)).tz_convert("UTC") - pd.Timedelta(hours=hours)
+
+    def close(self) -> None:
+        # The view outlives this cursor when the database is shared (--watch).
+        self.con.execute(f"DROP VIEW IF EXISTS {STREAM_VIEW}")
+        self.con.close()
+
+    def discover_specs(self) -> List[ModelSpec]:
+        """SQL counterpart of `discover_model_specs`, in order of first appearance."""
+        numeric_cols = [
+            col
+            for col in self.columns
+            if not col.startswith("__")
+            and col not in (self.time_col, "variable", "level")
+            and self.column_types[col].split("(")[0] in DUCKDB_NUMERIC_TYPES
+        ]
+        counts = "".join(f", count({quote_ident(col)})" for col in numeric_cols)
+        rows = self.con.execute(
+            f"""
+            SELECT variable, level, min([__file_index, __file_row]){counts}
+            FROM {STREAM_VIEW}
+            GROUP BY variable, level
+            """
+        ).fetchall()
+        # A view narrowed to trailing windows keeps the order of the full rows.
+        order = self.spec_order or {}
+        rows.sort(key=lambda row: order.get((row[0], row[1]), row[2]))
+        specs: List[ModelSpec] = []
+        for variable, level, _, *non_null in rows:
+            metrics = [col for col, count in zip(numeric_cols, non_null) if count > 0]
+            if variable is None or level is None or not metrics:
+                continue
+            specs.append(ModelSpec(variable=str(variable), level=str(level), metrics=metrics))
+        return specs
+
+    def payload(
+        self,
+        specs: Sequence[ModelSpec],
+        *,
+        time_encoding: str = "iso",
+        reduction: str = "none",
+        windows: Sequence[SummaryWindow] = DEFAULT_SUMMARY_WINDOWS,
+    ) -> dict:
+        """Summary tables plus per-band entry iterators, shaped like `build_model_payload`."""
+        metrics: List[str] = []
+        for spec in specs:
+            for metric in spec.metrics:
+                if metric in self.columns and metric not in metrics:
+                    metrics.append(metric)
+        summary_df = summarize_model_windows(self.con, STREAM_VIEW, metrics, time_col=self.time_col, windows=windows)
+        summary = model_summary_tables(summary_df, specs, self.columns, windows=windows)
+
+        if reduction in ("latest", "runs") and not self.has_run_times:
+            logger.warning("No model run or lead column found; ignoring --model-reduce %s", reduction)
+            reduction = "none"
+        return {
+            "summary": summary,
+            "timeseries": {
+                band: self.band_entries(band, specs, time_encoding=time_encoding, reduction=reduction)
+                for band in BANDS
+            },
+        }
+
+    def band_entries(
+        self,
+        band: str,
+        specs: Sequence[ModelSpec],
+        *,
+        time_encoding: str,
+        reduction: str,
+    ) -> Iterator[dict]:
+        """Yield one band's entries, holding only the rows of the current spec in memory."""
+        if not specs:
+            return
+        spec_rank = " ".join(
+            f"WHEN variable = {sql_literal(spec.variable)} AND level = {sql_literal(spec.level)} THEN {rank}"
+            for rank, spec in enumerate(specs)
+        )
+        metrics = [metric for metric in dict.fromkeys(m for spec in specs for m in spec.metrics) if metric in self.columns]
+        select = ", ".join(quote_ident(col) for col in [self.time_col, "__run_time", *metrics])
+        cursor = self.con.cursor()
+        try:
+            cursor.execute(
+                f"""
+                SELECT *
+                FROM (
+                    SELECT CASE {spec_rank} END AS __spec_rank, {select}, __file_index, __file_row
+                    FROM {STREAM_VIEW}
+                    WHERE __band_lower = ?
+                )
+                WHERE __spec_rank IS NOT NULL
+                ORDER BY __spec_rank, {quote_ident(self.time_col)}, __file_index, __file_row
+                """,
+                [band],
+            )
+            pending: List[pd.DataFrame] = []
+            current: int | None = None
+            while True:
+                chunk = cursor.fetch_df_chunk(self.vectors_per_chunk)
+                if chunk.empty:
+                    break
+                ranks = chunk["__spec_rank"].to_numpy()
+                bounds = np.flatnonzero(ranks[1:] != ranks[:-1]) + 1
+                for start, stop in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(chunk)]))):
+                    rank = int(ranks[start])
+                    if current is not None and rank != current:
+                        yield from self._emit(pending, specs[current], time_encoding, reduction)
+                        pending = []
+                    current = rank
+                    pending.append(chunk.iloc[start:stop])
+            if current is not None:
+                yield from self._emit(pending, specs[current], time_encoding, reduction)
+        finally:
+            cursor.close()
+
+    def _emit(self, parts: List[pd.DataFrame], spec: ModelSpec, time_encoding: str, reduction: str) -> Iterator[dict]:
+        band_df = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0].reset_index(drop=True)
+        yield from model_entries(band_df, spec, self.time_col, time_encoding=time_encoding, reduction=reduction)
+
+
+def peak_rss_bytes() -> int | None:
+    """High-water resident set size of this process, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageProfiler:
+    """Record wall time, CPU time, row counts and peak RSS for named stages.
+
+    Each `stage()` block appends one record; callers fill in `rows_in` /
+    `rows_out` (and optionally `bytes_out`) on the yielded dict. CPU time is
+    the whole process's, so it includes DuckDB worker threads; peak RSS is the
+    process high-water mark when the stage ends.
+    """
+
+    def __init__(self) -> None:
+        self.stages: List[dict] = []
+
+    @contextmanager
+    def stage(self, name: str, *, rows_in: int | None = None) -> Iterator[dict]:
+        record: dict[str, object] = {"stage": name, "rows_in": rows_in, "rows_out": None}
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall, 6)
+            record["cpu_s"] = round(time.process_time() - cpu, 6)
+            record["peak_rss_bytes"] = peak_rss_bytes()
+            self.stages.append(record)
+
+
+def files_size(paths: Iterable[Path]) -> int:
+    return sum(Path(path).stat().st_size for path in paths)
+
+
+@dataclass
+class BuildContext:
+    """Run-wide settings shared by every region job (picklable for worker processes)."""
+
+    args: argparse.Namespace
+    start_ts: pd.Timestamp | None
+    end_ts: pd.Timestamp | None
+    station_metrics: List[str]
+    station_store: Path | None
+    output_arg: Path | None
+    multi_region: bool
+    log_level: int = logging.WARNING
+    # --watch only: region slug -> (station input key, loaded station frame).
+    station_cache: dict[str, Tuple[str, pd.DataFrame]] | None = None
+
+
+@dataclass
+class RegionJob:
+    index: int
+    total: int
+    region_slug: str
+    model_df: pd.DataFrame | None = None
+    preloaded: bool = False
+    has_stations: bool = True
+    station_key: str | None = None
+
+
+@dataclass
+class RegionResult:
+    region: str
+    paths: List[Path] = field(default_factory=list)
+    lines: List[str] = field(default_factory=list)
+    records: List[logging.LogRecord] = field(default_factory=list)
+    error: str | None = None
+    stages: List[dict] = field(default_factory=list)
+    wall_s: float = 0.0
+
+
+class _RecordCollector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        self.records.append(record)
+
+
+def region_output_dir(context: BuildContext, region_slug: str) -> Path:
+    output_arg = context.output_arg
+    if output_arg:
+        if output_arg.suffix == ".json" and not context.multi_region:
+            # south_rockies.json and south-rockies.json name the same directory.
+            return output_arg.parent / slugify_region(output_arg.stem)
+        return output_arg / region_slug
+    return DEFAULT_OUTPUT_ROOT / region_slug
+
+
+def shared_output_dir(context: BuildContext, region_slug: str) -> Path:
+    """The `shared/` directory beside the region directories (ledger, run reports)."""
+    return region_output_dir(context, region_slug).parent / "shared"
+
+
+def profile_report(
+    run_stages: Sequence[dict],
+    results: Sequence[RegionResult],
+    *,
+    wall_s: float,
+    cpu_s: float,
+    jobs: int,
+) -> dict:
+    """Assemble the --profile run report: run-level stages, per-region stages and per-stage totals."""
+    totals: dict[str, dict] = {}
+    for result in results:
+        for record in result.stages:
+            total = totals.setdefault(
+                record["stage"],
+                {"regions": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows_in": 0, "rows_out": 0, "bytes_out": 0},
+            )
+            total["regions"] += 1
+            for key in ("wall_s", "cpu_s", "rows_in", "rows_out", "bytes_out"):
+                total[key] += record.get(key) or 0
+    for total in totals.values():
+        total["wall_s"] = round(total["wall_s"], 6)
+        total["cpu_s"] = round(total["cpu_s"], 6)
+    return {
+        "generated_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "jobs": jobs,
+        "wall_s": round(wall_s, 6),
+        "cpu_s": round(cpu_s, 6),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "stages": list(run_stages),
+        "stage_totals": dict(sorted(totals.items(), key=lambda item: item[1]["wall_s"], reverse=True)),
+        "regions": {
+            result.region: {"wall_s": result.wall_s, "error": result.error, "stages": result.stages}
+            for result in results
+        },
+    }
+
+
+def load_build_ledger(path: Path) -> dict:
+    ledger: dict = {"version": 1, "file_hashes": {}, "regions": {}}
+    if path.exists():
+        try:
+            previous = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable build ledger %s", path)
+            return ledger
+        if previous.get("version") == 1:
+            ledger["file_hashes"] = previous.get("file_hashes", {})
+            ledger["regions"] = previous.get("regions", {})
+    return ledger
+
+
+def update_region_index(path: Path, region_slugs: Iterable[str]) -> dict:
+    """Merge `region_slugs` into shared/regions.json: canonical slugs plus an alias -> slug map.
+
+    Earlier indexes (including the plain list format) are folded in, canonicalised.
+    """
+    known: Set[str] = set()
+    if path.exists():
+        try:
+            previous = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable region index %s", path)
+            previous = []
+        listed = previous.get("regions", []) if isinstance(previous, dict) else previous
+        known.update(slugify_region(str(value)) for value in listed if value)
+    known.update(region_slugs)
+    regions = sorted(slug for slug in known if slug)
+    index = {
+        "regions": regions,
+        "aliases": {
+            alias: slug for slug in regions for alias in sorted(region_aliases(slug)) if alias != slug
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(index, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(path)
+    return index
+
+
+def region_alias_dirs(region_dir: Path, region_slug: str) -> List[Path]:
+    """Directories beside `region_dir` named after another spelling of `region_slug` (e.g. south_rockies/)."""
+    region_dir = region_dir.resolve()
+    alias_dirs = [
+        (region_dir.parent / alias).resolve() for alias in sorted(region_aliases(region_slug)) if alias != region_slug
+    ]
+    return [alias_dir for alias_dir in alias_dirs if alias_dir != region_dir]
+
+
+def prune_region_aliases(region_dir: Path, region_slug: str, recorded: Iterable[str]) -> List[Path]:
+    """Delete generator outputs left under another spelling of `region_slug`.
+
+    Only files in `recorded` (outputs listed in the build ledger) are removed, followed
+    by the directories they leave empty; any other file in those trees is kept.
+    """
+    recorded_paths = sorted({Path(name).resolve() for name in recorded})
+    removed: List[Path] = []
+    for alias_dir in region_alias_dirs(region_dir, region_slug):
+        if not alias_dir.is_dir():
+            continue
+        for path in recorded_paths:
+            if not path.is_relative_to(alias_dir) or not path.is_file():
+                continue
+            path.unlink()
+            removed.append(path)
+            parent = path.parent
+            while parent != alias_dir.parent and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+    return removed
+
+
+def write_build_ledger(path: Path, ledger: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(ledger, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def cached_file_hash(path: Path, cache: dict[str, dict]) -> str:
+    """Return the sha256 of `path`, reusing `cache` while size and mtime are unchanged."""
+    stat = path.stat()
+    key = str(path.resolve())
+    entry = cache.get(key)
+    if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return entry["sha256"]
+    digest = file_sha256(path)
+    cache[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+    return digest
+
+
+def station_csv_regions(path: Path, region_col: str) -> Set[str] | None:
+    """Region slugs with rows in one station CSV (its region column, else its file name); None when unknown."""
+    try:
+        if region_col in read_csv_header(path):
+            con = connect_duckdb()
+            try:
+                query = (
+                    f"SELECT DISTINCT {quote_ident(region_col)} "
+                    "FROM read_csv(?, header = true, all_varchar = true, null_padding = true)"
+                )
+                values = {value for (value,) in con.execute(query, [str(path)]).fetchall()}
+            finally:
+                con.close()
+        else:
+            region_hint, _ = infer_region_band_from_filename(path)
+            values = {region_hint} if region_hint else None
+    except (duckdb.Error, OSError, ValueError) as exc:
+        logger.warning("Could not determine the regions in %s: %s", path, exc)
+        return None
+    if values is None:
+        return None
+    return {slugify_region(str(value)) for value in values if value}
+
+
+def cached_station_csv_regions(path: Path, cache: dict[str, dict], region_col: str) -> List[str] | None:
+    """station_csv_regions(), kept beside the file's hash in `cache` until the file changes."""
+    cached_file_hash(path, cache)
+    entry = cache[str(path.resolve())]
+    if "regions" not in entry or entry.get("region_column") != region_col:
+        regions = station_csv_regions(path, region_col)
+        entry["region_column"] = region_col
+        entry["regions"] = sorted(regions) if regions is not None else None
+    return entry["regions"]
+
+
+def station_input_hashes(
+    station_csv: Path,
+    station_store: Path | None,
+    hash_cache: dict[str, dict],
+    *,
+    region_col: str,
+) -> dict[str | None, dict[str, str]]:
+    """Map region slug -> {csv name: sha256} for the station CSVs feeding that region.
+
+    CSVs whose regions cannot be determined are listed under ``None`` and count
+    as inputs of every region.
+    """
+    if station_store is not None:
+        manifest = json.loads((station_store / STATION_STORE_MANIFEST).read_text(encoding="utf-8"))
+        by_region: dict[str | None, dict[str, str]] = {}
+        for name, entry in manifest.get("sources", {}).items():
+            for rel in entry.get("files", []):
+                region_slug = rel.split("/", 1)[0][len("region="):]
+                by_region.setdefault(region_slug, {})[name] = entry["sha256"]
+        return by_region
+    if not station_csv.exists():
+        return {None: {}}
+    by_region = {}
+    for path in resolve_station_csv_paths(station_csv):
+        digest = cached_file_hash(path, hash_cache)
+        regions = cached_station_csv_regions(path, hash_cache, region_col)
+        for region_slug in regions if regions is not None else [None]:
+            by_region.setdefault(region_slug, {})[path.name] = digest
+    return by_region
+
+
+def region_station_hashes(station_hashes: dict[str | None, dict[str, str]], region_slug: str) -> dict[str, str]:
+    """The station inputs of one region: its own files plus those not attributed to any region."""
+    return {**station_hashes.get(None, {}), **station_hashes.get(region_slug, {})}
+
+
+def build_options_fingerprint(args: argparse.Namespace) -> dict:
+    """CLI options that influence the generated outputs."""
+    ignored = {
+        "verbose",
+        "jobs",
+        "force",
+        "prune_aliases",
+        "plan",
+        "profile",
+        "profile_region",
+        "watch",
+        "watch_interval",
+        "watch_debounce",
+        "stream",
+        "memory_limit",
+        "temp_directory",
+        "stream_batch_rows",
+        "station_store",
+        "model_parquet",
+        "warehouse",
+    }
+    options: dict[str, object] = {}
+    for key, value in sorted(vars(args).items()):
+        if key in ignored:
+            continue
+        if isinstance(value, Path):
+            value = str(value.expanduser().resolve())
+        elif key in ("model_spec", "summary_window"):
+            value = [asdict(item) for item in value]
+        options[key] = value
+    return options
+
+
+def region_fingerprint(
+    region_slug: str,
+    *,
+    model_stats: List[dict],
+    station_hashes: dict[str | None, dict[str, str]],
+    options: dict,
+    generator_hash: str,
+) -> str:
+    stations = region_station_hashes(station_hashes, region_slug)
+    payload = {
+        "region": region_slug,
+        "model": model_stats,
+        "stations": dict(sorted(stations.items())),
+        "options": options,
+        "generator": generator_hash,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def summary_trailing_hours(args: argparse.Namespace) -> int | None:
+    """Hours of history a --summary-only build reads: its longest summary window."""
+    if not args.summary_only:
+        return None
+    return max(window.hours for window in args.summary_window)
+
+
+def build_region(
+    job: RegionJob,
+    context: BuildContext,
+    lines: List[str],
+    profiler: StageProfiler | None = None,
+) -> List[Path]:
+    """Load, build and write the summary/timeseries outputs for one region."""
+    args = context.args
+    profiler = profiler or StageProfiler()
+    logger.info(
+        "[%d/%d] Processing region '%s'",
+        job.index,
+        job.total,
+        job.region_slug,
+    )
+    if not args.stream and not args.summary_only:
+        return build_region_outputs(job, context, lines, None, profiler)
+    with profiler.stage("model_load") as record:
+        model_stream = ModelStream(
+            args.model_parquet,
+            job.region_slug,
+            region_col=args.model_region_column,
+            band_col=args.model_band_column,
+            time_col=args.model_time_column,
+            variable_col=args.model_variable_column,
+            level_col=args.model_level_column,
+            start_ts=context.start_ts,
+            end_ts=context.end_ts,
+            specs=args.model_spec,
+            extra_columns=model_extra_columns(args),
+            run_col=args.model_run_column,
+            lead_col=args.model_lead_column,
+            memory_limit=args.memory_limit,
+            temp_directory=args.temp_directory,
+            batch_rows=args.stream_batch_rows,
+            trailing_hours=summary_trailing_hours(args),
+        )
+        record["rows_out"] = model_stream.row_count
+    try:
+        return build_region_outputs(job, context, lines, model_stream, profiler)
+    finally:
+        model_stream.close()
+
+
+def build_region_outputs(
+    job: RegionJob,
+    context: BuildContext,
+    lines: List[str],
+    model_stream: ModelStream | None,
+    profiler: StageProfiler,
+) -> List[Path]:
+    args = context.args
+    index, total, region_slug = job.index, job.total, job.region_slug
+    start_ts, end_ts = context.start_ts, context.end_ts
+    station_metrics = context.station_metrics
+
+    model_df: pd.DataFrame | None = None
+    if model_stream is not None:
+        model_rows = model_stream.row_count
+    elif job.preloaded:
+        model_df = job.model_df
+        if model_df is None:
+            raise ValueError(
+                f"No model rows matching region='{region_slug}' in provided model parquet files"
+            )
+    else:
+        with profiler.stage("model_load") as record:
+            model_df = load_model_dataframe(
+                args.model_parquet,
+                region_slug,
+                region_col=args.model_region_column,
+                band_col=args.model_band_column,
+                time_col=args.model_time_column,
+                variable_col=args.model_variable_column,
+                level_col=args.model_level_column,
+                start_ts=start_ts,
+                end_ts=end_ts,
+                specs=args.model_spec,
+                extra_columns=model_extra_columns(args),
+                warehouse=args.warehouse,
+            )
+            record["rows_out"] = len(model_df)
+    if model_df is not None:
+        model_rows = len(model_df)
+    logger.info(
+        "[%d/%d] %s model data (%d rows) for region '%s'",
+        index,
+        total,
+        "Streaming" if model_stream is not None else "Loaded",
+        model_rows,
+        region_slug,
+    )
+    station_df = None
+    if not job.has_stations:
+        logger.info(
+            "[%d/%d] No station CSVs detected for region '%s'; proceeding with model data only",
+            index,
+            total,
+            region_slug,
+        )
+    else:
+        cached = context.station_cache.get(region_slug) if context.station_cache is not None else None
+        try:
+            with profiler.stage("station_load") as record:
+                if cached is not None and job.station_key is not None and cached[0] == job.station_key:
+                    station_df = cached[1]
+                    record["cached"] = True
+                else:
+                    station_df = load_station_dataframe(
+                        args.station_csv,
+                        region_slug,
+                        region_col=args.station_region_column,
+                        band_col=args.station_band_column,
+                        time_col=args.station_time_column,
+                        start_ts=start_ts,
+                        end_ts=end_ts,
+                        store_dir=context.station_store,
+                        id_col=args.station_id_column,
+                        name_col=args.station_name_column,
+                        metrics=context.station_metrics,
+                        time_format=args.station_time_format,
+                        warehouse=args.warehouse,
+                        trailing_hours=summary_trailing_hours(args),
+                    )
+                    if context.station_cache is not None and job.station_key is not None:
+                        context.station_cache[region_slug] = (job.station_key, station_df)
+                record["rows_out"] = len(station_df)
+            logger.info(
+                "[%d/%d] Loaded station data (%d rows) for region '%s'",
+                index,
+                total,
+                len(station_df),
+                region_slug,
+            )
+        except (ValueError, KeyError) as exc:
+            logger.warning(
+                "[%d/%d] Station data unavailable for region '%s': %s",
+                index,
+                total,
+                region_slug,
+                exc,
+            )
+    if station_df is None:
+        empty_cols = {
+            args.station_time_column: pd.Series(dtype="datetime64[ns, UTC]"),
+            "__band_lower": pd.Series(dtype=str),
+        }
+        empty_cols[args.station_band_column] = pd.Series(dtype=str)
+        empty_cols[args.station_region_column] = pd.Series(dtype=str)
+        empty_cols[args.station_id_column] = pd.Series(dtype=str)
+        empty_cols[args.station_name_column] = pd.Series(dtype=str)
+        for metric in station_metrics:
+            empty_cols[metric] = pd.Series(dtype=float)
+        station_df = pd.DataFrame(empty_cols)
+        station_metric_columns = [metric for metric in station_metrics if metric in station_df.columns]
+    else:
+        station_metric_columns = resolve_station_metrics(
+            station_df,
+            station_metrics,
+            time_col=args.station_time_column,
+            band_col=args.station_band_column,
+            id_col=args.station_id_column,
+            name_col=args.station_name_column,
+        )
+
+    bundle = {
+        "region": region_slug,
+        "run_time_utc": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "version": datetime.utcnow().strftime("%Y%m%d%H%M"),
+        "tiles_base": args.tiles_base,
+    }
+
+    if args.quicklook:
+        bundle["quicklook_png"] = args.quicklook
+
+    if args.model_spec:
+        model_specs = args.model_spec
+    else:
+        with profiler.stage("model_specs", rows_in=model_rows) as record:
+            if model_stream is not None:
+                model_specs = model_stream.discover_specs()
+            else:
+                model_specs = discover_model_specs(model_df, args.model_time_column)
+            record["rows_out"] = len(model_specs)
+    if not model_specs:
+        lines.append(f"[warn] No model metrics discovered for region '{region_slug}'. Skipping model summary/time-series.")
+    else:
+        logger.info(
+            "[%d/%d] Using %d model specs for region '%s'",
+            index,
+            total,
+            len(model_specs),
+            region_slug,
+        )
 
-            for metric in metric_columns:
-                values = pd.to_numeric(windowed[metric], errors="coerce").dropna()
-                out_key = f"{metric}_avg_24h"
-                row_entry[out_key] = to_jsonable(values.mean()) if not values.empty else None
+    with profiler.stage("station_payload", rows_in=len(station_df)) as record:
+        station_payload = build_station_payload(
+            station_df,
+            station_metric_columns,
+            time_col=args.station_time_column,
+            id_col=args.station_id_column,
+            name_col=args.station_name_column,
+            time_encoding=args.time_axis,
+            windows=args.summary_window,
+        )
+        record["rows_out"] = sum(len(entries) for entries in station_payload["timeseries"].values())
+    with profiler.stage("model_payload", rows_in=model_rows) as record:
+        if not model_specs:
+            model_payload = {"summary": {band: [] for band in BANDS}, "timeseries": {band: [] for band in BANDS}}
+        elif model_stream is not None:
+            # Timeseries values are iterators, consumed while timeseries.json is written
+            # (so the streamed series are built inside the write_timeseries stage).
+            model_payload = model_stream.payload(
+                model_specs,
+                time_encoding=args.time_axis,
+                reduction=args.model_reduce,
+                windows=args.summary_window,
+            )
+        else:
+            model_payload = build_model_payload(
+                model_df,
+                model_specs,
+                args.model_time_column,
+                time_encoding=args.time_axis,
+                reduction=args.model_reduce,
+                run_col=args.model_run_column,
+                lead_col=args.model_lead_column,
+                windows=args.summary_window,
+            )
+        if model_stream is None:
+            record["rows_out"] = sum(len(entries) for entries in model_payload["timeseries"].values())
 
-            table_rows.append(row_entry)
+    base_path = region_output_dir(context, region_slug)
+    summary_path = base_path / "summary.json"
+    timeseries_path = base_path / "timeseries.json"
+    base_path.mkdir(parents=True, exist_ok=True)
+    precompress = args.precompress or []
+    logger.info(
+        "[%d/%d] Writing outputs under %s",
+        index,
+        total,
+        base_path,
+    )
 
-        if table_rows:
-            summary_columns = [id_col]
-            if name_col in band_df.columns:
-                summary_columns.append(name_col)
-            summary_columns.extend(["window_start_utc", "window_end_utc", "samples_24h"])
-            summary_columns.extend(f"{metric}_avg_24h" for metric in metric_columns)
+    summary_payload = {
+        **bundle,
+        "stations": station_payload["summary"],
+        "model": model_payload["summary"],
+    }
+    with profiler.stage("write_summary") as record:
+        written = write_json(summary_path, summary_payload, precompress=precompress)
+        record["bytes_out"] = files_size(written)
+    lines.append(f"Wrote summary -> {summary_path}")
 
-            summary[band].append(
-                {
-                    "columns": summary_columns,
-                    "rows": table_rows,
-                    "metadata": {"count": len(table_rows), "aggregation_hours": AGGREGATION_HOURS},
-                }
+    # --summary-only leaves the timeseries outputs of the last full build in place.
+    write_timeseries = not args.summary_only
+    generated_at = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    if write_timeseries and args.output_format in ("json", "both") and args.timeseries_chunks:
+        with profiler.stage("write_chunks") as record:
+            chunk_paths, rewritten = write_timeseries_chunks(
+                base_path,
+                region_slug,
+                {"stations": station_payload["timeseries"], "model": model_payload["timeseries"]},
+                chunk=args.timeseries_chunks,
+                time_encoding=args.time_axis,
+                generated_at=generated_at,
+                precompress=precompress,
             )
-
-        # Build timeseries per station
-        station_groups = band_df.groupby(id_col)
-        for station_id, station_df in station_groups:
-            station_df = station_df.sort_values(time_col)
-            traces = []
-            for metric in metric_columns:
-                values_series = pd.to_numeric(station_df[metric], errors="coerce")
-                traces.append(
-                    {
-                        "name": metric,
-                        "values": values_series.round(4).tolist(),
-                        "yAxis": "y",
-                    }
-                )
-            if not traces:
-                continue
-            timeseries[band].append(
-                {
-                    "station_id": station_id,
-                    "station_name": station_df.get(name_col, pd.Series([station_id])).iloc[0],
-                    "x": to_iso(station_df[time_col]),
-                    "series": traces,
-                }
+            record["bytes_out"] = files_size(chunk_paths)
+            record["chunks_rewritten"] = rewritten
+        # A full file left by an unchunked build would shadow the chunks.
+        remove_output(timeseries_path)
+        written.extend(chunk_paths)
+        lines.append(f"Wrote timeseries chunks -> {base_path / TIMESERIES_CHUNK_INDEX} ({rewritten} rewritten)")
+    elif write_timeseries and args.output_format in ("json", "both"):
+        timeseries_payload = {
+            "region": region_slug,
+            "generated_at": generated_at,
+            "stations": station_payload["timeseries"],
+            "model": model_payload["timeseries"],
+        }
+        # Stream one band entry at a time instead of encoding the whole document.
+        with profiler.stage("write_timeseries") as record:
+            timeseries_paths = write_json(timeseries_path, timeseries_payload, stream_depth=3, precompress=precompress)
+            record["bytes_out"] = files_size(timeseries_paths)
+        drop_timeseries_chunks(base_path)
+        written.extend(timeseries_paths)
+        lines.append(f"Wrote timeseries -> {timeseries_path}")
+    if write_timeseries and args.output_format in ("parquet", "both"):
+        with profiler.stage("write_parquet") as record:
+            parquet_paths = write_timeseries_parquet(
+                base_path,
+                region_slug,
+                station_payload["timeseries"],
+                model_payload["timeseries"],
+                generated_at,
+            )
+            record["bytes_out"] = files_size(parquet_paths)
+        lines.append(f"Wrote parquet timeseries -> {parquet_paths[-1]}")
+        written.extend(parquet_paths)
+    if write_timeseries and args.pyramid:
+        with profiler.stage("write_pyramid") as record:
+            pyramid_paths = write_timeseries_pyramid(
+                base_path,
+                region_slug,
+                {"stations": station_payload["timeseries"], "model": model_payload["timeseries"]},
+                target_points=args.pyramid_target_points,
+                time_encoding=args.time_axis,
+                generated_at=generated_at,
+                full_file=(
+                    (TIMESERIES_CHUNK_INDEX if args.timeseries_chunks else timeseries_path.name)
+                    if args.output_format in ("json", "both")
+                    else None
+                ),
+                precompress=precompress,
+            )
+            record["bytes_out"] = files_size(pyramid_paths)
+        lines.append(f"Wrote timeseries pyramid -> {pyramid_paths[-1]}")
+        written.extend(pyramid_paths)
+    if args.content_addressed:
+        with profiler.stage("publish"):
+            written = publish_content_addressed(
+                base_path, region_slug, written, bundle, generated_at=generated_at
             )
+        lines.append(f"Published content-addressed outputs -> {written[-1]}")
+    else:
+        drop_region_manifest(base_path)
+    return written
 
-    return {"summary": summary, "timeseries": timeseries}
 
+def run_region_job(job: RegionJob, context: BuildContext, *, capture_logs: bool) -> RegionResult:
+    """Run `build_region`, turning failures into a result instead of an exception.
 
-def main(argv: Sequence[str] | None = None) -> int:
+    With ``capture_logs`` the module logger's records are collected on the
+    result so the parent process can replay them in region order. Stage
+    timings are always collected on the result; for --profile-region the
+    whole build also runs under cProfile.
+    """
+    result = RegionResult(region=job.region_slug)
+    profiler = StageProfiler()
+    code_profile = cProfile.Profile() if context.args.profile_region == job.region_slug else None
+    collector: _RecordCollector | None = None
+    propagate = logger.propagate
+    if capture_logs:
+        collector = _RecordCollector()
+        logger.addHandler(collector)
+        logger.propagate = False
+        logger.setLevel(context.log_level)
+    started = time.perf_counter()
+    try:
+        if code_profile is not None:
+            code_profile.enable()
+        try:
+            result.paths = build_region(job, context, result.lines, profiler)
+        finally:
+            if code_profile is not None:
+                code_profile.disable()
+    except Exception as exc:  # one region must not abort the others
+        logger.debug("Region '%s' failed", job.region_slug, exc_info=True)
+        result.error = f"{type(exc).__name__}: {exc}"
+    finally:
+        result.wall_s = round(time.perf_counter() - started, 6)
+        result.stages = profiler.stages
+        if code_profile is not None:
+            profile_path = shared_output_dir(context, job.region_slug) / f"profile-{job.region_slug}.prof"
+            profile_path.parent.mkdir(parents=True, exist_ok=True)
+            code_profile.dump_stats(profile_path)
+            result.lines.append(f"Wrote cProfile stats -> {profile_path}")
+        if collector is not None:
+            logger.removeHandler(collector)
+            logger.propagate = propagate
+            result.records = collector.records
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Build region bundle JSON")
     parser.add_argument(
         "--region",
@@ -777,21 +4200,38 @@ def main(argv: Sequence[str] | None = None) -> int:
     )
     parser.add_argument(
         "--model-parquet",
-        required=True,
         type=Path,
         nargs="+",
-        help="One or more weather model parquet files",
+        help="One or more weather model parquet files (required unless --warehouse is given)",
     )
     parser.add_argument(
         "--station-csv",
-        required=True,
         type=Path,
-        help="Path to a station CSV file or a directory containing station CSV files",
+        help=(
+            "Path to a station CSV file or a directory containing station CSV files "
+            "(required unless --warehouse is given)"
+        ),
+    )
+    parser.add_argument(
+        "--warehouse",
+        type=Path,
+        help="Read model and station rows from a DuckDB warehouse built by the 'ingest' subcommand",
+    )
+    parser.add_argument(
+        "--station-store",
+        type=Path,
+        help=(
+            "Directory for a Parquet copy of the station CSVs partitioned by region and band. "
+            "New or changed CSVs are converted on each run and stations are read from the store"
+        ),
     )
     parser.add_argument(
         "--output",
         type=Path,
-        help="Output file path (single region) or directory root (multi-region). Default: public/data/<region>/bundle.json",
+        help=(
+            "Output file path (single region) or directory root (multi-region). A single-region "
+            "<name>.json writes to the directory <slug of name>/. Default: public/data/<region>/"
+        ),
     )
     parser.add_argument(
         "--model-spec",
@@ -810,9 +4250,53 @@ def main(argv: Sequence[str] | None = None) -> int:
     parser.add_argument("--model-time-column", default="valid_date")
     parser.add_argument("--model-variable-column", default="variable")
     parser.add_argument("--model-level-column", default="level")
+    parser.add_argument(
+        "--model-run-column",
+        help=f"Model run/initialisation time column (default: first of {', '.join(MODEL_RUN_COLUMNS)} present)",
+    )
+    parser.add_argument(
+        "--model-lead-column",
+        default="forecast_hour",
+        help="Lead time column in hours, used to derive the run time when no run column exists",
+    )
+    parser.add_argument(
+        "--model-reduce",
+        choices=MODEL_REDUCTIONS,
+        default="none",
+        help=(
+            "How model timeseries handle several runs sharing a valid time: 'none' keeps every row, "
+            "'latest' keeps the most recent run, 'runs' writes one series per run, "
+            "'envelope' writes mean plus min/max traces"
+        ),
+    )
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help=(
+            "Rewrite only summary.json from the rows the trailing --summary-window(s) cover: the window "
+            "start is pushed into the model parquet scan, station rows are trimmed per station, and the "
+            "timeseries outputs of the last full build are left in place"
+        ),
+    )
+    parser.add_argument(
+        "--summary-window",
+        action="append",
+        default=[],
+        type=SummaryWindow.parse,
+        help=(
+            "Trailing summary window as 24h, 7d or 72h:avg,sum (repeatable; statistics default to avg). "
+            "Each window adds samples_<window> and <metric>_<stat>_<window> columns; default: "
+            f"{AGGREGATION_HOURS}h"
+        ),
+    )
     parser.add_argument("--station-region-column", default="region")
     parser.add_argument("--station-band-column", default="elevation_band")
     parser.add_argument("--station-time-column", default="obs_time")
+    parser.add_argument(
+        "--station-time-format",
+        default=None,
+        help="strptime format of station timestamps (e.g. %%Y-%%m-%%d %%H:%%M); default parses ISO 8601",
+    )
     parser.add_argument("--station-id-column", default="station_id")
     parser.add_argument("--station-name-column", default="station_name")
     parser.add_argument("--tiles-base", default="https://tile.openstreetmap.org/")
@@ -825,12 +4309,234 @@ def main(argv: Sequence[str] | None = None) -> int:
         "--end-date",
         help="Inclusive UTC end date/time for filtering model and station data",
     )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help=(
+            "Timeseries output: 'json' writes timeseries.json, 'parquet' writes long-format "
+            f"{MODEL_TIMESERIES_PARQUET}/{STATION_TIMESERIES_PARQUET} plus {TIMESERIES_INDEX_NAME}, "
+            "'both' writes all of them"
+        ),
+    )
+    parser.add_argument(
+        "--timeseries-chunks",
+        choices=sorted(TIMESERIES_CHUNKS),
+        default=None,
+        help=(
+            f"Write the JSON timeseries as one file per UTC day or week under <region>/{TIMESERIES_CHUNK_DIR}/ "
+            f"plus {TIMESERIES_CHUNK_INDEX} instead of timeseries.json; chunks whose content is unchanged "
+            "since the last run are not rewritten"
+        ),
+    )
+    parser.add_argument(
+        "--content-addressed",
+        action="store_true",
+        help=(
+            "Name outputs by content hash (e.g. timeseries.<sha>.json) and atomically swap a "
+            f"<region>/{GENERATION_MANIFEST_NAME} pointing at them, so artifacts can be cached as immutable"
+        ),
+    )
+    parser.add_argument(
+        "--precompress",
+        action="append",
+        choices=sorted(PRECOMPRESS_FORMATS),
+        default=None,
+        help="Also write .gz / .br copies of each JSON output for serving with Content-Encoding (repeatable)",
+    )
+    parser.add_argument(
+        "--pyramid",
+        action="store_true",
+        help=(
+            f"Also write hourly, 6-hourly and LTTB-downsampled timeseries levels under <region>/{PYRAMID_DIR}/ "
+            "with an index.json the server uses to pick the coarsest sufficient level"
+        ),
+    )
+    parser.add_argument(
+        "--pyramid-target-points",
+        type=int,
+        default=1000,
+        help="Maximum points per series in the shape-preserving (LTTB) pyramid level (default: 1000)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Bounded-memory mode for very large model parquet: aggregate in DuckDB and write model "
+            "timeseries one (spec, band) series at a time instead of loading the region into pandas"
+        ),
+    )
+    parser.add_argument(
+        "--memory-limit",
+        default=None,
+        help="DuckDB memory limit for --stream, e.g. '2GB' (default: DuckDB's own limit)",
+    )
+    parser.add_argument(
+        "--temp-directory",
+        type=Path,
+        default=None,
+        help="Directory DuckDB may spill to under --stream when the memory limit is reached",
+    )
+    parser.add_argument(
+        "--stream-batch-rows",
+        type=int,
+        default=100_000,
+        help="Rows fetched per batch under --stream (default: 100000)",
+    )
+    parser.add_argument(
+        "--time-axis",
+        choices=TIME_ENCODINGS,
+        default="iso",
+        help=(
+            "Timeseries time axis encoding: 'iso' writes x as ISO-8601 strings, 'compact' writes t as "
+            "{start, step, count} epoch seconds for evenly spaced series or an epoch-seconds list otherwise"
+        ),
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help=(
+            "Print the regions, specs, row counts and estimated output size a build would produce, "
+            "using parquet metadata and grouped counts, then exit without writing anything"
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every region even when the build ledger shows its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--prune-aliases",
+        action="store_true",
+        help=(
+            "After building, delete the outputs earlier builds recorded in the build ledger under another "
+            "spelling of a built region (e.g. south_rockies/ for south-rockies); other files are kept"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to build regions concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running: build once, then poll the model parquet files and station CSVs and rebuild "
+            "only the regions whose inputs changed, reusing a warm DuckDB database and cached station data"
+        ),
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between input polls under --watch (default: 2)",
+    )
+    parser.add_argument(
+        "--watch-debounce",
+        type=float,
+        default=3.0,
+        help="Seconds the inputs must stay unchanged before a --watch rebuild starts (default: 3)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Record wall/CPU time, rows in/out and peak RSS per stage and region and write "
+            f"<output root>/shared/{PROFILE_REPORT_NAME}"
+        ),
+    )
+    parser.add_argument(
+        "--profile-region",
+        default=None,
+        help=(
+            "Also run this region's build under cProfile and write <output root>/shared/profile-<region>.prof "
+            "(for pstats, snakeviz or flameprof)"
+        ),
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Enable progress logging",
     )
+    return parser
+
+
+def build_ingest_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="generate_region_bundle.py ingest",
+        description=(
+            "Load model parquet files and station CSVs into a persistent DuckDB warehouse, clustered on "
+            "(region, band, time) with canonical region/band keys; build with --warehouse afterwards"
+        ),
+    )
+    parser.add_argument("--warehouse", required=True, type=Path, help="DuckDB database file to create or update")
+    parser.add_argument("--model-parquet", type=Path, nargs="+", default=[], help="Model parquet files to ingest")
+    parser.add_argument("--station-csv", type=Path, help="Station CSV file or directory of CSVs to ingest")
+    parser.add_argument("--model-region-column", default="region")
+    parser.add_argument("--model-band-column", default="elevation_band")
+    parser.add_argument("--model-time-column", default="valid_date")
+    parser.add_argument("--model-variable-column", default="variable")
+    parser.add_argument("--model-level-column", default="level")
+    parser.add_argument("--station-region-column", default="region")
+    parser.add_argument("--station-band-column", default="elevation_band")
+    parser.add_argument("--station-time-column", default="obs_time")
+    parser.add_argument("--station-id-column", default="station_id")
+    parser.add_argument("--station-name-column", default="station_name")
+    parser.add_argument(
+        "--recluster",
+        action="store_true",
+        help="Rewrite the tables fully sorted by (region, band, time) after ingesting",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Enable progress logging")
+    return parser
+
+
+def ingest_main(argv: Sequence[str]) -> int:
+    parser = build_ingest_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+    logger.setLevel(logging.INFO if args.verbose else logging.WARNING)
+    if not args.model_parquet and args.station_csv is None:
+        parser.error("Nothing to ingest; pass --model-parquet and/or --station-csv")
+    for path in args.model_parquet:
+        if not path.exists():
+            parser.error(f"Model parquet file not found: {path}")
+    if args.station_csv is not None and not args.station_csv.exists():
+        parser.error(f"Station CSV path not found: {args.station_csv}")
+
+    counts = ingest_warehouse(
+        args.warehouse.expanduser().resolve(),
+        args.model_parquet,
+        args.station_csv,
+        model_region_col=args.model_region_column,
+        model_band_col=args.model_band_column,
+        model_time_col=args.model_time_column,
+        model_variable_col=args.model_variable_column,
+        model_level_col=args.model_level_column,
+        station_region_col=args.station_region_column,
+        station_band_col=args.station_band_column,
+        station_time_col=args.station_time_column,
+        station_id_col=args.station_id_column,
+        station_name_col=args.station_name_column,
+        recluster=args.recluster,
+    )
+    print(
+        f"Ingested {counts['ingested']} file(s) ({counts['rows']} rows), "
+        f"{counts['unchanged']} unchanged, {counts['removed']} removed -> {args.warehouse}"
+    )
+    return 0
 
+
+def main(argv: Sequence[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["ingest"]:
+        return ingest_main(argv[1:])
+    parser = build_parser()
     args = parser.parse_args(argv)
 
     logging.basicConfig(
@@ -860,19 +4566,103 @@ def main(argv: Sequence[str] | None = None) -> int:
     end_ts = parse_date_arg("end-date", args.end_date)
     if start_ts is not None and end_ts is not None and start_ts > end_ts:
         parser.error("--start-date must be before or equal to --end-date")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.precompress and "brotli" in args.precompress and brotli is None:
+        parser.error("--precompress brotli requires the 'brotli' package")
+    if args.pyramid_target_points < 3:
+        parser.error("--pyramid-target-points must be at least 3")
+    if args.stream and (args.pyramid or args.timeseries_chunks or args.output_format != "json"):
+        parser.error("--stream only supports --output-format json without --pyramid or --timeseries-chunks")
+    if args.timeseries_chunks and args.content_addressed:
+        parser.error("--timeseries-chunks cannot be combined with --content-addressed")
+    if args.stream_batch_rows < 1:
+        parser.error("--stream-batch-rows must be at least 1")
+    args.summary_window = args.summary_window or list(DEFAULT_SUMMARY_WINDOWS)
+    window_labels = [window.label for window in args.summary_window]
+    if len(set(window_labels)) != len(window_labels):
+        parser.error("--summary-window values must be distinct")
+    if args.profile_region:
+        args.profile_region = slugify_region(args.profile_region.strip())
+    if args.output is not None and args.output.suffix == ".json":
+        output_slug = slugify_region(args.output.stem)
+        if output_slug != args.output.stem:
+            logger.warning(
+                "--output %s writes to %s/ (its canonical slug); builds before canonical slugs wrote %s/",
+                args.output.name,
+                output_slug,
+                args.output.stem,
+            )
+
+    if args.warehouse is None and (not args.model_parquet or args.station_csv is None):
+        parser.error("--model-parquet and --station-csv are required unless --warehouse is given")
+    if args.warehouse is not None and (args.station_store or args.stream or args.watch or args.plan):
+        parser.error("--warehouse cannot be combined with --station-store, --stream, --watch or --plan")
+    if args.summary_only and (args.warehouse is not None or args.content_addressed):
+        parser.error("--summary-only cannot be combined with --warehouse or --content-addressed")
+    if args.watch and args.plan:
+        parser.error("--watch cannot be combined with --plan")
+    if args.watch and args.jobs > 1:
+        parser.error("--watch builds regions in-process; --jobs must be 1")
+    if args.watch_interval <= 0 or args.watch_debounce < 0:
+        parser.error("--watch-interval must be positive and --watch-debounce non-negative")
 
+    if args.watch:
+        return watch_inputs(parser, args, start_ts, end_ts)
+    return run_build(parser, args, start_ts, end_ts)
+
+
+def run_build(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    start_ts: pd.Timestamp | None,
+    end_ts: pd.Timestamp | None,
+    *,
+    only_regions: Set[str] | None = None,
+    station_cache: dict[str, Tuple[str, pd.DataFrame]] | None = None,
+) -> int:
+    """Discover, fingerprint and build the pending regions once; return the exit code.
+
+    With `only_regions` (--watch) regions outside the set are left untouched.
+    """
+    started_wall, started_cpu = time.perf_counter(), time.process_time()
+    run_profiler = StageProfiler()
     station_metrics = [m.strip() for m in args.station_metrics.split(",") if m.strip()]
 
+    station_store: Path | None = None
+    if args.station_store and args.plan:
+        # A plan must not write anything; use the store as last synced, if any.
+        store_dir = args.station_store.expanduser().resolve()
+        station_store = store_dir if (store_dir / STATION_STORE_MANIFEST).exists() else None
+    elif args.station_store:
+        with run_profiler.stage("station_store_sync"):
+            station_store = sync_station_store(
+                args.station_csv,
+                args.station_store.expanduser().resolve(),
+                region_col=args.station_region_column,
+                band_col=args.station_band_column,
+                time_col=args.station_time_column,
+                id_col=args.station_id_column,
+                name_col=args.station_name_column,
+            )
+
     if args.region:
         regions = [slugify_region(args.region.strip())]
         station_region_list = []
+    elif args.warehouse is not None:
+        with run_profiler.stage("discovery") as record:
+            regions, station_region_list = warehouse_regions(args.warehouse)
+            record["rows_out"] = len(regions)
     else:
-        regions, station_region_list = discover_regions(
-            args.model_parquet,
-            args.station_csv,
-            model_region_col=args.model_region_column,
-            station_region_col=args.station_region_column,
-        )
+        with run_profiler.stage("discovery") as record:
+            regions, station_region_list = discover_regions(
+                args.model_parquet,
+                args.station_csv,
+                model_region_col=args.model_region_column,
+                station_region_col=args.station_region_column,
+                station_store=station_store,
+            )
+            record["rows_out"] = len(regions)
     station_region_set = {slugify_region(r) for r in station_region_list}
 
     logger.info("Regions to process: %s", regions)
@@ -884,171 +4674,332 @@ def main(argv: Sequence[str] | None = None) -> int:
     if multi_region and output_arg and output_arg.suffix == ".json":
         parser.error("When generating multiple regions, --output must be a directory")
 
-    generated = []
+    context = BuildContext(
+        args=args,
+        start_ts=start_ts,
+        end_ts=end_ts,
+        station_metrics=station_metrics,
+        station_store=station_store,
+        output_arg=output_arg,
+        multi_region=multi_region,
+        log_level=logger.level,
+        station_cache=station_cache,
+    )
 
-    for index, region_slug in enumerate(regions, start=1):
-        logger.info(
-            "[%d/%d] Processing region '%s'",
-            index,
-            len(regions),
+    ledger_path = shared_output_dir(context, regions[0]) / BUILD_LEDGER_NAME if regions else None
+    ledger = load_build_ledger(ledger_path) if ledger_path else {"version": 1, "file_hashes": {}, "regions": {}}
+    # Outputs of earlier builds, before this run replaces their ledger entries (for --prune-aliases).
+    recorded_outputs = [
+        path
+        for entry in ledger["regions"].values()
+        for path in (*entry.get("outputs", []), *entry.get("superseded_outputs", []))
+    ]
+    model_stats = []
+    if args.warehouse is not None:
+        # The warehouse records content hashes of everything ingested into it.
+        model_stats = [
+            {"path": name, "sha256": digest} for name, digest in warehouse_sources(args.warehouse, "model").items()
+        ]
+        station_hashes = {None: warehouse_sources(args.warehouse, "station")}
+    else:
+        for path in args.model_parquet:
+            stat = Path(path).stat()
+            model_stats.append(
+                {"path": str(Path(path).resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            )
+        with run_profiler.stage("input_hashes"):
+            station_hashes = station_input_hashes(
+                args.station_csv, station_store, ledger["file_hashes"], region_col=args.station_region_column
+            )
+    options_fingerprint = build_options_fingerprint(args)
+    generator_hash = file_sha256(Path(__file__))
+    fingerprints = {
+        region_slug: region_fingerprint(
             region_slug,
+            model_stats=model_stats,
+            station_hashes=station_hashes,
+            options=options_fingerprint,
+            generator_hash=generator_hash,
         )
-        model_df = load_model_dataframe(
-            args.model_parquet,
-            region_slug,
+        for region_slug in regions
+    }
+
+    pending: List[str] = []
+    skipped: List[str] = []
+    for index, region_slug in enumerate(regions, start=1):
+        if only_regions is not None and region_slug not in only_regions:
+            continue
+        entry = ledger["regions"].get(region_slug)
+        unchanged = (
+            not args.force
+            and entry is not None
+            and entry.get("fingerprint") == fingerprints[region_slug]
+            and all(Path(out).exists() for out in entry.get("outputs", []))
+        )
+        if unchanged:
+            logger.info(
+                "[%d/%d] Skipping region '%s'; inputs and options unchanged since %s",
+                index,
+                len(regions),
+                region_slug,
+                entry.get("built_at", "last run"),
+            )
+            skipped.append(region_slug)
+        else:
+            pending.append(region_slug)
+
+    if args.plan:
+        model_counts = plan_model_counts(
+            [Path(p) for p in args.model_parquet],
             region_col=args.model_region_column,
             band_col=args.model_band_column,
             time_col=args.model_time_column,
             variable_col=args.model_variable_column,
             level_col=args.model_level_column,
+            specs=args.model_spec,
             start_ts=start_ts,
             end_ts=end_ts,
         )
-        logger.info(
-            "[%d/%d] Loaded model data (%d rows) for region '%s'",
-            index,
-            len(regions),
-            len(model_df),
-            region_slug,
+        station_counts = station_row_counts(
+            args.station_csv,
+            station_store,
+            region_col=args.station_region_column,
         )
-        station_df = None
-        if station_region_set and region_slug not in station_region_set:
-            logger.info(
-                "[%d/%d] No station CSVs detected for region '%s'; proceeding with model data only",
-                index,
-                len(regions),
-                region_slug,
-            )
-        else:
-            try:
-                station_df = load_station_dataframe(
-                    args.station_csv,
-                    region_slug,
-                    region_col=args.station_region_column,
-                    band_col=args.station_band_column,
-                    time_col=args.station_time_column,
-                    start_ts=start_ts,
-                    end_ts=end_ts,
-                )
-                logger.info(
-                    "[%d/%d] Loaded station data (%d rows) for region '%s'",
-                    index,
-                    len(regions),
-                    len(station_df),
-                    region_slug,
-                )
-            except (ValueError, KeyError) as exc:
-                logger.warning(
-                    "[%d/%d] Station data unavailable for region '%s': %s",
-                    index,
-                    len(regions),
-                    region_slug,
-                    exc,
-                )
-        if station_df is None:
-            empty_cols = {
-                args.station_time_column: pd.Series(dtype="datetime64[ns, UTC]"),
-                "__band_lower": pd.Series(dtype=str),
-            }
-            empty_cols[args.station_band_column] = pd.Series(dtype=str)
-            empty_cols[args.station_region_column] = pd.Series(dtype=str)
-            empty_cols[args.station_id_column] = pd.Series(dtype=str)
-            empty_cols[args.station_name_column] = pd.Series(dtype=str)
-            for metric in station_metrics:
-                empty_cols[metric] = pd.Series(dtype=float)
-            station_df = pd.DataFrame(empty_cols)
-            station_metric_columns = [metric for metric in station_metrics if metric in station_df.columns]
-        else:
-            station_metric_columns = resolve_station_metrics(
-                station_df,
-                station_metrics,
-                time_col=args.station_time_column,
-                band_col=args.station_band_column,
-                id_col=args.station_id_column,
-                name_col=args.station_name_column,
+        print_plan(regions, pending, context, model_counts, station_counts)
+        return 0
+
+    model_frames: dict[str, pd.DataFrame] | None = None
+    if multi_region and pending and not args.stream and not args.summary_only:
+        with run_profiler.stage("model_load") as record:
+            model_frames = load_model_dataframes(
+                args.model_parquet,
+                pending,
+                region_col=args.model_region_column,
+                band_col=args.model_band_column,
+                time_col=args.model_time_column,
+                variable_col=args.model_variable_column,
+                level_col=args.model_level_column,
+                start_ts=start_ts,
+                end_ts=end_ts,
+                specs=args.model_spec,
+                extra_columns=model_extra_columns(args),
+                warehouse=args.warehouse,
             )
+            record["rows_out"] = sum(len(frame) for frame in model_frames.values())
+        logger.info(
+            "Loaded model data for %d region(s) in a single scan",
+            len(model_frames),
+        )
 
-        bundle = {
-            "region": region_slug,
-            "run_time_utc": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "version": datetime.utcnow().strftime("%Y%m%d%H%M"),
-            "tiles_base": args.tiles_base,
-        }
+    def iter_jobs() -> Iterable[RegionJob]:
+        for index, region_slug in enumerate(regions, start=1):
+            if region_slug not in pending:
+                continue
+            yield RegionJob(
+                index=index,
+                total=len(regions),
+                region_slug=region_slug,
+                model_df=model_frames.pop(region_slug, None) if model_frames is not None else None,
+                preloaded=model_frames is not None,
+                has_stations=not station_region_set or region_slug in station_region_set,
+                station_key=json.dumps(region_station_hashes(station_hashes, region_slug), sort_keys=True),
+            )
 
-        if args.quicklook:
-            bundle["quicklook_png"] = args.quicklook
+    generated: List[Path] = []
+    failed: List[str] = []
+    results: List[RegionResult] = []
 
-        model_specs = args.model_spec or discover_model_specs(model_df, args.model_time_column)
-        if not model_specs:
-            print(f"[warn] No model metrics discovered for region '{region_slug}'. Skipping model summary/time-series.")
+    def report(result: RegionResult) -> None:
+        results.append(result)
+        for record in result.records:
+            logger.handle(record)
+        for line in result.lines:
+            print(line)
+        if result.error:
+            logger.error("Region '%s' failed: %s", result.region, result.error)
+            failed.append(result.region)
+            ledger["regions"].pop(result.region, None)
         else:
-            logger.info(
-                "[%d/%d] Using %d model specs for region '%s'",
-                index,
-                len(regions),
-                len(model_specs),
-                region_slug,
+            previous = ledger["regions"].get(result.region, {})
+            outputs = [str(path) for path in result.paths]
+            # Earlier outputs under another spelling of the region that this build did not
+            # rewrite stay recorded until --prune-aliases removes them.
+            alias_dirs = region_alias_dirs(region_output_dir(context, result.region), result.region)
+            superseded = sorted(
+                path
+                for path in {*previous.get("outputs", []), *previous.get("superseded_outputs", [])}
+                if path not in outputs
+                and Path(path).exists()
+                and any(Path(path).resolve().is_relative_to(alias_dir) for alias_dir in alias_dirs)
             )
+            ledger["regions"][result.region] = {
+                "fingerprint": fingerprints[result.region],
+                "outputs": outputs,
+                "built_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+            if superseded:
+                ledger["regions"][result.region]["superseded_outputs"] = superseded
+        generated.extend(result.paths)
 
-        station_payload = build_station_payload(
-            station_df,
-            station_metric_columns,
-            time_col=args.station_time_column,
-            id_col=args.station_id_column,
-            name_col=args.station_name_column,
-        )
-        model_payload = build_model_payload(
-            model_df,
-            model_specs,
-            args.model_time_column,
-        ) if model_specs else {"summary": {band: [] for band in BANDS}, "timeseries": {band: [] for band in BANDS}}
-
-        summary_json = None
-        timeseries_json = None
-
-        if output_arg:
-            if output_arg.suffix == ".json" and not multi_region:
-                base_path = output_arg.with_suffix("")
-            else:
-                base_path = output_arg / region_slug
-        else:
-            base_path = DEFAULT_OUTPUT_ROOT / region_slug
+    jobs = max(1, min(args.jobs, len(pending)))
+    if jobs == 1:
+        for job in iter_jobs():
+            report(run_region_job(job, context, capture_logs=False))
+    else:
+        logger.info("Building %d region(s) with %d worker processes", len(pending), jobs)
+        # Spawned (not forked) workers so no DuckDB thread state leaks across the fork.
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [
+                executor.submit(run_region_job, job, context, capture_logs=True)
+                for job in iter_jobs()
+            ]
+            for future in futures:
+                report(future.result())
 
-        summary_path = base_path / "summary.json"
-        timeseries_path = base_path / "timeseries.json"
-        base_path.mkdir(parents=True, exist_ok=True)
-        logger.info(
-            "[%d/%d] Writing outputs under %s",
-            index,
-            len(regions),
-            base_path,
+    # Only regions written under their canonical slug are listed in shared/regions.json.
+    indexed = [
+        region_slug
+        for region_slug in [*skipped, *(result.region for result in results if not result.error)]
+        if region_output_dir(context, region_slug).name == region_slug
+    ]
+    if args.prune_aliases:
+        pruned: Set[str] = set()
+        for region_slug in indexed:
+            for path in prune_region_aliases(region_output_dir(context, region_slug), region_slug, recorded_outputs):
+                print(f"Removed alias output -> {path}")
+                pruned.add(str(path))
+        for entry in ledger["regions"].values():
+            superseded = [path for path in entry.pop("superseded_outputs", []) if str(Path(path).resolve()) not in pruned]
+            if superseded:
+                entry["superseded_outputs"] = superseded
+    if ledger_path is not None:
+        write_build_ledger(ledger_path, ledger)
+    if indexed:
+        region_index_path = shared_output_dir(context, regions[0]) / REGION_INDEX_NAME
+        update_region_index(region_index_path, indexed)
+        print(f"Wrote region index -> {region_index_path}")
+    if args.profile and regions:
+        report_path = shared_output_dir(context, regions[0]) / PROFILE_REPORT_NAME
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(
+            json.dumps(
+                profile_report(
+                    run_profiler.stages,
+                    results,
+                    wall_s=time.perf_counter() - started_wall,
+                    cpu_s=time.process_time() - started_cpu,
+                    jobs=jobs,
+                ),
+                indent=2,
+            ),
+            encoding="utf-8",
         )
+        print(f"Wrote profile report -> {report_path}")
 
-        summary_payload = {
-            **bundle,
-            "stations": station_payload["summary"],
-            "model": model_payload["summary"],
-        }
-        with summary_path.open("w", encoding="utf-8") as fh:
-            json.dump(summary_payload, fh, indent=2)
-            fh.write("\n")
+    logger.info("Completed generation of %d bundle outputs", len(generated))
+    print(f"Generated {len(generated)} bundle(s)")
+    if skipped:
+        print(f"Skipped {len(skipped)} unchanged region(s)")
+    if failed:
+        print(f"Failed {len(failed)} region(s): {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
 
-        timeseries_payload = {
-            "region": region_slug,
-            "generated_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "stations": station_payload["timeseries"],
-            "model": model_payload["timeseries"],
-        }
-        with timeseries_path.open("w", encoding="utf-8") as fh:
-            json.dump(timeseries_payload, fh, indent=2)
-            fh.write("\n")
 
-        generated.extend([summary_path, timeseries_path])
-        print(f"Wrote summary -> {summary_path}")
-        print(f"Wrote timeseries -> {timeseries_path}")
+def input_snapshot(model_parquet: Sequence[Path], station_csv: Path) -> dict[Path, Tuple[int, int]]:
+    """(size, mtime_ns) of every model parquet file and station CSV that currently exists."""
+    paths = [Path(p) for p in model_parquet]
+    try:
+        paths.extend(resolve_station_csv_paths(station_csv))
+    except FileNotFoundError:
+        pass
+    snapshot: dict[Path, Tuple[int, int]] = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
 
-    logger.info("Completed generation of %d bundle outputs", len(generated))
-    print(f"Generated {len(generated)} bundle(s)")
+
+def input_file_regions(path: Path, args: argparse.Namespace) -> Set[str] | None:
+    """Region slugs with rows in one model parquet or station CSV; None when unknown."""
+    if path not in {Path(p) for p in args.model_parquet}:
+        return station_csv_regions(path, args.station_region_column)
+    con = connect_duckdb()
+    try:
+        values = model_regions_from_metadata(con, [path], args.model_region_column)
+        if values is None:
+            query = f"SELECT DISTINCT {quote_ident(args.model_region_column)} FROM read_parquet(?)"
+            values = {value for (value,) in con.execute(query, [str(path)]).fetchall()}
+    except (duckdb.Error, OSError, ValueError) as exc:
+        logger.warning("Could not determine the regions in %s: %s", path, exc)
+        return None
+    finally:
+        con.close()
+    if values is None:
+        return None
+    return {slugify_region(str(value)) for value in values if value}
+
+
+def watch_inputs(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    start_ts: pd.Timestamp | None,
+    end_ts: pd.Timestamp | None,
+) -> int:
+    """Build once, then poll the inputs and rebuild the regions of changed files until interrupted.
+
+    A change is acted on once the inputs have stayed the same for
+    --watch-debounce seconds, so a burst of file drops triggers one rebuild.
+    The affected regions are those present in a changed file before or after
+    the change; if that cannot be determined every region is rebuilt.
+    """
+    open_shared_duckdb()
+    station_cache: dict[str, Tuple[str, pd.DataFrame]] = {}
+    snapshot = input_snapshot(args.model_parquet, args.station_csv)
+    regions_by_file = {path: input_file_regions(path, args) for path in snapshot}
+    print(f"Watching {len(snapshot)} input file(s) every {args.watch_interval:g}s; press Ctrl-C to stop")
+    run_build(parser, args, start_ts, end_ts, station_cache=station_cache)
+    try:
+        while True:
+            time.sleep(args.watch_interval)
+            current = input_snapshot(args.model_parquet, args.station_csv)
+            if current == snapshot:
+                continue
+            while True:
+                time.sleep(args.watch_debounce)
+                latest = input_snapshot(args.model_parquet, args.station_csv)
+                if latest == current:
+                    break
+                current = latest
+
+            changed = sorted(path for path in snapshot.keys() | current.keys() if snapshot.get(path) != current.get(path))
+            snapshot = current
+            affected: Set[str] | None = set()
+            for path in changed:
+                before = regions_by_file.pop(path, set())
+                after: Set[str] | None = set()
+                if path in current:
+                    after = regions_by_file[path] = input_file_regions(path, args)
+                if before is None or after is None:
+                    affected = None
+                elif affected is not None:
+                    affected |= before | after
+            logger.info("Changed inputs: %s", [str(path) for path in changed])
+            if affected is not None and not affected:
+                continue
+            print(
+                f"Detected {len(changed)} changed input file(s); rebuilding "
+                + ("all regions" if affected is None else ", ".join(sorted(affected)))
+            )
+            try:
+                run_build(parser, args, start_ts, end_ts, only_regions=affected, station_cache=station_cache)
+            except Exception as exc:  # keep watching after a bad drop
+                logger.error("Rebuild failed: %s", exc, exc_info=args.verbose)
+    except KeyboardInterrupt:
+        print("Stopped watching")
     return 0
 
 
@@ -17,7 +17,13 @@ export interface Manifest {
     tiles_base: string;
     station_parquet?: string;
     quicklook_png?: string;
+    timeseries_index?: string;
+    timeseries_json?: string;
+    timeseries_chunk_index?: string;
+    pyramid_index?: string;
   };
+  // Set by `generate_region_bundle.py --content-addressed`; changes whenever any artifact does.
+  generation?: string;
 }
 
 export type AvalancheObservation = {
@@ -48,10 +54,15 @@ export type BandSummaryTable = {
 
 export type BandSummaryMap = Record<string, BandSummaryTable[]>;
 
+// Compact time axis written by `generate_region_bundle.py --time-axis compact`
+// (epoch seconds); expanded into `x` when the bundle is loaded.
+export type TimeAxis = { start: number; step: number; count: number } | number[];
+
 export type StationTimeseriesEntry = {
   station_id: string;
   station_name?: string;
   x: string[];
+  t?: TimeAxis;
   series: TimeseriesSeries[];
   metadata?: Record<string, unknown>;
 };
@@ -59,7 +70,9 @@ export type StationTimeseriesEntry = {
 export type ModelTimeseriesEntry = {
   variable: string;
   level: string;
+  run_utc?: string;
   x: string[];
+  t?: TimeAxis;
   series: TimeseriesSeries[];
   metadata?: Record<string, unknown>;
 };
@@ -86,6 +99,55 @@ export interface RegionTimeseriesFile {
   model?: BandTimeseriesMap<ModelTimeseriesEntry>;
 }
 
+// Downsampled levels written by `generate_region_bundle.py --pyramid`, ordered
+// coarsest first; `resolution_seconds` is 0 for the full-resolution file, which
+// is the chunk index when the build used `--timeseries-chunks`.
+export type TimeseriesPyramidLevel = {
+  name: string;
+  file: string;
+  resolution_seconds: number;
+  points: number;
+  max_series_points: number;
+};
+
+export interface TimeseriesPyramidIndex {
+  region: string;
+  generated_at?: string;
+  time_range: [number, number] | null;
+  target_points: number;
+  levels: TimeseriesPyramidLevel[];
+  // Levels not written because they held no fewer points than `served_by`.
+  skipped?: Array<{ name: string; resolution_seconds: number; points: number; served_by: string }>;
+}
+
+// Time chunks written by `generate_region_bundle.py --timeseries-chunks`; each
+// chunk file is a RegionTimeseriesFile holding the points in [start, end).
+export type TimeseriesChunk = {
+  name: string;
+  file: string;
+  start: number;
+  end: number;
+  points: number;
+  digest: string;
+};
+
+export interface TimeseriesChunkIndex {
+  region: string;
+  generated_at?: string;
+  format?: { chunk: string; time_encoding: string; precompress: string[] };
+  chunk_seconds: number;
+  time_range: [number, number] | null;
+  chunks: TimeseriesChunk[];
+}
+
+// shared/regions.json as written by `generate_region_bundle.py`: canonical slugs
+// plus other spellings (south_rockies, "south rockies") mapped onto them. Older
+// builds wrote a plain list of directory names.
+export interface RegionIndex {
+  regions: string[];
+  aliases?: Record<string, string>;
+}
+
 // Legacy bundle format support
 export type RegionBundleJSON = {
   region: string;